@@ -0,0 +1,73 @@
+"""
+Benchmark single-qubit measurement against the original per-index loop.
+
+Usage:
+    python benchmarks/bench_measure.py [num_qubits ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.quantum_state import QuantumState
+
+
+def measure_loop(state: QuantumState, qubit_index: int):
+    """Reference implementation: two pure-Python passes over every index."""
+    probabilities = np.abs(state.state_vector) ** 2
+    bit_shift = state.num_qubits - 1 - qubit_index
+    
+    prob_0 = 0.0
+    prob_1 = 0.0
+    for i in range(state.dim):
+        if (i >> bit_shift) & 1:
+            prob_1 += probabilities[i]
+        else:
+            prob_0 += probabilities[i]
+    
+    outcome_bit = 1 if np.random.random() < prob_1 else 0
+    outcome_prob = prob_1 if outcome_bit == 1 else prob_0
+    
+    new_state = np.zeros_like(state.state_vector)
+    for i in range(state.dim):
+        if (i >> bit_shift) & 1 == outcome_bit:
+            new_state[i] = state.state_vector[i] / np.sqrt(outcome_prob)
+    state.state_vector = new_state
+    
+    return str(outcome_bit), outcome_prob
+
+
+def uniform_state(num_qubits: int) -> QuantumState:
+    """Equal superposition over all basis states."""
+    state = QuantumState(num_qubits)
+    state.state_vector[:] = 1 / np.sqrt(state.dim)
+    return state
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'qubits':>6} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>9}")
+    for num_qubits in sizes:
+        qubit = num_qubits // 2
+        
+        loop_time = time_call(measure_loop, uniform_state(num_qubits), qubit)
+        
+        vector_time = min(
+            time_call(uniform_state(num_qubits).measure, qubit) for _ in range(3)
+        )
+        
+        print(f"{num_qubits:>6} {loop_time:>10.4f} {vector_time:>15.6f} "
+              f"{loop_time / vector_time:>8.0f}x")
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 16, 22]
+    main(sizes)
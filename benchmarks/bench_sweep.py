@@ -0,0 +1,65 @@
+"""
+Benchmark a batched parameter sweep against one simulation per binding.
+
+Usage:
+    python benchmarks/bench_sweep.py [num_points ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.circuit import QuantumCircuit, Parameter
+
+
+NUM_QUBITS = 6
+
+
+def ansatz(theta: Parameter, phi: Parameter) -> QuantumCircuit:
+    """Layers of rotations and a CNOT ladder on NUM_QUBITS qubits."""
+    circuit = QuantumCircuit(NUM_QUBITS, lazy=True)
+    for layer in range(3):
+        for qubit in range(NUM_QUBITS):
+            circuit.ry(qubit, theta)
+            circuit.rz(qubit, phi)
+        for qubit in range(NUM_QUBITS - 1):
+            circuit.cnot(qubit, qubit + 1)
+    return circuit
+
+
+def run_each(circuit, theta, phi, thetas, phis):
+    """Reference: bind and simulate every point separately."""
+    return np.array([
+        circuit.bind({theta: t, phi: p}).get_statevector()
+        for t, p in zip(thetas, phis)
+    ])
+
+
+def main(sizes):
+    theta, phi = Parameter('theta'), Parameter('phi')
+    circuit = ansatz(theta, phi)
+    
+    print(f"{'points':>6} {'one by one (s)':>15} {'sweep (s)':>10} {'speedup':>9}")
+    for num_points in sizes:
+        thetas = np.linspace(0, np.pi, num_points)
+        phis = np.linspace(0, 2 * np.pi, num_points)
+        
+        start = time.perf_counter()
+        expected = run_each(circuit, theta, phi, thetas, phis)
+        each_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        states = circuit.sweep({theta: thetas, phi: phis})
+        sweep_time = time.perf_counter() - start
+        
+        assert np.allclose(states, expected)
+        print(f"{num_points:>6} {each_time:>15.4f} {sweep_time:>10.5f} "
+              f"{each_time / sweep_time:>8.0f}x")
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    main(sizes)
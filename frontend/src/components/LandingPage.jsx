@@ -30,7 +30,7 @@ function LandingPage({ onStart }) {
           <FeatureCard 
             icon="∞"
             title="Entanglement Analysis"
-            description="Comprehensive metrics including concurrence, entropy, and entanglement classification for 2-qubit systems."
+            description="Comprehensive metrics including concurrence, entropy, and entanglement classification for multi-qubit systems."
           />
           <FeatureCard 
             icon="⟨ψ⟩"
@@ -44,10 +44,10 @@ function Results({ results, numQubits, operations, initialState }) {
 
       <div className="card">
         <h2 className="card-title">Entanglement</h2>
-        {entanglement && numQubits === 2 ? (
+        {entanglement && numQubits >= 2 ? (
           <EntanglementInfo data={entanglement} />
         ) : (
-          <div className="circuit-empty">Available for 2-qubit systems</div>
+          <div className="circuit-empty">Available for systems of 2 or more qubits</div>
         )}
       </div>
     </>
@@ -149,6 +149,9 @@ function EntanglementInfo({ data }) {
         <MetricRow label="Classification" value={classification} />
         <MetricRow label="Concurrence" value={concurrence.toFixed(4)} />
         <MetricRow label="Entropy" value={entropy.toFixed(4)} />
+        {data.subsystem && (
+          <MetricRow label="Cut" value={`qubits ${data.subsystem.join(', ')} | rest`} />
+        )}
       </div>
     </>
   )
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react'
-import { simulateCircuit } from '../utils/api'
+import { simulateSteps } from '../utils/api'
 import CircuitVisualizer from './CircuitVisualizer'
 
 function StepByStep({ operations, numQubits, initialState }) {
@@ -24,26 +24,13 @@ function StepByStep({ operations, numQubits, initialState }) {
     setError(null)
     
     try {
-      const steps = []
-      
-      // Initial state
-      const initialResult = await simulateCircuit(numQubits, [], initialState)
-      steps.push({
-        stepNumber: 0,
-        operation: null,
-        result: initialResult
-      })
-
-      // Simulate each step
-      for (let i = 0; i < operations.length; i++) {
-        const opsUpToNow = operations.slice(0, i + 1)
-        const result = await simulateCircuit(numQubits, opsUpToNow, initialState)
-        steps.push({
-          stepNumber: i + 1,
-          operation: operations[i],
-          result: result
-        })
-      }
+      // One request returns the state after every operation
+      const snapshots = await simulateSteps(numQubits, operations, initialState)
+      const steps = snapshots.map((snapshot, i) => ({
+        stepNumber: i,
+        operation: i === 0 ? null : operations[i - 1],
+        result: snapshot.result
+      }))
 
       setStepResults(steps)
       setCurrentStep(0)
@@ -20,6 +20,44 @@ export async function simulateCircuit(numQubits, operations, initialState = null
   return await response.json()
 }
 
+export async function simulateSteps(numQubits, operations, initialState = null) {
+  const response = await fetch(`${API_URL}/simulate/steps`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json'
+    },
+    body: JSON.stringify({
+      num_qubits: numQubits,
+      operations: operations,
+      initial_state: initialState
+    })
+  })
+
+  if (!response.ok) {
+    throw new Error('Failed to simulate steps')
+  }
+
+  const data = await response.json()
+
+  // Rebuild the full amplitude map of every step from the deltas
+  const zero = { real: 0, imag: 0, magnitude: 0, probability: 0 }
+  let amplitudes = {}
+  for (let i = 0; i < 2 ** numQubits; i++) {
+    amplitudes[i.toString(2).padStart(numQubits, '0')] = zero
+  }
+
+  return data.steps.map((step) => {
+    amplitudes = { ...amplitudes, ...step.changed }
+    step.removed.forEach((state) => {
+      amplitudes[state] = zero
+    })
+    return {
+      operation: step.operation,
+      result: { success: true, amplitudes }
+    }
+  })
+}
+
 export async function loadPreset(presetName) {
   const response = await fetch(`${API_URL}/presets/${presetName}`)
   
@@ -0,0 +1,460 @@
+"""
+Asyncio HTTP server for the Quantum Circuit API.
+
+Serves the same routes as simple_api.py, but each connection is a
+coroutine, so thousands of idle keep-alive connections cost almost
+nothing. Simulations run in a process pool, and large amplitude results
+are streamed to the client in chunks (chunked transfer encoding) as they
+are serialized instead of being built as one string first.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+import json
+import multiprocessing
+import os
+import sys
+import threading
+
+# Add src directory to path
+src_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, src_dir)
+
+import numpy as np
+from simple_api import (
+    APIError, build_circuit, analyze_entanglement, get_preset, encode_state_binary, run_steps, run_batch,
+    state_cache, run_with_cache, serialize_entanglement_map, precision_report,
+    BINARY_CONTENT_TYPE, COLUMNAR_CONTENT_TYPE, RESPONSE_FORMATS
+)
+from quantum_state import format_basis_states
+
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+# Amplitudes serialized per streamed chunk
+CHUNK_AMPLITUDES = 4096
+
+# Limits on what a client may send
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Accept',
+}
+
+
+class Request:
+    """A parsed HTTP request."""
+    
+    def __init__(self, method, path, version, headers, body):
+        self.method = method
+        self.path = path
+        self.version = version
+        self.headers = headers
+        self.body = body
+    
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+
+def _simulate(data, response_format):
+    """
+    Worker-process entry point: simulate a request and return its results.
+    
+    Only plain data crosses the process boundary; serialization of the
+    amplitudes happens in the server process so it can be streamed. With
+    threshold or top_k, the amplitudes are selected here, so only the
+    kept indices and values are sent back instead of the whole state.
+    """
+    circuit, options = build_circuit(data, response_format)
+    resumed, cacheable = run_with_cache(circuit, state_cache)
+    state_vector = circuit.get_statevector()
+    
+    threshold, top_k = options['threshold'], options['top_k']
+    if response_format == 'binary' or (threshold is None and top_k is None):
+        indices, values = None, state_vector
+    else:
+        indices, values = circuit.get_state().sparse_amplitudes(
+            threshold=0.0 if threshold is None else threshold, top_k=top_k)
+    
+    counts = None
+    if response_format != 'binary' and options['shots'] is not None:
+        counts = circuit.sample(options['shots'], seed=options['seed'])
+    
+    return {
+        'num_qubits': circuit.num_qubits,
+        'indices': indices,
+        'values': values,
+        'operations': circuit.get_operations(),
+        'optimization': circuit.optimization_report,
+        'entanglement': analyze_entanglement(circuit) if response_format != 'binary' else None,
+        'counts': counts,
+        'cache': {'resumed_operations': resumed, 'cacheable_operations': cacheable},
+        'precision': precision_report(circuit),
+        'entanglement_map': (serialize_entanglement_map(circuit)
+                             if options['entanglement_map'] and response_format != 'binary' else None)
+    }
+
+
+def _amplitude_columns(result):
+    """Indices and values of the amplitudes to export (selected by the worker)."""
+    if result['indices'] is None:
+        return np.arange(result['values'].size), result['values']
+    return result['indices'], result['values']
+
+
+def _amplitude_chunks(result):
+    """Yield JSON object members ('"01": {...}') for the amplitudes, chunk by chunk."""
+    indices, values = _amplitude_columns(result)
+    
+    for start in range(0, len(indices), CHUNK_AMPLITUDES):
+        chunk_values = values[start:start + CHUNK_AMPLITUDES]
+        labels = format_basis_states(indices[start:start + CHUNK_AMPLITUDES], result['num_qubits'])
+        magnitudes = np.abs(chunk_values)
+        
+        columns = zip(labels, chunk_values.real.tolist(), chunk_values.imag.tolist(),
+                      magnitudes.tolist(), (magnitudes ** 2).tolist())
+        chunk = {
+            label: {'real': real, 'imag': imag, 'magnitude': magnitude, 'probability': probability}
+            for label, real, imag, magnitude, probability in columns
+        }
+        yield json.dumps(chunk)[1:-1]
+
+
+def _response_metadata(result):
+    return {
+        'operations': result['operations'],
+        'entanglement': result['entanglement'],
+        'optimization': result['optimization'],
+        'counts': result['counts'],
+        'cache': result['cache'],
+        'precision': result['precision'],
+        'entanglement_map': result['entanglement_map']
+    }
+
+
+class ResponseWriter:
+    """Writes one HTTP response, either with a known length or chunked."""
+    
+    def __init__(self, writer, request):
+        self.writer = writer
+        self.request = request
+        self.chunked = False
+    
+    def _start(self, status, content_type, headers):
+        lines = [f'HTTP/1.1 {status.value} {status.phrase}', f'Content-Type: {content_type}']
+        lines += [f'{name}: {value}' for name, value in {**CORS_HEADERS, **headers}.items()]
+        if not self.request.keep_alive:
+            lines.append('Connection: close')
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    
+    async def send(self, status, content_type, body):
+        """Send a complete body (bytes or a list of buffers)."""
+        buffers = body if isinstance(body, list) else [body]
+        self._start(status, content_type, {'Content-Length': sum(len(b) for b in buffers)})
+        for buffer in buffers:
+            self.writer.write(buffer)
+        await self.writer.drain()
+    
+    async def send_json(self, payload, status=HTTPStatus.OK):
+        await self.send(status, 'application/json', json.dumps(payload).encode())
+    
+    async def start_stream(self, status, content_type):
+        # HTTP/1.0 clients have no chunked encoding; the closed connection ends the body
+        self.chunked = self.request.version != 'HTTP/1.0'
+        self._start(status, content_type, {'Transfer-Encoding': 'chunked'} if self.chunked else {})
+    
+    async def write(self, text):
+        data = text.encode()
+        if not data:
+            return
+        if self.chunked:
+            self.writer.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+        else:
+            self.writer.write(data)
+        # Wait for slow clients so unsent chunks do not pile up in memory
+        await self.writer.drain()
+    
+    async def end_stream(self):
+        if self.chunked:
+            self.writer.write(b'0\r\n\r\n')
+        await self.writer.drain()
+
+
+class AsyncQuantumServer:
+    """
+    Asyncio front end for the Quantum Circuit API routes.
+    
+    A simulation holds one of max_pending slots until its worker finishes
+    it, even after its request timed out, so the 503 limit follows the
+    real load on the pool. If a worker dies, the requests it takes down
+    fail with a 500 and the executor is replaced, as in SimulationPool.
+    
+    Attributes:
+        max_pending: Simulations allowed in flight before new ones get a 503
+        timeout: Seconds before a simulation request gets a 504
+        idle_timeout: Seconds an idle keep-alive connection is kept open
+    """
+    
+    def __init__(self, workers=None, max_pending=None, timeout=None, idle_timeout=75.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = self.workers * 4 if max_pending is None else max_pending
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._executor = self._new_executor()
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+    
+    def _new_executor(self):
+        # Forked workers would inherit the open client sockets and keep those
+        # connections alive after the server closes them; spawned ones do not
+        return ProcessPoolExecutor(max_workers=self.workers,
+                                   mp_context=multiprocessing.get_context('spawn'))
+    
+    def _replace_executor(self, broken):
+        """Swap in a fresh executor, unless another request already replaced broken."""
+        with self._executor_lock:
+            if self._executor is broken:
+                self._executor = self._new_executor()
+                broken.shutdown(wait=False, cancel_futures=True)
+    
+    def _submit(self, func, *args):
+        """Submit to the current executor, replacing it first if it is broken."""
+        executor = self._executor
+        try:
+            return executor, executor.submit(func, *args)
+        except BrokenProcessPool:
+            # A worker died before this request came in
+            self._replace_executor(executor)
+            executor = self._executor
+            return executor, executor.submit(func, *args)
+    
+    async def _read_request(self, reader):
+        """Read one request, or return None when the client closed the connection."""
+        line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        if not line:
+            return None
+        
+        try:
+            method, target, version = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+        except ValueError:
+            raise APIError('Malformed request line')
+        
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise APIError('Too many headers', status=431)
+        
+        length = int(headers.get('content-length', 0) or 0)
+        if length > MAX_BODY_BYTES:
+            raise APIError('Request body too large', status=413)
+        body = await reader.readexactly(length) if length else b''
+        
+        return Request(method.upper(), target.split('?', 1)[0], version, headers, body)
+    
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until it closes or idles out."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except APIError as e:
+                    response = ResponseWriter(writer, Request('', '', 'HTTP/1.0', {}, b''))
+                    await response.send_json({'success': False, 'error': e.message}, HTTPStatus(e.status))
+                    break
+                if request is None:
+                    break
+                
+                await self.route(request, ResponseWriter(writer, request))
+                if not request.keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    async def route(self, request, response):
+        if request.method == 'OPTIONS':
+            await response.send(HTTPStatus.OK, 'application/json', b'')
+        
+        elif request.method == 'GET' and request.path == '/api/health':
+            await response.send_json({'status': 'ok', 'message': 'Quantum Circuit API is running'})
+        
+        elif request.method == 'GET' and request.path == '/api/cache/stats':
+            await response.send_json(state_cache.stats())
+        
+        elif request.method == 'GET' and request.path.startswith('/api/presets/'):
+            try:
+                await response.send_json(get_preset(request.path.split('/')[-1]))
+            except APIError as e:
+                await response.send_json({'success': False, 'error': e.message}, HTTPStatus(e.status))
+        
+        elif request.method == 'POST' and request.path == '/api/simulate':
+            await self.simulate(request, response)
+        
+        elif request.method == 'POST' and request.path == '/api/simulate/steps':
+            await self.simulate_json(request, response, run_steps)
+        
+        elif request.method == 'POST' and request.path == '/api/simulate/batch':
+            await self.simulate_json(request, response, run_batch)
+        
+        else:
+            await response.send_json({'error': 'Not found'}, HTTPStatus.NOT_FOUND)
+    
+    def _response_format(self, request, data):
+        requested = data.get('format')
+        if requested is not None:
+            return requested
+        
+        accept = request.headers.get('accept', '')
+        if BINARY_CONTENT_TYPE in accept:
+            return 'binary'
+        if COLUMNAR_CONTENT_TYPE in accept:
+            return 'columnar'
+        if NDJSON_CONTENT_TYPE in accept:
+            return 'ndjson'
+        return 'json'
+    
+    async def _run_in_pool(self, func, *args):
+        """Run a simulation function in the process pool with backpressure and a timeout."""
+        if not self._slots.acquire(blocking=False):
+            raise APIError('Server is busy, please retry later', status=503)
+        
+        try:
+            executor, future = self._submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # Released when the worker is done, not when the request gives up
+        future.add_done_callback(lambda _: self._slots.release())
+        
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise APIError(f'Simulation timed out after {self.timeout} seconds', status=504)
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            raise APIError('Simulation worker crashed, please retry', status=500)
+    
+    async def simulate_json(self, request, response, func):
+        """Run func(data) in the pool for a request whose result is a small JSON document."""
+        try:
+            data = json.loads(request.body.decode())
+            result = await self._run_in_pool(func, data)
+        except APIError as e:
+            await response.send_json({'success': False, 'error': e.message}, HTTPStatus(e.status))
+            return
+        except json.JSONDecodeError:
+            await response.send_json({'success': False, 'error': 'Invalid JSON in request body'},
+                                     HTTPStatus.BAD_REQUEST)
+            return
+        except Exception as e:
+            await response.send_json({'success': False, 'error': f'Internal server error: {str(e)}'},
+                                     HTTPStatus.INTERNAL_SERVER_ERROR)
+            return
+        
+        await response.send_json(result)
+    
+    async def simulate(self, request, response):
+        try:
+            data = json.loads(request.body.decode())
+            response_format = self._response_format(request, data)
+            if response_format not in RESPONSE_FORMATS + ('ndjson',):
+                raise APIError(f'Format must be one of: {", ".join(RESPONSE_FORMATS + ("ndjson",))}')
+            
+            # NDJSON carries the same data as JSON, so it shares its limits
+            circuit_format = 'json' if response_format == 'ndjson' else response_format
+            result = await self._run_in_pool(_simulate, data, circuit_format)
+            # The lookup happened in a worker's cache; count it here
+            state_cache.record_lookup(result['cache']['resumed_operations'],
+                                      result['cache']['cacheable_operations'])
+        except APIError as e:
+            await response.send_json({'success': False, 'error': e.message}, HTTPStatus(e.status))
+            return
+        except json.JSONDecodeError:
+            await response.send_json({'success': False, 'error': 'Invalid JSON in request body'},
+                                     HTTPStatus.BAD_REQUEST)
+            return
+        except Exception as e:
+            await response.send_json({'success': False, 'error': f'Internal server error: {str(e)}'},
+                                     HTTPStatus.INTERNAL_SERVER_ERROR)
+            return
+        
+        if response_format == 'binary':
+            header, buffer = encode_state_binary(result['values'], result['num_qubits'])
+            await response.send(HTTPStatus.OK, BINARY_CONTENT_TYPE, [header, buffer])
+        
+        elif response_format == 'columnar':
+            indices, values = _amplitude_columns(result)
+            amplitudes = {'real': values.real.tolist(), 'imag': values.imag.tolist()}
+            if result['indices'] is not None:
+                amplitudes = {'indices': indices.tolist(), **amplitudes}
+            payload = {'success': True, 'amplitudes': amplitudes, **_response_metadata(result)}
+            await response.send(HTTPStatus.OK, COLUMNAR_CONTENT_TYPE, json.dumps(payload).encode())
+        
+        elif response_format == 'ndjson':
+            # First line: everything but the amplitudes; then one line per chunk
+            await response.start_stream(HTTPStatus.OK, NDJSON_CONTENT_TYPE)
+            header = {'success': True, 'num_qubits': result['num_qubits'], **_response_metadata(result)}
+            await response.write(json.dumps(header) + '\n')
+            for members in _amplitude_chunks(result):
+                await response.write('{"amplitudes": {' + members + '}}\n')
+            await response.end_stream()
+        
+        else:
+            # Same document as simple_api, written as it is serialized
+            await response.start_stream(HTTPStatus.OK, 'application/json')
+            await response.write('{"success": true, "amplitudes": {')
+            for position, members in enumerate(_amplitude_chunks(result)):
+                await response.write(members if position == 0 else ', ' + members)
+            await response.write('}, ' + json.dumps(_response_metadata(result))[1:])
+            await response.end_stream()
+    
+    async def serve(self, host='', port=5000):
+        server = await asyncio.start_server(self.handle_connection, host or None, port)
+        async with server:
+            await server.serve_forever()
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_server(port=5000, workers=None, max_pending=None, timeout=None):
+    """Start the asyncio API server."""
+    app = AsyncQuantumServer(workers=workers, max_pending=max_pending, timeout=timeout)
+    print(f'Quantum Circuit API Server (asyncio) running on http://127.0.0.1:{port}')
+    print(f'Simulation pool: {app.workers} workers, {app.max_pending} pending limit')
+    print(f'Press Ctrl+C to stop the server\n')
+    
+    try:
+        asyncio.run(app.serve(port=port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.shutdown()
+        print('\nServer stopped')
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    workers = os.environ.get('SIMULATION_WORKERS')
+    max_pending = os.environ.get('SIMULATION_QUEUE')
+    timeout = os.environ.get('SIMULATION_TIMEOUT')
+    run_server(
+        port=port,
+        workers=int(workers) if workers else None,
+        max_pending=int(max_pending) if max_pending else None,
+        timeout=float(timeout) if timeout else None
+    )
@@ -2,16 +2,88 @@
 Quantum Circuit implementation.
 """
 import numpy as np
-from src.quantum_state import QuantumState
-from src.gates import apply_single_qubit_gate, apply_two_qubit_gate, hadamard, pauli_x, pauli_y, pauli_z, cnot, swap
+from typing import Dict, List, Sequence, Union
+from src.quantum_state import QuantumState, format_basis_states
+from src.gates import (get_gate, rotation_matrices, apply_batched_single_qubit, _apply_to_tensor,
+                       PRECISIONS)
+from src.optimizer import fuse_operations
+from src.density_matrix import DensityMatrix
+from src.noise import NoiseModel
+from src.stabilizer import StabilizerState, is_clifford
+from src.mps import MPSState
+from src.sparse_state import SparseState
+
+
+# State representations a circuit can simulate with
+BACKENDS = {
+    'statevector': QuantumState,
+    'density_matrix': DensityMatrix,
+    'stabilizer': StabilizerState,
+    'mps': MPSState,
+    'sparse': SparseState,
+}
+
+# Single-precision states are checked for norm drift every this many
+# operations, and renormalized once it exceeds NORM_DRIFT_TOLERANCE
+NORM_CHECK_INTERVAL = 32
+NORM_DRIFT_TOLERANCE = 1e-5
+
+
+class Parameter:
+    """
+    Symbolic gate parameter, bound to a value with bind() or sweep().
+    
+    Converting an unbound parameter to a number raises ValueError, so a
+    circuit that still holds one cannot be simulated by accident.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __float__(self):
+        raise ValueError(f"Parameter '{self.name}' is unbound; use bind() or sweep()")
+    
+    def __repr__(self):
+        return f"Parameter({self.name!r})"
 
 
 class QuantumCircuit:
     """
     Represents a quantum circuit with multiple qubits.
+    
+    Gate methods record an operation in self.operations. In the default
+    eager mode the operation is simulated immediately; in lazy mode it is
+    only recorded, and the program is simulated on demand by run() or by
+    any method that needs the state (get_state, get_amplitudes, ...).
+    
+    With optimize=True, each batch of pending operations is passed through
+    the gate fusion pass before it is simulated, and the result of the last
+    pass is kept in optimization_report.
+    
+    The backend selects the state representation: a pure state vector, a
+    density matrix, which can also apply the channels of a noise model
+    after every gate, a stabilizer tableau, which simulates Clifford
+    circuits (H, X, Y, Z, CNOT, SWAP, measurements) in polynomial time, a
+    matrix product state, whose cost grows with entanglement instead of
+    with 2^n, or a sparse state vector, whose cost grows with the number of
+    non-zero amplitudes. With backend='auto', a lazy circuit uses the stabilizer
+    backend when every recorded operation is Clifford and the statevector
+    backend otherwise; eager circuits cannot know their gates up front and
+    always use the statevector backend. The choice is invisible to the
+    caller: asking an auto circuit for a state vector replays its program
+    on the statevector backend, which it then keeps.
+    
+    With precision='single' the statevector backend stores complex64
+    amplitudes. Rounding makes the norm drift, so the state is checked
+    every NORM_CHECK_INTERVAL operations; the largest drift seen at a check
+    is kept in norm_drift and the state is renormalized whenever it exceeds
+    NORM_DRIFT_TOLERANCE (counted in renormalizations).
     """
     
-    def __init__(self, num_qubits: int, initial_state: str = None):
+    def __init__(self, num_qubits: int, initial_state: str = None, lazy: bool = False,
+                 optimize: bool = False, backend: str = 'statevector',
+                 noise_model: NoiseModel = None, backend_options: dict = None,
+                 precision: str = 'double'):
         """
         Initialize a quantum circuit.
         
@@ -19,150 +91,555 @@ class QuantumCircuit:
             num_qubits: Number of qubits in the circuit
             initial_state: Initial state as binary string (e.g., '01', '10')
                           If None, defaults to all |0⟩
+            lazy: If True, gates are recorded and only simulated on demand
+            optimize: If True, fuse adjacent gates before simulating them
+            backend: One of BACKENDS ('statevector', 'density_matrix',
+                     'stabilizer', 'mps', 'sparse') or 'auto'
+            noise_model: Channels to apply after gates; needs the
+                         density_matrix backend. Disables gate fusion.
+            backend_options: Keyword arguments for the backend's state,
+                             e.g. {'max_bond': 32, 'cutoff': 1e-10} for mps
+                             or {'density_threshold': 0.05} for sparse
+            precision: 'double' (complex128) or 'single' (complex64); single
+                       precision needs the statevector (or auto) backend
         """
+        if backend not in BACKENDS and backend != 'auto':
+            raise ValueError(f"Backend must be one of: {', '.join(BACKENDS)}, auto")
+        if noise_model is not None and backend != 'density_matrix':
+            raise ValueError("Noise models need the density_matrix backend")
+        if backend_options and backend == 'auto':
+            raise ValueError("Backend options need an explicit backend")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Precision must be one of: {', '.join(PRECISIONS)}")
+        if precision != 'double' and backend not in ('statevector', 'auto'):
+            raise ValueError("Single precision needs the statevector backend")
+        
         self.num_qubits = num_qubits
+        self.initial_state = initial_state
+        self.lazy = lazy
+        self.optimize = optimize
+        self.optimization_report = None
+        self.auto_backend = backend == 'auto'
+        # Set once an auto circuit was asked for something only a state vector has
+        self._needs_statevector = False
+        self.backend = backend
+        self.noise_model = noise_model
+        self.backend_options = dict(backend_options or {})
+        self.precision = precision
+        self.dtype = PRECISIONS[precision]
+        self.norm_drift = 0.0
+        self.renormalizations = 0
+        self._unchecked_operations = 0
         
-        if initial_state is None:
-            # Default: all qubits in |0⟩
-            self.state = QuantumState(num_qubits)
+        self.operations = []
+        self.state = self._create_state(initial_state)
+        
+        # Number of recorded operations already applied to self.state
+        self._num_executed = 0
+    
+    def _select_backend(self) -> str:
+        """Backend an 'auto' circuit should use for its recorded operations."""
+        if self.lazy and not self._needs_statevector and is_clifford(self.operations):
+            return 'stabilizer'
+        return 'statevector'
+    
+    def _resolve_backend(self):
+        """Re-pick an 'auto' circuit's backend for the operations recorded so far."""
+        # Gates recorded since the state was created may rule out the
+        # tableau; the program is then replayed on a state vector
+        if self.auto_backend and self._select_backend() != self.backend:
+            self.state = self._create_state(self.initial_state)
+            self._num_executed = 0
+    
+    def _create_state(self, initial_state: str = None) -> QuantumState:
+        """Create a fresh state for the circuit, all |0⟩ if initial_state is None."""
+        if initial_state is not None and len(initial_state) != self.num_qubits:
+            raise ValueError(f"Initial state length must match num_qubits ({self.num_qubits})")
+        
+        if self.auto_backend:
+            self.backend = self._select_backend()
+        if self.backend == 'statevector':
+            return QuantumState(self.num_qubits, initial_state, precision=self.precision)
+        return BACKENDS[self.backend](self.num_qubits, initial_state, **self.backend_options)
+    
+    def _add_operation(self, operation: dict):
+        """Record an operation, simulating it right away unless the circuit is lazy."""
+        qubits = operation['qubits']
+        for qubit in qubits:
+            if not 0 <= qubit < self.num_qubits:
+                raise IndexError(f"Qubit {qubit} out of range for {self.num_qubits} qubits")
+        if len(set(qubits)) != len(qubits):
+            raise ValueError(f"{operation['gate']} gate qubits must be different")
+        
+        self.operations.append(operation)
+        if not self.lazy:
+            self._execute_pending()
+        return self
+    
+    def _execute(self, operation: dict):
+        """Apply one recorded operation to the current state."""
+        if operation['type'] == 'measurement':
+            outcome, _ = self.state.measure(qubit_index=operation['qubits'][0])
+            operation['outcome'] = outcome
+        elif operation['type'] == 'fused':
+            self.state.apply_gate(operation['unitary'], operation['qubits'])
         else:
-            # Custom initial state
-            if len(initial_state) != num_qubits:
-                raise ValueError(f"Initial state length must match num_qubits ({num_qubits})")
-            
-            # Create state vector with 1 at the position of the initial state
-            dim = 2 ** num_qubits
-            state_vector = np.zeros(dim, dtype=complex)
-            state_index = int(initial_state, 2)  # Convert binary string to index
-            state_vector[state_index] = 1.0
-            
-            self.state = QuantumState(num_qubits)
-            self.state.state_vector = state_vector
+            gate = get_gate(operation['gate'], *operation.get('params', ()), dtype=self.dtype)
+            self.state.apply_gate(gate, operation['qubits'])
         
-        self.operations = []
+        if self.noise_model is not None:
+            for channel, qubit in self.noise_model.channels_for(operation):
+                self.state.apply_channel(channel, qubit)
+    
+    def _execute_pending(self, stop: int = None):
+        """Apply the operations recorded since the state was last brought up to date."""
+        if stop is None:
+            stop = len(self.operations)
+        
+        self._resolve_backend()
+        pending = self.operations[self._num_executed:stop]
+        # Noise follows individual gates, so fused blocks would misplace it,
+        # the tableau only applies named Clifford gates and the MPS only
+        # one- and two-qubit gates
+        if (self.optimize and pending and self.noise_model is None
+                and self.backend in ('statevector', 'density_matrix', 'sparse')):
+            pending, self.optimization_report = fuse_operations(pending)
+        
+        for operation in pending:
+            self._execute(operation)
+            self._monitor_norm()
+        self._num_executed = max(self._num_executed, stop)
+    
+    def _monitor_norm(self):
+        """Count an applied operation, checking the norm every NORM_CHECK_INTERVAL."""
+        if self.precision == 'double' or self.backend != 'statevector':
+            return
+        # Counted across calls so eager circuits are not checked every gate
+        self._unchecked_operations += 1
+        if self._unchecked_operations >= NORM_CHECK_INTERVAL:
+            self._check_normalization()
+    
+    def _check_normalization(self):
+        """Record the state's norm drift and renormalize it past the tolerance."""
+        self._unchecked_operations = 0
+        drift = self.state.normalization_error()
+        self.norm_drift = max(self.norm_drift, drift)
+        if drift > NORM_DRIFT_TOLERANCE:
+            self.state.renormalize()
+            self.renormalizations += 1
+    
+    def advance(self, num_operations: int):
+        """
+        Simulate the recorded operations up to (not including) index num_operations.
+        
+        Args:
+            num_operations: Length of the program prefix to bring the state to
+        """
+        self._execute_pending(min(num_operations, len(self.operations)))
+    
+    def resume(self, state_vector: np.ndarray, num_operations: int):
+        """
+        Continue from a known state instead of simulating a program prefix.
+        
+        Args:
+            state_vector: State reached after the first num_operations
+                          operations (taken over, not copied)
+            num_operations: Number of recorded operations it accounts for
+        """
+        self._require_statevector("Resuming from a state vector")
+        if state_vector.size != 2 ** self.num_qubits:
+            raise ValueError(f"State vector size {state_vector.size} does not match {self.num_qubits} qubits")
+        
+        self.state = QuantumState(self.num_qubits, precision=self.precision)
+        self.state.state_vector = np.asarray(state_vector, dtype=self.dtype)
+        self._num_executed = num_operations
+    
+    def compile(self):
+        """
+        Run the gate fusion pass over all recorded operations.
+        
+        Returns:
+            Tuple of (compiled operations, report with the sweeps saved)
+        """
+        return fuse_operations(self.operations)
     
     def h(self, target: int):
         """Apply Hadamard gate to target qubit."""
-        self.state.state_vector = apply_single_qubit_gate(
-            self.state.state_vector, 
-            hadamard(), 
-            target, 
-            self.num_qubits
-        )
-        self.operations.append({
+        return self._add_operation({
             'gate': 'H',
             'qubits': [target],
             'type': 'single'
         })
-        return self
     
     def x(self, target: int):
         """Apply Pauli-X gate to target qubit."""
-        self.state.state_vector = apply_single_qubit_gate(
-            self.state.state_vector, 
-            pauli_x(), 
-            target, 
-            self.num_qubits
-        )
-        self.operations.append({
+        return self._add_operation({
             'gate': 'X',
             'qubits': [target],
             'type': 'single'
         })
-        return self
     
     def y(self, target: int):
         """Apply Pauli-Y gate to target qubit."""
-        self.state.state_vector = apply_single_qubit_gate(
-            self.state.state_vector, 
-            pauli_y(), 
-            target, 
-            self.num_qubits
-        )
-        self.operations.append({
+        return self._add_operation({
             'gate': 'Y',
             'qubits': [target],
             'type': 'single'
         })
-        return self
     
     def z(self, target: int):
         """Apply Pauli-Z gate to target qubit."""
-        self.state.state_vector = apply_single_qubit_gate(
-            self.state.state_vector, 
-            pauli_z(), 
-            target, 
-            self.num_qubits
-        )
-        self.operations.append({
+        return self._add_operation({
             'gate': 'Z',
             'qubits': [target],
             'type': 'single'
         })
-        return self
+    
+    def _rotation(self, name: str, target: int, theta: Union[float, Parameter]):
+        if isinstance(theta, Parameter) and not self.lazy:
+            raise ValueError("Symbolic parameters require a lazy circuit")
+        
+        return self._add_operation({
+            'gate': name,
+            'qubits': [target],
+            'type': 'single',
+            'params': [theta]
+        })
+    
+    def rx(self, target: int, theta: Union[float, Parameter]):
+        """Apply X rotation by theta (a number or a Parameter) to target qubit."""
+        return self._rotation('RX', target, theta)
+    
+    def ry(self, target: int, theta: Union[float, Parameter]):
+        """Apply Y rotation by theta (a number or a Parameter) to target qubit."""
+        return self._rotation('RY', target, theta)
+    
+    def rz(self, target: int, theta: Union[float, Parameter]):
+        """Apply Z rotation by theta (a number or a Parameter) to target qubit."""
+        return self._rotation('RZ', target, theta)
     
     def cnot(self, control: int, target: int):
         """Apply CNOT gate."""
-        self.state.state_vector = apply_two_qubit_gate(
-            self.state.state_vector,
-            cnot(),
-            control,
-            target,
-            self.num_qubits
-        )
-        self.operations.append({
+        return self._add_operation({
             'gate': 'CNOT',
             'qubits': [control, target],
             'type': 'two_qubit'
         })
-        return self
     
     def cx(self, control: int, target: int):
         """Alias for CNOT gate."""
         return self.cnot(control, target)
     
+    def swap(self, qubit1: int, qubit2: int):
+        """Apply SWAP gate."""
+        return self._add_operation({
+            'gate': 'SWAP',
+            'qubits': [qubit1, qubit2],
+            'type': 'two_qubit'
+        })
+    
     def measure_qubit(self, target: int):
         """
         Measure a specific qubit (collapses that qubit's state).
         
         Args:
             target: Qubit to measure
-            
+        
         Returns:
-            Measurement outcome (0 or 1)
+            Measurement outcome (0 or 1). In lazy mode the outcome is only
+            known once the circuit runs, so None is returned and the outcome
+            is stored in the recorded operation instead.
         """
-        outcome, prob = self.state.measure(qubit_index=target)
-        
-        # Record the measurement operation
-        self.operations.append({
+        operation = {
             'gate': 'MEASURE',
             'qubits': [target],
             'type': 'measurement',
-            'outcome': outcome
-        })
+            'outcome': None
+        }
+        self._add_operation(operation)
+        
+        return operation['outcome']
+    
+    def run(self, initial_state: str = None) -> QuantumState:
+        """
+        Simulate every recorded operation from a fresh initial state.
+        
+        The same recorded program can be run repeatedly, e.g. against
+        different initial states, without rebuilding the circuit.
+        
+        Args:
+            initial_state: Binary string to start from. Defaults to the
+                           circuit's own initial state.
+        
+        Returns:
+            The resulting quantum state (also stored as the circuit's state)
+        """
+        if initial_state is None:
+            initial_state = self.initial_state
+        
+        self.state = self._create_state(initial_state)
+        self._num_executed = 0
+        self._execute_pending()
+        return self.state
+    
+    @property
+    def parameters(self) -> List[Parameter]:
+        """Symbolic parameters used by the recorded operations, in first-use order."""
+        found = {}
+        for operation in self.operations:
+            for param in operation.get('params', ()):
+                if isinstance(param, Parameter):
+                    found.setdefault(param.name, param)
+        return list(found.values())
+    
+    def _parameter_values(self, values: dict) -> dict:
+        """Map parameter names to values, checking every parameter is given."""
+        by_name = {(key.name if isinstance(key, Parameter) else key): value
+                   for key, value in values.items()}
+        
+        names = [param.name for param in self.parameters]
+        missing = [name for name in names if name not in by_name]
+        if missing:
+            raise ValueError(f"No values given for parameters: {', '.join(missing)}")
+        unknown = [name for name in by_name if name not in names]
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(unknown)}")
+        return by_name
+    
+    def bind(self, values: Dict[Union[Parameter, str], float]) -> 'QuantumCircuit':
+        """
+        Create a copy of the circuit with its parameters replaced by numbers.
+        
+        Args:
+            values: Maps each Parameter (or its name) to an angle
+        
+        Returns:
+            New circuit with the same settings (backend, noise model and
+            precision included) and bound operations
+        """
+        by_name = self._parameter_values(values)
+        
+        bound = QuantumCircuit(self.num_qubits, self.initial_state, lazy=self.lazy,
+                               optimize=self.optimize,
+                               backend='auto' if self.auto_backend else self.backend,
+                               noise_model=self.noise_model,
+                               backend_options=self.backend_options, precision=self.precision)
+        for operation in self.operations:
+            operation = dict(operation)
+            if 'params' in operation:
+                operation['params'] = [
+                    float(by_name[param.name]) if isinstance(param, Parameter) else param
+                    for param in operation['params']
+                ]
+            if operation['type'] == 'measurement':
+                operation['outcome'] = None
+            bound._add_operation(operation)
+        return bound
+    
+    def sweep(self, param_values: Dict[Union[Parameter, str], Sequence[float]],
+              initial_state: str = None) -> np.ndarray:
+        """
+        Evaluate the circuit for many parameter bindings in one batched pass.
+        
+        All bindings share one (batch, 2, ..., 2) tensor. Fixed gates are
+        applied to the whole batch with a single kernel call, and each
+        parameterized rotation applies its stack of per-binding matrices
+        with one broadcast update, so a sweep costs about as many state
+        passes as a single run. The circuit's own state is left untouched.
+        
+        Args:
+            param_values: Maps each Parameter (or its name) to a sequence of
+                          values; all sequences must have the same length
+            initial_state: Binary string to start from. Defaults to the
+                           circuit's own initial state.
+        
+        Returns:
+            Array of shape (num_bindings, 2^n), one final state per binding
+        
+        Raises:
+            ValueError: If parameters are missing or unknown, the sequences
+                        differ in length, or the circuit measures
+        """
+        self._require_statevector("A parameter sweep")
+        if initial_state is None:
+            initial_state = self.initial_state
+        if any(op['type'] == 'measurement' for op in self.operations):
+            raise ValueError("Parameter sweeps do not support mid-circuit measurements")
+        
+        by_name = {name: np.asarray(values, dtype=float).ravel()
+                   for name, values in self._parameter_values(param_values).items()}
+        lengths = {values.size for values in by_name.values()}
+        if len(lengths) > 1:
+            raise ValueError("All parameters must have the same number of values")
+        batch = lengths.pop() if lengths else 1
+        
+        initial = self._create_state(initial_state).state_vector
+        states = np.repeat(initial[np.newaxis, :], batch, axis=0)
+        tensor = states.reshape((batch,) + (2,) * self.num_qubits)
+        
+        for operation in self.operations:
+            # Axis 0 is the batch, so qubit q is axis q + 1
+            axes = [qubit + 1 for qubit in operation['qubits']]
+            params = operation.get('params', ())
+            
+            if any(isinstance(param, Parameter) for param in params):
+                matrices = rotation_matrices(operation['gate'], by_name[params[0].name])
+                apply_batched_single_qubit(tensor, matrices.astype(self.dtype, copy=False), axes[0])
+            else:
+                _apply_to_tensor(tensor, get_gate(operation['gate'], *params, dtype=self.dtype), axes)
         
-        return outcome
+        return states
+    
+    def iter_steps(self, initial_state: str = None):
+        """
+        Simulate the recorded program one operation at a time.
+        
+        Operations are applied exactly as recorded (no fusion), so every
+        intermediate state is observed in a single pass. Single-precision
+        states get the same norm-drift checks as run().
+        
+        Args:
+            initial_state: Binary string to start from. Defaults to the
+                           circuit's own initial state.
+        
+        Yields:
+            (operation, state) pairs, starting with (None, initial state).
+            The state object is updated in place by the next step, so copy
+            anything that must outlive the iteration.
+        """
+        if initial_state is None:
+            initial_state = self.initial_state
+        
+        self.state = self._create_state(initial_state)
+        self._unchecked_operations = 0
+        operations = list(self.operations)
+        executed = 0
+        
+        # Mark everything as executed so get_state() and friends called
+        # between steps see the current step instead of running ahead
+        self._num_executed = len(operations)
+        try:
+            yield None, self.state
+            
+            for operation in operations:
+                self._execute(operation)
+                self._monitor_norm()
+                executed += 1
+                yield operation, self.state
+        finally:
+            self._num_executed = executed
     
     def get_state(self):
-        """Get the current quantum state."""
+        """Get the current quantum state, simulating any pending operations."""
+        self._execute_pending()
         return self.state
     
-    def get_amplitudes(self):
-        """Get amplitudes as a dictionary."""
-        amplitudes = {}
-        for i, amp in enumerate(self.state.state_vector):
-            state_str = format(i, f'0{self.num_qubits}b')
-            amplitudes[state_str] = amp
-        return amplitudes
+    def _require_statevector(self, feature: str):
+        """Make sure the state is a state vector, replaying an auto circuit if needed."""
+        if self.auto_backend:
+            self._needs_statevector = True
+        self._resolve_backend()
+        if self.backend != 'statevector':
+            raise ValueError(f"{feature} requires the statevector backend, not {self.backend}")
+    
+    def get_statevector(self) -> np.ndarray:
+        """Get the current state vector, simulating any pending operations."""
+        self._require_statevector("A state vector")
+        return self.get_state().state_vector
+    
+    def get_density_matrix(self) -> np.ndarray:
+        """Get the current density matrix (|ψ⟩⟨ψ| on the statevector backend)."""
+        if self.backend == 'density_matrix':
+            return self.get_state().density_matrix
+        self._require_statevector("A density matrix")
+        state = self.get_state()
+        return np.outer(state.state_vector, state.state_vector.conj())
+    
+    def get_amplitude(self, bitstring: str) -> complex:
+        """
+        Get the amplitude of one basis state.
+        
+        On the mps backend this contracts a single path through the chain
+        and on the sparse backend it searches the support, so it works for
+        circuits far too wide for a state vector.
+        
+        Args:
+            bitstring: Basis state like '0101', qubit 0 first
+        
+        Returns:
+            Complex amplitude
+        """
+        if self.backend in ('mps', 'sparse'):
+            return self.get_state().amplitude(bitstring)
+        self._require_statevector("Reading amplitudes")
+        state = self.get_state()
+        if len(bitstring) != self.num_qubits:
+            raise ValueError(f"Bitstring length must match num_qubits ({self.num_qubits})")
+        return complex(state.state_vector[int(bitstring, 2)])
+    
+    def get_amplitudes(self, threshold: float = None, top_k: int = None):
+        """
+        Get amplitudes as a dictionary.
+        
+        Args:
+            threshold: If given, only amplitudes with a larger magnitude are returned
+            top_k: If given, only the k largest-magnitude amplitudes are returned
+        
+        Returns:
+            Dictionary mapping basis states to amplitudes, in basis order.
+            With neither option set, every basis state is included; on the
+            sparse backend, every non-zero amplitude.
+        """
+        if self.backend != 'sparse':
+            self._require_statevector("Reading amplitudes")
+        state = self.get_state()
+        
+        if threshold is None and top_k is None and self.backend != 'sparse':
+            indices = np.arange(state.dim)
+            amplitudes = state.state_vector
+        else:
+            indices, amplitudes = state.sparse_amplitudes(
+                threshold=0.0 if threshold is None else threshold, top_k=top_k
+            )
+        
+        return dict(zip(format_basis_states(indices, self.num_qubits), amplitudes))
     
     def measure(self):
         """Measure all qubits."""
-        return self.state.measure()
+        return self.get_state().measure()
+    
+    def sample(self, shots: int, seed: int = None, counts: bool = True):
+        """
+        Sample measurement outcomes of all qubits without collapsing the state.
+        
+        Args:
+            shots: Number of shots
+            seed: Optional seed for reproducible results
+            counts: If True, return a histogram; otherwise the raw outcomes
+        
+        Returns:
+            Dictionary mapping bitstrings to counts (sorted by bitstring),
+            or an integer array of basis-state indices, one per shot
+        """
+        indices = self.get_state().sample(shots, np.random.default_rng(seed))
+        if not counts:
+            return indices
+        
+        outcomes, occurrences = np.unique(indices, return_counts=True)
+        return {
+            format(int(outcome), f'0{self.num_qubits}b'): int(count)
+            for outcome, count in zip(outcomes, occurrences)
+        }
     
     def reset(self):
         """Reset the circuit to initial state."""
-        self.state = QuantumState(self.num_qubits)
         self.operations = []
+        self._needs_statevector = False
+        self.state = self._create_state(self.initial_state)
+        self._num_executed = 0
+        self.norm_drift = 0.0
+        self.renormalizations = 0
+        self._unchecked_operations = 0
         return self
     
     def get_operations(self):
@@ -170,24 +647,30 @@ class QuantumCircuit:
         return self.operations
     
     def is_entangled(self):
-        """Check if the quantum state is entangled (only for 2-qubit systems)."""
-        if self.num_qubits != 2:
-            raise ValueError("Entanglement check only implemented for 2-qubit systems")
+        """Check if the quantum state is entangled (not a product of single-qubit states)."""
+        if self.num_qubits < 2:
+            raise ValueError("Entanglement check requires at least 2 qubits")
         
         from src.entanglement import is_entangled as check_entangled
-        return check_entangled(self.state.state_vector)
+        return check_entangled(self.get_statevector())
     
-    def analyze_entanglement(self):
-        """Perform comprehensive entanglement analysis (only for 2-qubit systems)."""
-        if self.num_qubits != 2:
-            raise ValueError("Entanglement analysis only implemented for 2-qubit systems")
+    def analyze_entanglement(self, subsystem: List[int] = None):
+        """
+        Perform comprehensive entanglement analysis.
+        
+        Args:
+            subsystem: Qubits on one side of the cut used for entropy and
+                       concurrence. Defaults to qubit 0.
+        """
+        if self.num_qubits < 2:
+            raise ValueError("Entanglement analysis requires at least 2 qubits")
         
         from src.entanglement import measure_entanglement_entropy
-        return measure_entanglement_entropy(self.state.state_vector)
+        return measure_entanglement_entropy(self.get_statevector(), subsystem)
     
     def __str__(self):
         """String representation of the circuit state."""
-        return str(self.state)
+        return str(self.get_state())
 
 
 def create_bell_state(state_type: str = '00'):
@@ -228,10 +711,8 @@ def create_ghz_state(num_qubits: int):
     Create a GHZ (Greenberger-Horne-Zeilinger) state.
     For n qubits: (|00...0⟩ + |11...1⟩)/√2
     
-    Note: Currently limited to 2 qubits due to gate implementation.
-    
     Args:
-        num_qubits: Number of qubits (currently only 2 supported)
+        num_qubits: Number of qubits (at least 2)
     
     Returns:
         QuantumCircuit with GHZ state
@@ -239,9 +720,6 @@ def create_ghz_state(num_qubits: int):
     if num_qubits < 2:
         raise ValueError("GHZ state requires at least 2 qubits")
     
-    if num_qubits > 2:
-        raise NotImplementedError("GHZ state for >2 qubits not yet implemented")
-    
     circuit = QuantumCircuit(num_qubits)
     
     # Apply Hadamard to first qubit
@@ -251,4 +729,93 @@ def create_ghz_state(num_qubits: int):
     for i in range(num_qubits - 1):
         circuit.cnot(i, i + 1)
     
-    return circuit
\ No newline at end of file
+    return circuit
+
+
+def simulate_batch(circuits: List[QuantumCircuit]) -> List[QuantumState]:
+    """
+    Run many circuits, sharing the work between circuits of the same width.
+    
+    Circuits with the same number of qubits and precision are stacked into
+    one (batch, 2, ..., 2) tensor and simulated in lockstep. At each step
+    the circuits whose next operation is the same gate on the same qubits
+    are updated by a single kernel call over the batch axis; measurements
+    are applied circuit by circuit. Like run(), every circuit starts from
+    its own initial state and ends up holding its result, in a state
+    vector of its own. Gate fusion is not applied, since it would break the
+    sharing between circuits; single-precision rows get the same norm-drift
+    checks as run().
+    
+    Args:
+        circuits: Circuits with recorded operations (usually lazy)
+    
+    Returns:
+        The resulting quantum states, in the order of circuits
+    
+    Raises:
+        ValueError: If any circuit has an invalid initial state, unbound
+                    parameters or another backend than statevector;
+                    nothing is simulated then
+    """
+    for circuit in circuits:
+        circuit._require_statevector("Batch simulation")
+        if circuit.parameters:
+            names = ', '.join(param.name for param in circuit.parameters)
+            raise ValueError(f"Batch simulation needs bound parameters; unbound: {names}")
+    initial_vectors = [circuit._create_state(circuit.initial_state).state_vector
+                       for circuit in circuits]
+    
+    groups = {}
+    for index, circuit in enumerate(circuits):
+        groups.setdefault((circuit.num_qubits, circuit.precision), []).append(index)
+    
+    for (num_qubits, precision), members in groups.items():
+        dtype = PRECISIONS[precision]
+        states = np.stack([initial_vectors[index] for index in members])
+        tensor = states.reshape((len(members),) + (2,) * num_qubits)
+        programs = [circuits[index].operations for index in members]
+        
+        for step in range(max(len(operations) for operations in programs)):
+            shared = {}
+            for row, operations in enumerate(programs):
+                if step >= len(operations):
+                    continue
+                operation = operations[step]
+                
+                if operation['type'] == 'measurement':
+                    # The row is a contiguous view, so it collapses in place
+                    state = QuantumState(num_qubits, precision=precision)
+                    state.state_vector = states[row]
+                    operation['outcome'], _ = state.measure(qubit_index=operation['qubits'][0])
+                else:
+                    key = (operation['gate'], tuple(operation['qubits']),
+                           tuple(operation.get('params', ())))
+                    shared.setdefault(key, []).append(row)
+            
+            for (name, qubits, params), rows in shared.items():
+                gate = get_gate(name, *params, dtype=dtype)
+                # Axis 0 is the batch, so qubit q is axis q + 1
+                axes = [qubit + 1 for qubit in qubits]
+                if len(rows) == len(members):
+                    _apply_to_tensor(tensor, gate, axes)
+                else:
+                    subset = tensor[rows]
+                    _apply_to_tensor(subset, gate, axes)
+                    tensor[rows] = subset
+        
+            if precision != 'double' and (step + 1) % NORM_CHECK_INTERVAL == 0:
+                # Same drift check as run(), on each row still executing
+                for row, index in enumerate(members):
+                    if step < len(programs[row]):
+                        circuit = circuits[index]
+                        circuit.state = QuantumState(num_qubits, precision=precision)
+                        circuit.state.state_vector = states[row]
+                        circuit._check_normalization()
+        
+        # Rows are views into the stack; each circuit gets its own copy
+        for row, index in enumerate(members):
+            circuits[index].resume(states[row].copy(), len(programs[row]))
+            circuits[index]._unchecked_operations = len(programs[row]) % NORM_CHECK_INTERVAL
+        del states, tensor
+    
+    return [circuit.state for circuit in circuits]
@@ -0,0 +1,160 @@
+"""
+Mixed-state (density matrix) representation.
+"""
+import numpy as np
+from typing import List, Tuple
+from src.gates import QuantumGate, _apply_to_tensor
+from src.noise import KrausChannel
+from src.quantum_state import format_basis_states
+
+
+class DensityMatrix:
+    """
+    Represents a possibly mixed quantum state as a density matrix.
+    
+    Offers the same interface as QuantumState (apply_gate, measure,
+    sample) plus apply_channel. The matrix is viewed as a (2, ..., 2)
+    tensor with 2n axes: axis q is the row index of qubit q and axis n + q
+    its column index. A gate U is applied as U on the row axes and conj(U)
+    on the column axes, so U ρ U† costs two O(4^n * 2^k) contractions and
+    no 4^n x 4^n superoperator is ever built.
+    
+    Attributes:
+        num_qubits: Number of qubits in the state
+        density_matrix: Complex 2^n x 2^n numpy array
+    """
+    
+    def __init__(self, num_qubits: int, initial_state: str = None):
+        """
+        Initialize a pure basis state |s⟩⟨s|.
+        
+        Args:
+            num_qubits: Number of qubits
+            initial_state: Binary string like '01'. If None, |00...0⟩
+        """
+        self.num_qubits = num_qubits
+        self.dim = 2 ** num_qubits
+        
+        index = 0 if initial_state is None else int(initial_state, 2)
+        self.density_matrix = np.zeros((self.dim, self.dim), dtype=complex)
+        self.density_matrix[index, index] = 1.0
+    
+    @classmethod
+    def from_state_vector(cls, state_vector: np.ndarray) -> 'DensityMatrix':
+        """Create the density matrix |ψ⟩⟨ψ| of a pure state."""
+        state = cls(state_vector.size.bit_length() - 1)
+        state.density_matrix = np.outer(state_vector, state_vector.conj())
+        return state
+    
+    def _tensor(self) -> np.ndarray:
+        return self.density_matrix.reshape((2,) * (2 * self.num_qubits))
+    
+    def _check_qubits(self, qubits: List[int]):
+        for qubit in qubits:
+            if not 0 <= qubit < self.num_qubits:
+                raise IndexError(f"Qubit {qubit} out of range for {self.num_qubits} qubits")
+    
+    def apply_gate(self, gate: QuantumGate, qubits: List[int]):
+        """
+        Apply a gate (ρ → U ρ U†) to the given qubits, in place.
+        
+        Args:
+            gate: Gate to apply
+            qubits: Target qubit indices, in the gate's own qubit order
+        """
+        self._check_qubits(qubits)
+        tensor = self._tensor()
+        _apply_to_tensor(tensor, gate, qubits)
+        _apply_to_tensor(tensor, gate.conjugate(), [self.num_qubits + q for q in qubits])
+    
+    def apply_channel(self, channel: KrausChannel, qubit: int):
+        """
+        Apply a single-qubit noise channel (ρ → Σ K ρ K†), in place.
+        
+        The channel only mixes the row and column index of the qubit, so
+        it is applied as its 4x4 superoperator on those two axes.
+        
+        Args:
+            channel: Channel to apply
+            qubit: Qubit it acts on
+        """
+        self._check_qubits([qubit])
+        _apply_to_tensor(self._tensor(), channel.superoperator, [qubit, self.num_qubits + qubit])
+    
+    def probabilities(self) -> np.ndarray:
+        """Probabilities of the computational basis states (the diagonal)."""
+        return np.clip(np.diagonal(self.density_matrix).real, 0, None)
+    
+    def purity(self) -> float:
+        """Tr(ρ²): 1 for pure states, 1/2^n for the maximally mixed state."""
+        return float(np.sum(np.abs(self.density_matrix) ** 2))
+    
+    def measure(self, qubit_index: int = None,
+                rng: np.random.Generator = None) -> Tuple[str, float]:
+        """
+        Simulate measurement of the state.
+        
+        Args:
+            qubit_index: If None, measures all qubits (without collapsing,
+                         as QuantumState does). Otherwise measures that qubit
+                         and collapses the state.
+            rng: Random generator to use. Defaults to NumPy's global one.
+        
+        Returns:
+            Tuple of (outcome, probability)
+        """
+        probabilities = self.probabilities()
+        random = np.random if rng is None else rng
+        
+        if qubit_index is None:
+            outcome_index = random.choice(self.dim, p=probabilities / probabilities.sum())
+            return format(outcome_index, f'0{self.num_qubits}b'), probabilities[outcome_index]
+        
+        self._check_qubits([qubit_index])
+        
+        per_value = probabilities.reshape(2 ** qubit_index, 2, -1).sum(axis=(0, 2))
+        prob_0, prob_1 = float(per_value[0]), float(per_value[1])
+        
+        outcome_bit = 1 if random.random() * (prob_0 + prob_1) < prob_1 else 0
+        outcome_prob = prob_1 if outcome_bit == 1 else prob_0
+        
+        # Project rows and columns onto the outcome, then renormalize
+        tensor = self._tensor()
+        for axis in (qubit_index, self.num_qubits + qubit_index):
+            index = [slice(None)] * tensor.ndim
+            index[axis] = 1 - outcome_bit
+            tensor[tuple(index)] = 0
+        self.density_matrix /= outcome_prob
+        
+        return str(outcome_bit), outcome_prob
+    
+    def sample(self, shots: int, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Draw many full-register measurement outcomes without collapsing the state.
+        
+        Args:
+            shots: Number of outcomes to draw
+            rng: Random generator to use. Defaults to a fresh generator.
+        
+        Returns:
+            Integer array of basis-state indices, one per shot
+        """
+        if shots < 0:
+            raise ValueError("Number of shots must be non-negative")
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        cumulative = np.cumsum(self.probabilities())
+        draws = rng.random(shots) * cumulative[-1]
+        indices = np.searchsorted(cumulative, draws, side='right')
+        return np.minimum(indices, self.dim - 1)
+    
+    def __str__(self) -> str:
+        """Basis-state probabilities and purity."""
+        probabilities = self.probabilities()
+        indices = np.flatnonzero(probabilities > 1e-10)
+        terms = [
+            f"{probabilities[index]:.3f}|{label}⟩⟨{label}|"
+            for index, label in zip(indices, format_basis_states(indices, self.num_qubits))
+        ]
+        return " + ".join(terms) + f" (diagonal, purity {self.purity():.3f})"
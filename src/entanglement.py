@@ -2,7 +2,7 @@
 Entanglement analysis for quantum states.
 """
 import numpy as np
-from typing import Tuple
+from typing import List, Sequence, Union
 
 
 def calculate_density_matrix(state_vector: np.ndarray) -> np.ndarray:
@@ -19,54 +19,122 @@ def calculate_density_matrix(state_vector: np.ndarray) -> np.ndarray:
     return state_vector @ state_vector.conj().T
 
 
-def partial_trace(density_matrix: np.ndarray, keep_qubit: int = 0) -> np.ndarray:
+def _num_qubits(state_vector: np.ndarray) -> int:
+    num_qubits = int(state_vector.size).bit_length() - 1
+    if state_vector.size != 2 ** num_qubits or num_qubits < 1:
+        raise ValueError(f"State vector size {state_vector.size} is not a power of 2")
+    return num_qubits
+
+
+def _check_subsystem(subsystem: Sequence[int], num_qubits: int) -> List[int]:
+    subsystem = list(subsystem)
+    if not subsystem or len(set(subsystem)) != len(subsystem):
+        raise ValueError("Subsystem must be a non-empty list of distinct qubits")
+    for qubit in subsystem:
+        if not 0 <= qubit < num_qubits:
+            raise IndexError(f"Qubit {qubit} out of range for {num_qubits} qubits")
+    return subsystem
+
+
+def _cut_matrix(state_vector: np.ndarray, subsystem: Sequence[int]) -> np.ndarray:
     """
-    Calculate the partial trace of a 2-qubit density matrix.
+    View a pure state as a (2^a, 2^b) matrix, rows indexed by the subsystem qubits.
+    
+    Only a subsystem that is not a leading block of qubits needs a
+    transposed copy; otherwise this is a reshape of the state vector.
+    """
+    num_qubits = _num_qubits(state_vector)
+    subsystem = _check_subsystem(subsystem, num_qubits)
+    
+    order = subsystem + [q for q in range(num_qubits) if q not in subsystem]
+    tensor = state_vector.reshape((2,) * num_qubits)
+    if order != list(range(num_qubits)):
+        tensor = tensor.transpose(order)
+    return tensor.reshape(2 ** len(subsystem), -1)
+
+
+def partial_trace(state: np.ndarray, keep: Union[int, Sequence[int]] = 0) -> np.ndarray:
+    """
+    Calculate the reduced density matrix of a subset of qubits.
+    
+    For a pure state vector the result is M M† with M the state reshaped
+    to (2^k, 2^(n-k)), so the full density matrix is never formed and the
+    cost is O(2^n * 2^k). A density matrix is viewed as a (2, ..., 2)
+    tensor and the traced qubits are contracted in one einsum call.
     
     Args:
-        density_matrix: 4x4 density matrix of 2-qubit system
-        keep_qubit: Which qubit to keep (0 or 1)
+        state: State vector of length 2^n or density matrix of shape (2^n, 2^n)
+        keep: Qubit or list of qubits to keep
         
     Returns:
-        2x2 reduced density matrix
+        2^k x 2^k reduced density matrix, its qubits in the order of keep
+    """
+    keep = [keep] if isinstance(keep, (int, np.integer)) else list(keep)
+    
+    if state.ndim == 1 or (state.ndim == 2 and state.shape[1] == 1):
+        matrix = _cut_matrix(state.ravel(), keep)
+        return matrix @ matrix.conj().T
+    
+    if state.ndim != 2 or state.shape[0] != state.shape[1]:
+        raise ValueError("Expected a state vector or a square density matrix")
+    
+    num_qubits = _num_qubits(state[0])
+    keep = _check_subsystem(keep, num_qubits)
+    
+    # Row axes are labelled 0..n-1; column axes share the label of their row
+    # when traced out, and get label n + q when kept
+    rows = list(range(num_qubits))
+    columns = [num_qubits + q if q in keep else q for q in range(num_qubits)]
+    output = keep + [num_qubits + q for q in keep]
+    
+    tensor = state.reshape((2,) * (2 * num_qubits))
+    reduced = np.einsum(tensor, rows + columns, output, optimize=True)
+    return reduced.reshape(2 ** len(keep), 2 ** len(keep))
+
+
+def schmidt_coefficients(state_vector: np.ndarray, subsystem: Sequence[int] = (0,)) -> np.ndarray:
     """
-    if density_matrix.shape != (4, 4):
-        raise ValueError("Density matrix must be 4x4 for 2-qubit system")
+    Schmidt coefficients of a pure state across the cut subsystem | rest.
     
-    reduced = np.zeros((2, 2), dtype=complex)
+    These are the singular values of the state reshaped to (2^a, 2^b).
+    They are taken from the eigenvalues of the Gram matrix of the smaller
+    side (at most 2^(n/2) square), which is much faster than an SVD of a
+    wide matrix, and the 2^n x 2^n density matrix is never formed.
     
-    if keep_qubit == 0:
-        # Trace out qubit 1
-        reduced[0, 0] = density_matrix[0, 0] + density_matrix[1, 1]
-        reduced[0, 1] = density_matrix[0, 2] + density_matrix[1, 3]
-        reduced[1, 0] = density_matrix[2, 0] + density_matrix[3, 1]
-        reduced[1, 1] = density_matrix[2, 2] + density_matrix[3, 3]
+    Args:
+        state_vector: Pure state of n qubits
+        subsystem: Qubits on one side of the cut
+        
+    Returns:
+        Schmidt coefficients in descending order
+    """
+    matrix = _cut_matrix(state_vector, subsystem)
+    if matrix.shape[0] <= matrix.shape[1]:
+        gram = matrix @ matrix.conj().T
     else:
-        # Trace out qubit 0
-        reduced[0, 0] = density_matrix[0, 0] + density_matrix[2, 2]
-        reduced[0, 1] = density_matrix[0, 1] + density_matrix[2, 3]
-        reduced[1, 0] = density_matrix[1, 0] + density_matrix[3, 2]
-        reduced[1, 1] = density_matrix[1, 1] + density_matrix[3, 3]
+        gram = matrix.conj().T @ matrix
     
-    return reduced
+    eigenvalues = np.linalg.eigvalsh(gram)[::-1]
+    return np.sqrt(np.clip(eigenvalues, 0, None))
 
 
-def von_neumann_entropy(state_vector: np.ndarray) -> float:
+def von_neumann_entropy(state_vector: np.ndarray, subsystem: Sequence[int] = (0,)) -> float:
     """
     Calculate the von Neumann entropy of a subsystem.
     
     Args:
         state_vector: State vector of the full system
+        subsystem: Qubits whose reduced state is measured (default: qubit 0)
         
     Returns:
         von Neumann entropy
     """
-    density_matrix = calculate_density_matrix(state_vector)
-    reduced = partial_trace(density_matrix, keep_qubit=0)
-    
-    # Get eigenvalues
-    eigenvalues = np.linalg.eigvalsh(reduced)
-    
+    # Eigenvalues of the reduced density matrix
+    return _entropy(schmidt_coefficients(state_vector, subsystem) ** 2)
+
+
+def _entropy(eigenvalues: np.ndarray) -> float:
+    """Entropy in bits of a density matrix given its eigenvalues."""
     # Filter out near-zero eigenvalues to avoid log(0)
     eigenvalues = eigenvalues[eigenvalues > 1e-10]
     
@@ -76,56 +144,88 @@ def von_neumann_entropy(state_vector: np.ndarray) -> float:
     # Calculate entropy: -sum(λ * log2(λ))
     entropy = -np.sum(eigenvalues * np.log2(eigenvalues))
     
-    return float(entropy)
+    return float(max(entropy, 0.0))
 
 
 def is_entangled(state_vector: np.ndarray, threshold: float = 1e-10) -> bool:
     """
-    Check if a 2-qubit state is entangled.
+    Check if a pure state is entangled, i.e. not a product of single-qubit states.
+    
+    A pure state is a full product state exactly when every single qubit
+    is in a pure reduced state, so each one-qubit cut is checked in turn.
     
     Args:
-        state_vector: State vector of 2-qubit system
+        state_vector: State vector of the system
         threshold: Threshold for considering entropy non-zero
         
     Returns:
         True if entangled, False if separable
     """
-    entropy = von_neumann_entropy(state_vector)
-    return entropy > threshold
+    return any(
+        von_neumann_entropy(state_vector, [qubit]) > threshold
+        for qubit in range(_num_qubits(state_vector))
+    )
 
 
-def calculate_concurrence(state_vector: np.ndarray) -> float:
+def calculate_concurrence(state_vector: np.ndarray, subsystem: Sequence[int] = (0,)) -> float:
     """
-    Calculate the concurrence of a 2-qubit state.
+    Calculate the concurrence of a pure state across a cut.
+    
+    Uses C = sqrt(d/(d-1) * (1 - Tr ρ_A²)) with d the dimension of the
+    smaller side, which is 1 for a maximally entangled cut. Two-qubit
+    states use the equivalent closed form 2|ad - bc| directly, which is
+    exactly 0 for product states.
     
     Args:
-        state_vector: State vector of 2-qubit system
+        state_vector: State vector of the system
+        subsystem: Qubits on one side of the cut (default: qubit 0)
         
     Returns:
         Concurrence value (0 = separable, 1 = maximally entangled)
+    
+    Raises:
+        ValueError: If the subsystem is empty or repeats a qubit
+        IndexError: If a subsystem qubit is out of range
     """
-    if len(state_vector) != 4:
-        raise ValueError("State vector must have 4 components for 2-qubit system")
+    subsystem = _check_subsystem(subsystem, _num_qubits(state_vector))
+    if state_vector.size == 4 and len(subsystem) == 1:
+        a, b, c, d = state_vector
+        return float(min(2 * abs(a * d - b * c), 1.0))
     
-    # For pure states: C = 2|a*d - b*c|
-    a, b, c, d = state_vector
-    concurrence = 2 * abs(a * d - b * c)
+    coefficients = schmidt_coefficients(state_vector, subsystem)
+    purity = np.sum(coefficients ** 4)
+    d = min(2 ** len(subsystem), state_vector.size // 2 ** len(subsystem))
+    if d == 1:
+        return 0.0
+    
+    # Rounding leaves 1 - purity around 1e-16 for product states, which the
+    # square root would turn into a spurious ~1e-8
+    impurity = 1 - purity
+    if impurity <= 1e-12:
+        return 0.0
+    concurrence = np.sqrt(d / (d - 1) * impurity)
     
     return float(min(concurrence, 1.0))
 
 
-def measure_entanglement_entropy(state_vector: np.ndarray) -> dict:
+def measure_entanglement_entropy(state_vector: np.ndarray, subsystem: List[int] = None) -> dict:
     """
-    Comprehensive entanglement analysis for 2-qubit systems.
+    Comprehensive entanglement analysis of a pure state.
     
     Args:
-        state_vector: State vector of the 2-qubit system
+        state_vector: State vector of the system (at least 2 qubits)
+        subsystem: Qubits on one side of the cut for entropy and
+                   concurrence. Defaults to qubit 0; larger, balanced cuts
+                   cost up to O(2^(3n/2)) time.
         
     Returns:
         Dictionary with entanglement metrics
     """
-    entropy = von_neumann_entropy(state_vector)
-    concurrence_value = calculate_concurrence(state_vector)
+    if subsystem is None:
+        subsystem = [0]
+    
+    entropy = von_neumann_entropy(state_vector, subsystem)
+    concurrence_value = calculate_concurrence(state_vector, subsystem)
     is_entangled_state = is_entangled(state_vector)
     
     # Classify entanglement
@@ -144,5 +244,78 @@ def measure_entanglement_entropy(state_vector: np.ndarray) -> dict:
         'is_entangled': bool(is_entangled_state),
         'entropy': float(entropy),
         'concurrence': float(concurrence_value),
-        'classification': classification
-    }
\ No newline at end of file
+        'classification': classification,
+        'subsystem': list(subsystem)
+    }
+
+
+def _bloch_from_density(rho: np.ndarray) -> np.ndarray:
+    """Bloch vector (⟨X⟩, ⟨Y⟩, ⟨Z⟩) of a 2x2 density matrix."""
+    return np.array([
+        2 * rho[0, 1].real,
+        -2 * rho[0, 1].imag,
+        (rho[0, 0] - rho[1, 1]).real
+    ])
+
+
+def bloch_vector(state: np.ndarray, qubit: int) -> np.ndarray:
+    """
+    Bloch vector of one qubit of a state vector or density matrix.
+    
+    Args:
+        state: State vector or density matrix of the full system
+        qubit: Qubit to describe
+        
+    Returns:
+        Array (x, y, z); its length is 1 for a pure reduced state and
+        shrinks towards 0 as the qubit gets entangled with the rest
+    """
+    return _bloch_from_density(partial_trace(state, [qubit]))
+
+
+def entanglement_map(state_vector: np.ndarray) -> dict:
+    """
+    Single-qubit Bloch vectors and pairwise mutual information of a pure state.
+    
+    Every pair's 4x4 reduced state is computed once with partial_trace.
+    The single-qubit states are taken as its marginals rather than with
+    extra passes over the state, and their entropies are computed once and
+    reused in every pair's mutual information I(i:j) = S(i) + S(j) - S(ij).
+    
+    Args:
+        state_vector: Pure state of n qubits
+        
+    Returns:
+        Dictionary with 'bloch_vectors' (n x 3), 'entropies' (n, the
+        entanglement entropy of each qubit with the rest) and
+        'mutual_information' (n x n, symmetric, zero diagonal) arrays
+    """
+    num_qubits = _num_qubits(state_vector)
+    singles = [None] * num_qubits
+    pair_entropies = np.zeros((num_qubits, num_qubits))
+    
+    for i in range(num_qubits):
+        for j in range(i + 1, num_qubits):
+            rho = partial_trace(state_vector, [i, j])
+            pair_entropies[i, j] = _entropy(np.linalg.eigvalsh(rho))
+            
+            tensor = rho.reshape(2, 2, 2, 2)
+            if singles[i] is None:
+                singles[i] = np.einsum('acbc->ab', tensor)
+            if singles[j] is None:
+                singles[j] = np.einsum('cacb->ab', tensor)
+    
+    if num_qubits == 1:
+        singles[0] = partial_trace(state_vector, [0])
+    
+    entropies = np.array([_entropy(np.linalg.eigvalsh(rho)) for rho in singles])
+    
+    mutual_information = entropies[:, np.newaxis] + entropies[np.newaxis, :] - pair_entropies
+    mutual_information = np.triu(mutual_information, k=1)
+    mutual_information = np.clip(mutual_information + mutual_information.T, 0, None)
+    
+    return {
+        'bloch_vectors': np.array([_bloch_from_density(rho) for rho in singles]),
+        'entropies': entropies,
+        'mutual_information': mutual_information
+    }
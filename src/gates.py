@@ -1,8 +1,28 @@
 """
 Quantum Gates implementation.
 """
+import copy
+import functools
+import threading
+from collections import OrderedDict
+
 import numpy as np
-from typing import List
+from typing import Callable, List, Tuple, Union
+
+
+# Gate kinds used to pick an application kernel
+PERMUTATION = 'permutation'
+DIAGONAL = 'diagonal'
+DENSE = 'dense'
+
+# Tolerance used when classifying matrix entries as 0 or 1
+_ATOL = 1e-12
+
+# Complex dtypes for the 'precision' option of states and circuits
+PRECISIONS = {
+    'single': np.complex64,
+    'double': np.complex128,
+}
 
 
 class QuantumGate:
@@ -20,13 +40,191 @@ class QuantumGate:
         self.name = name
         self.matrix = matrix
         self.num_qubits = num_qubits
+        
+        # Controls are peeled off once so every application can restrict the
+        # update to the slice where all controls are |1⟩
+        self.num_controls, self.target_matrix = split_controls(matrix)
+        self.kind = classify_matrix(self.target_matrix)
+        self._conjugate = None
     
     def __str__(self):
         return f"{self.name} Gate"
+    
+    def astype(self, dtype) -> 'QuantumGate':
+        """Copy of the gate with its matrices cast to dtype, keeping its classification."""
+        gate = copy.copy(self)
+        gate.matrix = self.matrix.astype(dtype)
+        gate.target_matrix = self.target_matrix.astype(dtype)
+        gate._conjugate = None
+        return gate
+    
+    def conjugate(self) -> 'QuantumGate':
+        """
+        The gate with complex-conjugated matrices, e.g. for the column side of U ρ U†.
+        
+        It is built once and kept on the gate, so shared gates are conjugated
+        only once. Conjugation keeps the zero pattern, so the controls and
+        the classification carry over; real gates are their own conjugate.
+        """
+        if self._conjugate is None:
+            if not np.any(self.matrix.imag):
+                self._conjugate = self
+            else:
+                gate = copy.copy(self)
+                gate.name = f"{self.name}*"
+                gate.matrix = self.matrix.conj()
+                gate.target_matrix = self.target_matrix.conj()
+                gate._conjugate = self
+                self._conjugate = gate.freeze()
+        return self._conjugate
+    
+    def freeze(self) -> 'QuantumGate':
+        """Mark the gate's matrices read-only so the gate can be shared."""
+        self.matrix.flags.writeable = False
+        self.target_matrix.flags.writeable = False
+        return self
+
+
+class GateCache:
+    """
+    LRU-bounded cache of parameterized gates keyed on (name, params).
+    
+    Attributes:
+        maxsize: Maximum number of gates kept
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that had to build the gate
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._gates = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, name: str, params: tuple, factory: Callable[..., QuantumGate]) -> QuantumGate:
+        """
+        Return the cached gate for (name, params), building it on a miss.
+        
+        Args:
+            name: Gate name
+            params: Hashable tuple of gate parameters
+            factory: Called as factory(*params) to build a missing gate
+            
+        Returns:
+            Shared, read-only QuantumGate
+        """
+        key = (name, params)
+        with self._lock:
+            gate = self._gates.get(key)
+            if gate is not None:
+                self._gates.move_to_end(key)
+                self.hits += 1
+                return gate
+            self.misses += 1
+        
+        gate = factory(*params).freeze()
+        
+        with self._lock:
+            self._gates[key] = gate
+            self._gates.move_to_end(key)
+            while len(self._gates) > self.maxsize:
+                self._gates.popitem(last=False)
+        return gate
+    
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._gates),
+                'maxsize': self.maxsize
+            }
+    
+    def clear(self):
+        """Drop all cached gates and reset the counters."""
+        with self._lock:
+            self._gates.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared cache for parameterized gates (rotations)
+gate_cache = GateCache()
+
+
+def fixed_gate(factory: Callable[[], QuantumGate]) -> Callable[[], QuantumGate]:
+    """
+    Decorator turning a gate factory into an accessor for one shared instance.
+    
+    The gate is built on first use and its matrix is made read-only, so
+    callers can apply it as often as they like without allocating.
+    """
+    gate = None
+    
+    @functools.wraps(factory)
+    def accessor() -> QuantumGate:
+        nonlocal gate
+        if gate is None:
+            gate = factory().freeze()
+        return gate
+    
+    return accessor
+
+
+def classify_matrix(matrix: np.ndarray) -> str:
+    """
+    Classify a gate matrix by the cheapest kernel that can apply it.
+    
+    Args:
+        matrix: Square gate matrix
+        
+    Returns:
+        DIAGONAL if the matrix only has phases on the diagonal,
+        PERMUTATION if every row and column has exactly one non-zero entry
+        (an index permutation with optional phases, e.g. X, Y, SWAP),
+        DENSE otherwise
+    """
+    nonzero = np.abs(matrix) > _ATOL
+    
+    if not np.any(nonzero & ~np.eye(matrix.shape[0], dtype=bool)):
+        return DIAGONAL
+    if np.all(nonzero.sum(axis=0) == 1) and np.all(nonzero.sum(axis=1) == 1):
+        return PERMUTATION
+    return DENSE
+
+
+def split_controls(matrix: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Split a gate into leading control qubits and the gate they control.
+    
+    A gate is controlled on its first qubit when its matrix is block
+    diagonal with an identity block for the control in |0⟩.
+    
+    Args:
+        matrix: 2^k x 2^k gate matrix
+        
+    Returns:
+        Tuple of (number of leading control qubits, controlled sub-matrix)
+    """
+    num_controls = 0
+    
+    while matrix.shape[0] > 2:
+        half = matrix.shape[0] // 2
+        if not (np.allclose(matrix[:half, :half], np.eye(half), atol=_ATOL)
+                and np.allclose(matrix[:half, half:], 0, atol=_ATOL)
+                and np.allclose(matrix[half:, :half], 0, atol=_ATOL)):
+            break
+        num_controls += 1
+        matrix = matrix[half:, half:]
+    
+    return num_controls, matrix
 
 
 # Single-qubit gates
 
+@fixed_gate
 def hadamard() -> QuantumGate:
     """
     Hadamard gate (H).
@@ -40,6 +238,7 @@ def hadamard() -> QuantumGate:
     return QuantumGate("H", matrix, num_qubits=1)
 
 
+@fixed_gate
 def pauli_x() -> QuantumGate:
     """
     Pauli-X gate (NOT gate).
@@ -53,6 +252,7 @@ def pauli_x() -> QuantumGate:
     return QuantumGate("X", matrix, num_qubits=1)
 
 
+@fixed_gate
 def pauli_y() -> QuantumGate:
     """
     Pauli-Y gate.
@@ -65,6 +265,7 @@ def pauli_y() -> QuantumGate:
     return QuantumGate("Y", matrix, num_qubits=1)
 
 
+@fixed_gate
 def pauli_z() -> QuantumGate:
     """
     Pauli-Z gate.
@@ -82,6 +283,7 @@ def pauli_z() -> QuantumGate:
 
 # Two-qubit gates
 
+@fixed_gate
 def cnot() -> QuantumGate:
     """
     Controlled-NOT (CNOT) gate.
@@ -103,6 +305,7 @@ def cnot() -> QuantumGate:
     return QuantumGate("CNOT", matrix, num_qubits=2)
 
 
+@fixed_gate
 def swap() -> QuantumGate:
     """
     SWAP gate.
@@ -120,39 +323,235 @@ def swap() -> QuantumGate:
     return QuantumGate("SWAP", matrix, num_qubits=2)
 
 
+def controlled(gate: QuantumGate, num_controls: int = 1) -> QuantumGate:
+    """
+    Build a controlled version of a gate.
+    
+    The control qubits come first in the resulting gate's qubit order.
+    
+    Args:
+        gate: Gate to control
+        num_controls: Number of control qubits
+        
+    Returns:
+        Controlled gate acting on num_controls + gate.num_qubits qubits
+    """
+    dim = 2 ** (num_controls + gate.num_qubits)
+    block = gate.matrix.shape[0]
+    matrix = np.eye(dim, dtype=gate.matrix.dtype)
+    matrix[dim - block:, dim - block:] = gate.matrix
+    
+    return QuantumGate("C" * num_controls + gate.name, matrix,
+                       num_qubits=num_controls + gate.num_qubits)
+
+
 # Helper functions
 
+def _basis_index(ndim: int, axes: List[int], local_index: int) -> tuple:
+    """Index selecting the slice where the given axes hold the bits of local_index."""
+    index = [slice(None)] * ndim
+    for pos, axis in enumerate(axes):
+        index[axis] = (local_index >> (len(axes) - 1 - pos)) & 1
+    # Trailing Ellipsis keeps the result a view even when every axis is fixed
+    return tuple(index) + (Ellipsis,)
+
+
+def _apply_diagonal(tensor: np.ndarray, diagonal: np.ndarray, axes: List[int]):
+    """Multiply each basis slice of the target axes by its phase, in place."""
+    for local_index, phase in enumerate(diagonal):
+        if abs(phase - 1) <= _ATOL:
+            continue
+        view = tensor[_basis_index(tensor.ndim, axes, local_index)]
+        if abs(phase + 1) <= _ATOL:
+            np.negative(view, out=view)
+        else:
+            view *= phase
+
+
+def _apply_permutation(tensor: np.ndarray, matrix: np.ndarray, axes: List[int]):
+    """Move basis slices of the target axes along the gate's permutation, in place."""
+    dim = matrix.shape[0]
+    source = np.argmax(np.abs(matrix) > _ATOL, axis=1)
+    phases = matrix[np.arange(dim), source]
+    
+    def slice_of(local_index):
+        return tensor[_basis_index(tensor.ndim, axes, local_index)]
+    
+    def assign(dst, src_view):
+        phase = phases[dst]
+        if abs(phase - 1) <= _ATOL:
+            slice_of(dst)[...] = src_view
+        else:
+            np.multiply(src_view, phase, out=slice_of(dst))
+    
+    # Walk each permutation cycle so only one slice is ever buffered
+    visited = np.zeros(dim, dtype=bool)
+    for start in range(dim):
+        if visited[start]:
+            continue
+        visited[start] = True
+        
+        if source[start] == start:
+            if abs(phases[start] - 1) > _ATOL:
+                view = slice_of(start)
+                view *= phases[start]
+            continue
+        
+        saved = slice_of(start).copy()
+        current = start
+        while source[current] != start:
+            assign(current, slice_of(source[current]))
+            current = source[current]
+            visited[current] = True
+        assign(current, saved)
+
+
+def _apply_dense(tensor: np.ndarray, matrix: np.ndarray, axes: List[int]):
+    """Contract a dense gate matrix against the target axes, in place."""
+    k = len(axes)
+    
+    if k == 1:
+        view_0 = tensor[_basis_index(tensor.ndim, axes, 0)]
+        view_1 = tensor[_basis_index(tensor.ndim, axes, 1)]
+        saved = view_0.copy()
+        view_0 *= matrix[0, 0]
+        view_0 += matrix[0, 1] * view_1
+        view_1 *= matrix[1, 1]
+        view_1 += matrix[1, 0] * saved
+        return
+    
+    gate_tensor = matrix.reshape((2,) * (2 * k))
+    result = np.tensordot(gate_tensor, tensor, axes=(list(range(k, 2 * k)), list(axes)))
+    tensor[...] = np.moveaxis(result, list(range(k)), list(axes))
+
+
+def _apply_to_tensor(tensor: np.ndarray, gate: Union[QuantumGate, np.ndarray],
+                     axes: List[int]):
+    """
+    Apply a gate to the given axes of a (2, ..., 2) tensor in place.
+    
+    Leading control qubits are handled by restricting the update to the
+    view where they are |1⟩, then the remaining gate is dispatched to the
+    diagonal, permutation or dense kernel.
+    """
+    if isinstance(gate, QuantumGate):
+        num_controls, matrix, kind = gate.num_controls, gate.target_matrix, gate.kind
+    else:
+        num_controls, matrix = split_controls(gate)
+        kind = classify_matrix(matrix)
+    
+    axes = list(axes)
+    if num_controls:
+        control_axes = axes[:num_controls]
+        index = [slice(None)] * tensor.ndim
+        for axis in control_axes:
+            index[axis] = 1
+        tensor = tensor[tuple(index) + (Ellipsis,)]
+        # Integer indexing drops the control axes, so shift the targets down
+        axes = [axis - sum(c < axis for c in control_axes) for axis in axes[num_controls:]]
+    
+    if kind == DIAGONAL:
+        _apply_diagonal(tensor, np.diag(matrix), axes)
+    elif kind == PERMUTATION:
+        _apply_permutation(tensor, matrix, axes)
+    else:
+        _apply_dense(tensor, matrix, axes)
+
+
 def apply_single_qubit_gate(state_vector: np.ndarray, gate: QuantumGate, 
-                           target_qubit: int, num_qubits: int) -> np.ndarray:
+                           target_qubit: int, num_qubits: int,
+                           out: np.ndarray = None) -> np.ndarray:
     """
     Apply a single-qubit gate to a target qubit in a multi-qubit state.
     
+    The state vector is viewed as a (2^t, 2, 2^(n-t-1)) tensor so the 2x2
+    matrix only mixes the two slices of the target axis. This costs O(2^n)
+    instead of building the full 2^n x 2^n operator with np.kron. Diagonal
+    and permutation gates (Z, X, Y) skip the complex multiplies entirely.
+    
     Args:
         state_vector: Current state vector
         gate: Single-qubit gate to apply
         target_qubit: Index of qubit to apply gate to (0-indexed)
         num_qubits: Total number of qubits in the system
+        out: Optional preallocated buffer for the result, with the same
+             shape as state_vector. Passing state_vector itself updates the
+             state in place.
         
     Returns:
         New state vector after applying the gate
     """
-    # Create identity matrices for other qubits
-    identity = np.eye(2, dtype=complex)
+    if not 0 <= target_qubit < num_qubits:
+        raise IndexError(f"Target qubit {target_qubit} out of range for {num_qubits} qubits")
     
-    # Build the full gate matrix using tensor products
-    if target_qubit == 0:
-        full_gate = gate.matrix
-        for i in range(1, num_qubits):
-            full_gate = np.kron(full_gate, identity)
-    else:
-        full_gate = identity
-        for i in range(1, num_qubits):
-            if i == target_qubit:
-                full_gate = np.kron(full_gate, gate.matrix)
-            else:
-                full_gate = np.kron(full_gate, identity)
+    # The kernel below reads state_vector while writing out, so an aliased
+    # buffer goes through apply_gate, which updates the state in place
+    if gate.kind != DENSE or (out is not None and np.shares_memory(out, state_vector)):
+        return apply_gate(state_vector, gate, [target_qubit], out=out)
+    
+    if out is None:
+        out = np.empty_like(state_vector)
+    
+    # Qubit 0 is the most significant bit of the basis index
+    shape = (2 ** target_qubit, 2, 2 ** (num_qubits - target_qubit - 1))
+    psi = state_vector.reshape(shape)
+    result = out.reshape(shape)
+    
+    psi_0 = psi[:, 0, :]
+    psi_1 = psi[:, 1, :]
+    m = gate.matrix
+    
+    np.multiply(psi_0, m[0, 0], out=result[:, 0, :])
+    result[:, 0, :] += m[0, 1] * psi_1
+    np.multiply(psi_0, m[1, 0], out=result[:, 1, :])
+    result[:, 1, :] += m[1, 1] * psi_1
+    
+    return out
+
+
+def apply_gate(state_vector: np.ndarray, matrix: Union[QuantumGate, np.ndarray],
+               qubits: List[int], out: np.ndarray = None) -> np.ndarray:
+    """
+    Apply a k-qubit gate to an ordered list of qubits in an n-qubit state.
+    
+    The state is viewed as an n-dimensional (2, 2, ..., 2) tensor and the
+    gate is applied to the target axes in O(2^n * 2^k), without building
+    permutation or full-size matrices. The first entry of qubits
+    corresponds to the most significant bit of the gate's basis.
+    
+    Permutation gates (X, CNOT, SWAP) only move slices, diagonal gates
+    (Z, CZ) only rescale slices, and controlled gates only touch the slice
+    where their controls are |1⟩.
+    
+    Args:
+        state_vector: Current state vector of length 2^n
+        matrix: 2^k x 2^k unitary matrix, or a QuantumGate
+        qubits: Target qubit indices, in the gate's own qubit order
+        out: Optional buffer for the result. Passing state_vector itself
+             updates the state in place.
+        
+    Returns:
+        New state vector
+    """
+    num_qubits = state_vector.size.bit_length() - 1
+    k = len(qubits)
+    gate_matrix = matrix.matrix if isinstance(matrix, QuantumGate) else matrix
     
-    return full_gate @ state_vector
+    if gate_matrix.shape != (2 ** k, 2 ** k):
+        raise ValueError(f"Gate matrix shape {gate_matrix.shape} does not act on {k} qubits")
+    if len(set(qubits)) != k:
+        raise ValueError(f"Gate qubits must be distinct, got {list(qubits)}")
+    for qubit in qubits:
+        if not 0 <= qubit < num_qubits:
+            raise IndexError(f"Qubit {qubit} out of range for {num_qubits} qubits")
+    
+    if out is None:
+        out = state_vector.copy()
+    elif out is not state_vector:
+        np.copyto(out, state_vector)
+    
+    _apply_to_tensor(out.reshape((2,) * num_qubits), matrix, qubits)
+    return out
 
 
 def apply_two_qubit_gate(state_vector: np.ndarray, gate: QuantumGate,
@@ -171,36 +570,189 @@ def apply_two_qubit_gate(state_vector: np.ndarray, gate: QuantumGate,
     Returns:
         New state vector
     """
-    # For 2-qubit systems, directly apply the gate
-    if num_qubits == 2:
-        # Check if qubits are in the right order
-        if control_qubit == 0 and target_qubit == 1:
-            return gate.matrix @ state_vector
-        elif control_qubit == 1 and target_qubit == 0:
-            # Need to swap qubit order
-            swap_gate = swap()
-            temp = swap_gate.matrix @ state_vector
-            temp = gate.matrix @ temp
-            return swap_gate.matrix @ temp
+    if state_vector.size != 2 ** num_qubits:
+        raise ValueError(f"State vector size {state_vector.size} does not match {num_qubits} qubits")
     
-    # For more qubits, this gets complex - simplified version
-    raise NotImplementedError("Multi-qubit gates for >2 qubits not fully implemented")
+    return apply_gate(state_vector, gate, [control_qubit, target_qubit])
 
 
 def rotation_x(theta: float) -> QuantumGate:
     """
     Rotation around X-axis by angle theta.
     
+    Gates are served from gate_cache, so repeated angles reuse the same
+    matrix instead of recomputing the trigonometry.
+    
     Args:
         theta: Rotation angle in radians
         
     Returns:
         RX gate
     """
-    
+    return gate_cache.get("RX", (float(theta),), _build_rotation_x)
+
+
+def _build_rotation_x(theta: float) -> QuantumGate:
+    """Build a fresh RX gate."""
     matrix = np.array([
         [np.cos(theta/2), -1j * np.sin(theta/2)],
         [-1j * np.sin(theta/2), np.cos(theta/2)]
     ], dtype=complex)
     
-    return QuantumGate("RX", matrix, num_qubits=1)
\ No newline at end of file
+    return QuantumGate("RX", matrix, num_qubits=1)
+
+
+def rotation_y(theta: float) -> QuantumGate:
+    """
+    Rotation around Y-axis by angle theta (cached like rotation_x).
+    
+    Args:
+        theta: Rotation angle in radians
+        
+    Returns:
+        RY gate
+    """
+    return gate_cache.get("RY", (float(theta),), _build_rotation_y)
+
+
+def _build_rotation_y(theta: float) -> QuantumGate:
+    """Build a fresh RY gate."""
+    matrix = np.array([
+        [np.cos(theta/2), -np.sin(theta/2)],
+        [np.sin(theta/2), np.cos(theta/2)]
+    ], dtype=complex)
+    
+    return QuantumGate("RY", matrix, num_qubits=1)
+
+
+def rotation_z(theta: float) -> QuantumGate:
+    """
+    Rotation around Z-axis by angle theta (cached like rotation_x).
+    
+    Args:
+        theta: Rotation angle in radians
+        
+    Returns:
+        RZ gate
+    """
+    return gate_cache.get("RZ", (float(theta),), _build_rotation_z)
+
+
+def _build_rotation_z(theta: float) -> QuantumGate:
+    """Build a fresh RZ gate."""
+    matrix = np.array([
+        [np.exp(-1j * theta/2), 0],
+        [0, np.exp(1j * theta/2)]
+    ], dtype=complex)
+    
+    return QuantumGate("RZ", matrix, num_qubits=1)
+
+
+def rotation_matrices(name: str, thetas: np.ndarray) -> np.ndarray:
+    """
+    Build the matrices of one rotation gate for many angles at once.
+    
+    Args:
+        name: Rotation gate name ('RX', 'RY' or 'RZ')
+        thetas: 1-D array of rotation angles in radians
+        
+    Returns:
+        Complex array of shape (len(thetas), 2, 2)
+    """
+    thetas = np.asarray(thetas, dtype=float)
+    cos, sin = np.cos(thetas / 2), np.sin(thetas / 2)
+    matrices = np.zeros((thetas.size, 2, 2), dtype=complex)
+    
+    name = name.upper()
+    if name == 'RX':
+        matrices[:, 0, 0] = matrices[:, 1, 1] = cos
+        matrices[:, 0, 1] = matrices[:, 1, 0] = -1j * sin
+    elif name == 'RY':
+        matrices[:, 0, 0] = matrices[:, 1, 1] = cos
+        matrices[:, 0, 1] = -sin
+        matrices[:, 1, 0] = sin
+    elif name == 'RZ':
+        matrices[:, 0, 0] = cos - 1j * sin
+        matrices[:, 1, 1] = cos + 1j * sin
+    else:
+        raise ValueError(f"Unknown rotation gate: {name}")
+    return matrices
+
+
+def apply_batched_single_qubit(tensor: np.ndarray, matrices: np.ndarray, axis: int):
+    """
+    Apply a different 2x2 matrix to each entry of a batch of states, in place.
+    
+    Args:
+        tensor: (batch, 2, ..., 2) tensor of states
+        matrices: (batch, 2, 2) array, one matrix per state
+        axis: Tensor axis of the target qubit (qubit q is axis q + 1)
+    """
+    # Broadcast each matrix entry over the non-batch axes of its state
+    shape = (-1,) + (1,) * (tensor.ndim - 2)
+    entry = lambda row, col: matrices[:, row, col].reshape(shape)
+    
+    view_0 = tensor[_basis_index(tensor.ndim, [axis], 0)]
+    view_1 = tensor[_basis_index(tensor.ndim, [axis], 1)]
+    saved = view_0.copy()
+    view_0 *= entry(0, 0)
+    view_0 += entry(0, 1) * view_1
+    view_1 *= entry(1, 1)
+    view_1 += entry(1, 0) * saved
+
+
+# Registry of gates by name, used to rebuild gates from recorded operations
+FIXED_GATES = {
+    'H': hadamard,
+    'X': pauli_x,
+    'Y': pauli_y,
+    'Z': pauli_z,
+    'CNOT': cnot,
+    'SWAP': swap,
+}
+
+PARAMETERIZED_GATES = {
+    'RX': rotation_x,
+    'RY': rotation_y,
+    'RZ': rotation_z,
+}
+
+# Uncached builders, so other precisions are cached under a single key
+_PARAMETERIZED_BUILDERS = {
+    'RX': _build_rotation_x,
+    'RY': _build_rotation_y,
+    'RZ': _build_rotation_z,
+}
+
+
+def get_gate(name: str, *params: float, dtype=np.complex128) -> QuantumGate:
+    """
+    Look up a shared gate by name.
+    
+    Args:
+        name: Gate name (e.g., 'H', 'CNOT', 'RX')
+        params: Gate parameters for parameterized gates
+        dtype: Complex dtype of the matrix, matching the state it is applied
+               to. Gates in other precisions than complex128 are cast once
+               and kept in gate_cache.
+        
+    Returns:
+        Shared, read-only QuantumGate
+    """
+    name = name.upper()
+    if name in FIXED_GATES:
+        if params:
+            raise ValueError(f"Gate {name} takes no parameters")
+        builder = lambda: FIXED_GATES[name]()
+    elif name in PARAMETERIZED_GATES:
+        builder = _PARAMETERIZED_BUILDERS[name]
+    else:
+        raise ValueError(f"Unknown gate: {name}")
+    
+    dtype = np.dtype(dtype)
+    if dtype == np.complex128:
+        return FIXED_GATES[name]() if name in FIXED_GATES else PARAMETERIZED_GATES[name](*params)
+    # One lookup keyed on (name, dtype) and params, so the cast gate is
+    # counted once in the cache statistics
+    return gate_cache.get(f"{name}/{dtype.name}", tuple(float(p) for p in params),
+                          lambda *p: builder(*p).astype(dtype))
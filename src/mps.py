@@ -0,0 +1,288 @@
+"""
+Matrix product state (MPS) representation for low-entanglement circuits.
+"""
+import numpy as np
+from typing import List, Tuple
+from src.gates import QuantumGate
+
+
+class MPSState:
+    """
+    Represents a pure state as a chain of tensors, one per qubit.
+    
+    Tensor q has shape (left bond, 2, right bond), and an amplitude is the
+    product of the (left, right) matrices selected by each bit, so memory
+    is O(n * chi^2) for bond dimension chi instead of O(2^n). Product
+    states have chi = 1 and a GHZ state chi = 2.
+    
+    The chain is kept in mixed canonical form around an orthogonality
+    center: every tensor left of it is left-orthonormal and every tensor
+    right of it right-orthonormal. A two-qubit gate on neighbours moves the
+    center onto them, contracts the pair and splits it again with an SVD,
+    where dropping small singular values is the optimal truncation. Gates
+    on distant qubits are routed with SWAPs.
+    
+    Offers the same interface as QuantumState (apply_gate, measure,
+    sample) for one- and two-qubit gates.
+    
+    Attributes:
+        num_qubits: Number of qubits in the state
+        tensors: List of (left, 2, right) complex arrays
+        max_bond: Largest bond dimension kept, or None for no limit
+        cutoff: Largest discarded weight (sum of squared singular values
+                dropped) allowed per split
+        truncation_error: Total weight discarded so far; 1 - fidelity with
+                          the exact state is at most about this
+    """
+    
+    def __init__(self, num_qubits: int, initial_state: str = None,
+                 max_bond: int = None, cutoff: float = 1e-12):
+        """
+        Initialize a computational basis state (bond dimension 1).
+        
+        Args:
+            num_qubits: Number of qubits
+            initial_state: Binary string like '01'. If None, |00...0⟩
+            max_bond: Largest bond dimension to keep after a gate
+            cutoff: Discarded weight tolerated per SVD split
+        """
+        if max_bond is not None and max_bond < 1:
+            raise ValueError("Maximum bond dimension must be positive")
+        if cutoff < 0:
+            raise ValueError("Cutoff must be non-negative")
+        
+        self.num_qubits = num_qubits
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        self.truncation_error = 0.0
+        self.center = 0
+        
+        bits = '0' * num_qubits if initial_state is None else initial_state
+        self.tensors = []
+        for bit in bits:
+            tensor = np.zeros((1, 2, 1), dtype=complex)
+            tensor[0, int(bit), 0] = 1.0
+            self.tensors.append(tensor)
+    
+    @property
+    def bond_dimensions(self) -> List[int]:
+        """Dimensions of the n - 1 bonds between neighbouring qubits."""
+        return [tensor.shape[2] for tensor in self.tensors[:-1]]
+    
+    def _check_qubits(self, qubits: List[int]):
+        for qubit in qubits:
+            if not 0 <= qubit < self.num_qubits:
+                raise IndexError(f"Qubit {qubit} out of range for {self.num_qubits} qubits")
+    
+    def _move_center(self, site: int):
+        """Shift the orthogonality center to site with QR decompositions."""
+        while self.center < site:
+            tensor = self.tensors[self.center]
+            left, _, right = tensor.shape
+            q, r = np.linalg.qr(tensor.reshape(left * 2, right))
+            self.tensors[self.center] = q.reshape(left, 2, -1)
+            self.tensors[self.center + 1] = np.einsum(
+                'ab,bsc->asc', r, self.tensors[self.center + 1])
+            self.center += 1
+        
+        while self.center > site:
+            tensor = self.tensors[self.center]
+            left, _, right = tensor.shape
+            # LQ decomposition, done as the QR of the transpose
+            q, r = np.linalg.qr(tensor.reshape(left, 2 * right).T)
+            self.tensors[self.center] = q.T.reshape(-1, 2, right)
+            self.tensors[self.center - 1] = np.einsum(
+                'asb,bc->asc', self.tensors[self.center - 1], r.T)
+            self.center -= 1
+    
+    def _apply_single(self, matrix: np.ndarray, qubit: int):
+        self.tensors[qubit] = np.einsum('st,atb->asb', matrix, self.tensors[qubit])
+    
+    def _apply_adjacent(self, matrix: np.ndarray, site: int):
+        """Apply a 4x4 gate to qubits (site, site + 1) and split the pair again."""
+        self._move_center(site)
+        first, second = self.tensors[site], self.tensors[site + 1]
+        left, right = first.shape[0], second.shape[2]
+        
+        pair = np.einsum('asb,btc->astc', first, second)
+        pair = np.einsum('stuv,auvc->astc', matrix.reshape(2, 2, 2, 2), pair)
+        u, s, vh = np.linalg.svd(pair.reshape(left * 2, 2 * right), full_matrices=False)
+        
+        keep = self._bond_to_keep(s)
+        discarded = float(np.sum(s[keep:] ** 2))
+        norm = float(np.sum(s ** 2))
+        if discarded > 0:
+            self.truncation_error += discarded / norm
+        s = s[:keep] / np.sqrt(np.sum(s[:keep] ** 2) / norm)
+        
+        self.tensors[site] = u[:, :keep].reshape(left, 2, keep)
+        self.tensors[site + 1] = (s[:, np.newaxis] * vh[:keep]).reshape(keep, 2, right)
+        self.center = site + 1
+    
+    def _bond_to_keep(self, singular_values: np.ndarray) -> int:
+        """Number of singular values to keep under max_bond and cutoff."""
+        weights = singular_values ** 2
+        weights = weights / weights.sum()
+        # tail[k] is the weight discarded when keeping k values
+        tail = np.concatenate([np.cumsum(weights[::-1])[::-1], [0.0]])
+        keep = max(1, int(np.argmax(tail <= self.cutoff)))
+        if self.max_bond is not None:
+            keep = min(keep, self.max_bond)
+        return keep
+    
+    def apply_gate(self, gate: QuantumGate, qubits: List[int]):
+        """
+        Apply a one- or two-qubit gate, truncating the bond it touches.
+        
+        Args:
+            gate: Gate to apply
+            qubits: Target qubit indices, in the gate's own qubit order
+        
+        Raises:
+            ValueError: If the gate acts on more than two qubits
+        """
+        self._check_qubits(qubits)
+        matrix = gate.matrix if isinstance(gate, QuantumGate) else np.asarray(gate)
+        
+        if len(qubits) == 1:
+            self._apply_single(matrix, qubits[0])
+            return
+        if len(qubits) != 2:
+            raise ValueError("The MPS backend only applies one- and two-qubit gates")
+        
+        first, second = qubits
+        if first > second:
+            # Swap the gate's qubit order so it acts on (lower, higher)
+            matrix = matrix.reshape(2, 2, 2, 2).transpose(1, 0, 3, 2).reshape(4, 4)
+            first, second = second, first
+        
+        # Bring the higher qubit next to the lower one, apply, and route it back
+        swap = np.eye(4)[[0, 2, 1, 3]]
+        for site in range(second - 1, first, -1):
+            self._apply_adjacent(swap, site)
+        self._apply_adjacent(matrix, first)
+        for site in range(first + 1, second):
+            self._apply_adjacent(swap, site)
+    
+    def amplitude(self, bitstring: str) -> complex:
+        """
+        Amplitude of one basis state, in O(n * chi^2).
+        
+        Args:
+            bitstring: Basis state like '0101', qubit 0 first
+        
+        Returns:
+            Complex amplitude ⟨bitstring|ψ⟩
+        """
+        if len(bitstring) != self.num_qubits:
+            raise ValueError(f"Bitstring length must match num_qubits ({self.num_qubits})")
+        
+        vector = np.ones(1, dtype=complex)
+        for tensor, bit in zip(self.tensors, bitstring):
+            vector = vector @ tensor[:, int(bit), :]
+        return complex(vector[0])
+    
+    def to_state_vector(self) -> np.ndarray:
+        """
+        Contract the chain into the full 2^n state vector.
+        
+        Only meant for small states, e.g. to check results against the
+        statevector backend.
+        """
+        vector = np.ones((1, 1), dtype=complex)
+        for tensor in self.tensors:
+            vector = np.einsum('ia,asb->isb', vector, tensor).reshape(-1, tensor.shape[2])
+        return vector.ravel()
+    
+    def _sample_bits(self, shots: int, rng) -> np.ndarray:
+        """
+        Draw (shots, n) outcome bits qubit by qubit, all shots at once.
+        
+        With the center on qubit 0 everything to its right is
+        right-orthonormal, so the probability of the next bit given the
+        bits drawn so far is the squared norm of the left environment
+        times that bit's slice; no 2^n vector is formed.
+        """
+        self._move_center(0)
+        bits = np.zeros((shots, self.num_qubits), dtype=np.uint8)
+        environment = np.ones((shots, 1), dtype=complex)
+        
+        for qubit, tensor in enumerate(self.tensors):
+            branches = np.einsum('ia,asb->sib', environment, tensor)
+            weights = np.sum(np.abs(branches) ** 2, axis=2)
+            prob_1 = weights[1] / (weights[0] + weights[1])
+            outcome = (rng.random(shots) < prob_1).astype(np.uint8)
+            
+            bits[:, qubit] = outcome
+            chosen = branches[outcome, np.arange(shots)]
+            norms = np.sqrt(weights[outcome, np.arange(shots)])
+            environment = chosen / norms[:, np.newaxis]
+        return bits
+    
+    def sample(self, shots: int, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Draw many full-register measurement outcomes without collapsing the state.
+        
+        Args:
+            shots: Number of outcomes to draw
+            rng: Random generator to use. Defaults to a fresh generator.
+        
+        Returns:
+            Array of basis-state indices, one per shot. Indices of more than
+            62 qubits do not fit in int64 and are returned as Python ints
+            in an object array.
+        """
+        if shots < 0:
+            raise ValueError("Number of shots must be non-negative")
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        bits = self._sample_bits(shots, rng)
+        if self.num_qubits <= 62:
+            weights = np.int64(1) << np.arange(self.num_qubits - 1, -1, -1, dtype=np.int64)
+            return bits.astype(np.int64) @ weights
+        
+        padding = -self.num_qubits % 8
+        packed = np.packbits(bits, axis=1)
+        return np.array([int.from_bytes(row.tobytes(), 'big') >> padding for row in packed],
+                        dtype=object)
+    
+    def measure(self, qubit_index: int = None,
+                rng: np.random.Generator = None) -> Tuple[str, float]:
+        """
+        Simulate measurement of the state.
+        
+        Args:
+            qubit_index: If None, measures all qubits (without collapsing,
+                         as QuantumState does). Otherwise measures that qubit
+                         and collapses the state.
+            rng: Random generator to use. Defaults to NumPy's global one.
+        
+        Returns:
+            Tuple of (outcome, probability)
+        """
+        if rng is None:
+            rng = np.random
+        
+        if qubit_index is None:
+            outcome = ''.join(map(str, self._sample_bits(1, rng)[0]))
+            return outcome, abs(self.amplitude(outcome)) ** 2
+        
+        self._check_qubits([qubit_index])
+        # With the center on the qubit, its slices' norms are the probabilities
+        self._move_center(qubit_index)
+        tensor = self.tensors[qubit_index]
+        prob_0 = float(np.sum(np.abs(tensor[:, 0, :]) ** 2))
+        prob_1 = float(np.sum(np.abs(tensor[:, 1, :]) ** 2))
+        
+        outcome_bit = 1 if rng.random() * (prob_0 + prob_1) < prob_1 else 0
+        outcome_prob = prob_1 if outcome_bit == 1 else prob_0
+        
+        tensor[:, 1 - outcome_bit, :] = 0
+        tensor[:, outcome_bit, :] /= np.sqrt(outcome_prob)
+        return str(outcome_bit), outcome_prob
+    
+    def __str__(self) -> str:
+        """Bond dimensions and accumulated truncation error."""
+        return (f"MPS with bond dimensions {self.bond_dimensions} "
+                f"(truncation error {self.truncation_error:.2e})")
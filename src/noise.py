@@ -0,0 +1,159 @@
+"""
+Noise channels in the Kraus representation.
+"""
+import numpy as np
+from typing import List, Sequence, Tuple
+from src.gates import QuantumGate
+
+
+class KrausChannel:
+    """
+    Single-qubit quantum channel ρ → Σ_k K_k ρ K_k†.
+    
+    Attributes:
+        name: Channel name
+        operators: Kraus operators as 2x2 complex matrices
+        superoperator: 4x4 gate Σ_k K_k ⊗ conj(K_k) acting on the row and
+                       column index of the qubit in a density matrix
+    """
+    
+    def __init__(self, name: str, operators: Sequence[np.ndarray]):
+        """
+        Initialize a channel.
+        
+        Args:
+            name: Channel name (e.g., 'depolarizing')
+            operators: Kraus operators; they must satisfy Σ K† K = I
+        """
+        operators = [np.asarray(operator, dtype=complex) for operator in operators]
+        if not operators or any(operator.shape != (2, 2) for operator in operators):
+            raise ValueError("Kraus operators must be a non-empty list of 2x2 matrices")
+        
+        completeness = sum(operator.conj().T @ operator for operator in operators)
+        if not np.allclose(completeness, np.eye(2), atol=1e-10):
+            raise ValueError(f"Kraus operators of {name} are not trace preserving")
+        
+        self.name = name
+        self.operators = operators
+        
+        # Wrapped once so the gate kernels classify them a single time
+        self.kraus_gates = [
+            QuantumGate(f"{name}[{i}]", operator, num_qubits=1).freeze()
+            for i, operator in enumerate(operators)
+        ]
+        superoperator = sum(np.kron(operator, operator.conj()) for operator in operators)
+        self.superoperator = QuantumGate(name, superoperator, num_qubits=2).freeze()
+    
+    def __repr__(self):
+        return f"KrausChannel({self.name!r}, {len(self.operators)} operators)"
+
+
+def _check_probability(name: str, value: float):
+    if not 0 <= value <= 1:
+        raise ValueError(f"{name} must be between 0 and 1, got {value}")
+
+
+def depolarizing(p: float) -> KrausChannel:
+    """
+    Depolarizing channel ρ → (1 - p) ρ + p I/2.
+    
+    Args:
+        p: Depolarizing probability
+    
+    Returns:
+        KrausChannel with operators √(1 - 3p/4) I and √(p/4) X, Y, Z
+    """
+    _check_probability('Depolarizing probability', p)
+    paulis = [
+        np.eye(2),
+        np.array([[0, 1], [1, 0]]),
+        np.array([[0, -1j], [1j, 0]]),
+        np.array([[1, 0], [0, -1]])
+    ]
+    weights = [np.sqrt(1 - 3 * p / 4)] + [np.sqrt(p / 4)] * 3
+    return KrausChannel('depolarizing', [w * pauli for w, pauli in zip(weights, paulis)])
+
+
+def amplitude_damping(gamma: float) -> KrausChannel:
+    """
+    Amplitude damping channel (energy relaxation |1⟩ → |0⟩).
+    
+    Args:
+        gamma: Probability of decaying from |1⟩ to |0⟩
+    
+    Returns:
+        KrausChannel
+    """
+    _check_probability('Damping rate', gamma)
+    return KrausChannel('amplitude_damping', [
+        np.array([[1, 0], [0, np.sqrt(1 - gamma)]]),
+        np.array([[0, np.sqrt(gamma)], [0, 0]])
+    ])
+
+
+def bit_flip(p: float) -> KrausChannel:
+    """
+    Bit-flip channel: X is applied with probability p.
+    
+    Args:
+        p: Flip probability
+    
+    Returns:
+        KrausChannel
+    """
+    _check_probability('Flip probability', p)
+    return KrausChannel('bit_flip', [
+        np.sqrt(1 - p) * np.eye(2),
+        np.sqrt(p) * np.array([[0, 1], [1, 0]])
+    ])
+
+
+class NoiseModel:
+    """
+    Describes which channels follow which gates.
+    
+    Channels are applied after a gate to each qubit it acted on.
+    Measurements are noiseless.
+    """
+    
+    def __init__(self):
+        self._rules = []
+    
+    def add_channel(self, channel: KrausChannel, gates: Sequence[str] = None,
+                    qubits: Sequence[int] = None) -> 'NoiseModel':
+        """
+        Apply a channel after gates.
+        
+        Args:
+            channel: Channel to apply
+            gates: Gate names it follows (e.g. ['H', 'CNOT']); None for all
+            qubits: Qubits it affects; None for all
+        
+        Returns:
+            The noise model, for chaining
+        """
+        gates = None if gates is None else {gate.upper() for gate in gates}
+        qubits = None if qubits is None else set(qubits)
+        self._rules.append((channel, gates, qubits))
+        return self
+    
+    def channels_for(self, operation: dict) -> List[Tuple[KrausChannel, int]]:
+        """
+        Get the channels that follow a recorded operation.
+        
+        Args:
+            operation: Operation as recorded by QuantumCircuit
+        
+        Returns:
+            List of (channel, qubit) pairs, in the order to apply them
+        """
+        if operation['type'] == 'measurement':
+            return []
+        
+        return [
+            (channel, qubit)
+            for channel, gates, qubits in self._rules
+            if gates is None or operation['gate'].upper() in gates
+            for qubit in operation['qubits']
+            if qubits is None or qubit in qubits
+        ]
@@ -0,0 +1,113 @@
+"""
+Circuit optimization passes.
+"""
+import numpy as np
+from typing import List, Tuple
+from src.gates import QuantumGate, get_gate
+
+
+def _reorder_matrix(matrix: np.ndarray, qubits: List[int], order: List[int]) -> np.ndarray:
+    """
+    Express a gate matrix acting on qubits in a different qubit order.
+
+    Args:
+        matrix: 2^k x 2^k gate matrix in the order given by qubits
+        qubits: Qubits the matrix is written for
+        order: Same qubits in the desired order
+
+    Returns:
+        Equivalent matrix written for order
+    """
+    if list(qubits) == list(order):
+        return matrix
+
+    k = len(qubits)
+    perm = [list(qubits).index(q) for q in order]
+    tensor = matrix.reshape((2,) * (2 * k))
+    tensor = tensor.transpose(perm + [k + p for p in perm])
+    return tensor.reshape(2 ** k, 2 ** k)
+
+
+def fuse_operations(operations: List[dict]) -> Tuple[List[dict], dict]:
+    """
+    Fuse adjacent gates acting on the same set of qubits into one unitary.
+
+    Gates only fuse when no other operation touched any of their qubits in
+    between, so the result is equivalent to the input program. Runs whose
+    product is the identity (X·X, H·H, CNOT·CNOT, ...) are dropped.
+    Measurements are barriers on their qubit and are passed through as the
+    same dict objects, so recorded outcomes still land in the circuit.
+
+    Args:
+        operations: Operations as recorded by QuantumCircuit
+
+    Returns:
+        Tuple of (compiled operations, report). Fused operations have type
+        'fused' and carry the combined QuantumGate under 'unitary'. The
+        report counts state sweeps before and after fusion.
+    """
+    # Each block is either a measurement or a run of gates on one qubit set
+    blocks = []
+    last_block = {}
+
+    for operation in operations:
+        qubits = operation['qubits']
+
+        if operation['type'] == 'measurement':
+            blocks.append({'measurement': operation})
+            for qubit in qubits:
+                last_block[qubit] = len(blocks) - 1
+            continue
+
+        matrix = get_gate(operation['gate'], *operation.get('params', ())).matrix
+        candidate = last_block.get(qubits[0])
+
+        if (candidate is not None
+                and 'measurement' not in blocks[candidate]
+                and set(blocks[candidate]['qubits']) == set(qubits)
+                and all(last_block.get(q) == candidate for q in qubits)):
+            block = blocks[candidate]
+            matrix = _reorder_matrix(matrix, qubits, block['qubits'])
+            block['matrix'] = matrix @ block['matrix']
+            block['operations'].append(operation)
+            continue
+
+        blocks.append({
+            'qubits': list(qubits),
+            'matrix': matrix,
+            'operations': [operation]
+        })
+        for qubit in qubits:
+            last_block[qubit] = len(blocks) - 1
+
+    compiled = []
+    cancelled = 0
+    for block in blocks:
+        if 'measurement' in block:
+            compiled.append(block['measurement'])
+        elif len(block['operations']) == 1:
+            compiled.append(block['operations'][0])
+        elif np.allclose(block['matrix'], np.eye(block['matrix'].shape[0]), atol=1e-12):
+            cancelled += 1
+        else:
+            names = [op['gate'] for op in block['operations']]
+            # Operations are recorded in time order, so the name reads
+            # left to right in the order the gates are applied
+            gate = QuantumGate('·'.join(names), block['matrix'], len(block['qubits']))
+            compiled.append({
+                'gate': gate.name,
+                'qubits': block['qubits'],
+                'type': 'fused',
+                'unitary': gate
+            })
+
+    original_sweeps = sum(1 for op in operations if op['type'] != 'measurement')
+    compiled_sweeps = sum(1 for op in compiled if op['type'] != 'measurement')
+    report = {
+        'original_sweeps': original_sweeps,
+        'compiled_sweeps': compiled_sweeps,
+        'sweeps_saved': original_sweeps - compiled_sweeps,
+        'cancelled_blocks': cancelled
+    }
+
+    return compiled, report
@@ -3,18 +3,26 @@ Quantum State representation and operations.
 """
 import numpy as np
 from typing import List, Tuple
+from src.gates import QuantumGate, apply_gate, PRECISIONS
 
 
 class QuantumState:
     """
     Represents a quantum state as a state vector.
     
+    With precision='single' the amplitudes are complex64: half the memory
+    of the default complex128, at the cost of rounding errors around 1e-7
+    per gate that slowly push the norm away from 1 (see
+    normalization_error and renormalize).
+    
     Attributes:
         num_qubits: Number of qubits in the state
         state_vector: Complex numpy array representing the state
+        precision: 'single' or 'double'
     """
     
-    def __init__(self, num_qubits: int, initial_state: str = None):
+    def __init__(self, num_qubits: int, initial_state: str = None,
+                 precision: str = 'double'):
         """
         Initialize a quantum state.
         
@@ -22,13 +30,19 @@ class QuantumState:
             num_qubits: Number of qubits
             initial_state: Binary string like '00', '01', '10', '11'
                           If None, initializes to |00...0⟩
+            precision: 'single' (complex64) or 'double' (complex128)
         """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Precision must be one of: {', '.join(PRECISIONS)}")
+        
         self.num_qubits = num_qubits
         self.dim = 2 ** num_qubits
+        self.precision = precision
+        self.dtype = PRECISIONS[precision]
         
         if initial_state is None:
             # Default: |00...0⟩
-            self.state_vector = np.zeros(self.dim, dtype=complex)
+            self.state_vector = np.zeros(self.dim, dtype=self.dtype)
             self.state_vector[0] = 1.0
         else:
             self.state_vector = self._create_basis_state(initial_state)
@@ -47,55 +61,128 @@ class QuantumState:
         # Hint: Convert the binary string to a decimal index
         # and create a vector with 1.0 at that position
         index = int(binary_string, 2)
-        state = np.zeros(self.dim, dtype=complex)
+        state = np.zeros(self.dim, dtype=self.dtype)
         state[index] = 1.0
         return state
     
-    def measure(self, qubit_index: int = None) -> Tuple[str, float]:
+    def apply_gate(self, gate: QuantumGate, qubits: List[int]):
+        """
+        Apply a gate to the given qubits, updating the state vector in place.
+        
+        Args:
+            gate: Gate to apply; cast to the state's precision if needed
+            qubits: Target qubit indices, in the gate's own qubit order
+        """
+        if isinstance(gate, QuantumGate):
+            if gate.matrix.dtype != self.dtype:
+                gate = gate.astype(self.dtype)
+        else:
+            gate = np.asarray(gate, dtype=self.dtype)
+        apply_gate(self.state_vector, gate, qubits, out=self.state_vector)
+    
+    def measure(self, qubit_index: int = None,
+                rng: np.random.Generator = None) -> Tuple[str, float]:
         """
         Simulate measurement of the quantum state.
         
         Args:
             qubit_index: If None, measures all qubits. Otherwise measures specific qubit.
+                         Qubit 0 is the leftmost bit of the basis state, as in gates.
+            rng: Random generator to use. Defaults to NumPy's global one.
             
         Returns:
             Tuple of (outcome, probability)
         """
-        probabilities = np.abs(self.state_vector) ** 2
-        
         if qubit_index is None:
             # Measure all qubits
-            outcome_index = np.random.choice(self.dim, p=probabilities)
+            # In float64 and renormalized, so single-precision drift cannot
+            # trip choice()'s check that p sums to 1
+            probabilities = np.abs(self.state_vector).astype(float) ** 2
+            outcome_index = (np.random if rng is None else rng).choice(
+                self.dim, p=probabilities / probabilities.sum())
             outcome = format(outcome_index, f'0{self.num_qubits}b')
             return outcome, probabilities[outcome_index]
-        else:
-            # Measure single qubit
-            # Sum probabilities for qubit being |0⟩ or |1⟩
-            prob_0 = 0.0
-            prob_1 = 0.0
-            
-            for i in range(self.dim):
-                bit_value = (i >> qubit_index) & 1
-                if bit_value == 0:
-                    prob_0 += probabilities[i]
-                else:
-                    prob_1 += probabilities[i]
-            
-            # Random measurement outcome
-            outcome_bit = 1 if np.random.random() < prob_1 else 0
-            outcome_prob = prob_1 if outcome_bit == 1 else prob_0
-            
-            # Collapse the state
-            new_state = np.zeros_like(self.state_vector)
-            for i in range(self.dim):
-                bit_value = (i >> qubit_index) & 1
-                if bit_value == outcome_bit:
-                    new_state[i] = self.state_vector[i] / np.sqrt(outcome_prob)
+        
+        if not 0 <= qubit_index < self.num_qubits:
+            raise IndexError(f"Qubit {qubit_index} out of range for {self.num_qubits} qubits")
+        
+        self.state_vector = np.ascontiguousarray(self.state_vector)
+        
+        # View the measured qubit as the middle axis of a 3D tensor
+        psi = self.state_vector.reshape(
+            2 ** qubit_index, 2, 2 ** (self.num_qubits - qubit_index - 1)
+        )
+        
+        # Sum |amplitude|^2 over real and imaginary parts in one reduction
+        parts = psi.view(psi.real.dtype)
+        prob_0 = float(np.einsum('ij,ij->', parts[:, 0, :], parts[:, 0, :]))
+        prob_1 = float(np.einsum('ij,ij->', parts[:, 1, :], parts[:, 1, :]))
+        
+        # Random measurement outcome
+        draw = np.random.random() if rng is None else rng.random()
+        outcome_bit = 1 if draw * (prob_0 + prob_1) < prob_1 else 0
+        outcome_prob = prob_1 if outcome_bit == 1 else prob_0
+        
+        # Collapse the state in place
+        psi[:, 1 - outcome_bit, :] = 0
+        psi[:, outcome_bit, :] /= np.sqrt(outcome_prob)
+        
+        return str(outcome_bit), outcome_prob
+    
+    def sample(self, shots: int, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Draw many full-register measurement outcomes without collapsing the state.
+        
+        Probabilities are computed once and all shots are drawn with a
+        single cumulative-sum + searchsorted call.
+        
+        Args:
+            shots: Number of outcomes to draw
+            rng: Random generator to use. Defaults to a fresh generator.
             
-            self.state_vector = new_state
+        Returns:
+            Integer array of basis-state indices, one per shot
+        """
+        if shots < 0:
+            raise ValueError("Number of shots must be non-negative")
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        cumulative = np.cumsum(np.abs(self.state_vector) ** 2, dtype=float)
+        # Scale the draws instead of renormalizing to absorb rounding drift
+        draws = rng.random(shots) * cumulative[-1]
+        indices = np.searchsorted(cumulative, draws, side='right')
+        return np.minimum(indices, self.dim - 1)
+    
+    def normalization_error(self) -> float:
+        """|<ψ|ψ> - 1|, accumulated in float64 whatever the precision."""
+        return abs(float(np.sum(np.abs(self.state_vector) ** 2, dtype=float)) - 1.0)
+    
+    def renormalize(self):
+        """Rescale the state vector to unit norm, in place."""
+        self.state_vector /= np.sqrt(np.sum(np.abs(self.state_vector) ** 2, dtype=float))
+    
+    def sparse_amplitudes(self, threshold: float = 1e-10,
+                          top_k: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the significant amplitudes as parallel index and value arrays.
+        
+        Args:
+            threshold: Amplitudes with magnitude at or below this are dropped
+            top_k: If given, keep only the k largest-magnitude amplitudes
             
-            return str(outcome_bit), outcome_prob
+        Returns:
+            Tuple of (basis-state indices in ascending order, amplitudes)
+        """
+        magnitudes = np.abs(self.state_vector)
+        indices = np.flatnonzero(magnitudes > threshold)
         
+        if top_k is not None and len(indices) > top_k:
+            largest = np.argpartition(magnitudes[indices], -top_k)[-top_k:]
+            indices = np.sort(indices[largest])
+        
+        return indices, self.state_vector[indices]
+    
     def get_amplitudes(self) -> dict:
         """
         Get all non-zero amplitudes in the state.
@@ -103,12 +190,9 @@ class QuantumState:
         Returns:
             Dictionary mapping basis states to their amplitudes
         """
-        amplitudes = {}
-        for i, amplitude in enumerate(self.state_vector):
-            if np.abs(amplitude) > 1e-10:  # Threshold for numerical noise
-                basis_state = format(i, f'0{self.num_qubits}b')
-                amplitudes[basis_state] = amplitude
-        return amplitudes
+        # Threshold for numerical noise
+        indices, amplitudes = self.sparse_amplitudes(threshold=1e-10)
+        return dict(zip(format_basis_states(indices, self.num_qubits), amplitudes))
     
     def __str__(self) -> str:
         """String representation of the quantum state."""
@@ -124,6 +208,26 @@ class QuantumState:
         return " + ".join(terms)
 
 
+def format_basis_states(indices: np.ndarray, num_qubits: int) -> List[str]:
+    """
+    Format basis-state indices as binary strings in one vectorized pass.
+    
+    Args:
+        indices: Integer array of basis-state indices
+        num_qubits: Number of bits per string
+        
+    Returns:
+        List of strings like '0101', qubit 0 first
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    if num_qubits == 0:
+        return [''] * len(indices)
+    
+    shifts = np.arange(num_qubits - 1, -1, -1, dtype=np.int64)
+    digits = ((indices[:, None] >> shifts) & 1).astype(np.uint8) + ord('0')
+    return np.ascontiguousarray(digits).view(f'S{num_qubits}').ravel().astype(str).tolist()
+
+
 def is_normalized(state: QuantumState, tolerance: float = 1e-10) -> bool:
     """
     Check if a quantum state is normalized.
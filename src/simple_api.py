@@ -1,10 +1,14 @@
 """
 Simple HTTP server without Flask dependency.
 """
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
+import struct
 import sys
 import os
+import threading
 
 # Add parent directory to path
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,7 +20,11 @@ sys.path.insert(0, src_dir)
 
 # Now import our modules
 try:
-    from circuit import QuantumCircuit, create_bell_state
+    from circuit import QuantumCircuit, create_bell_state, simulate_batch
+    from gates import PRECISIONS
+    from quantum_state import format_basis_states
+    from state_cache import StateCache, run_with_cache
+    from entanglement import entanglement_map
     import numpy as np
     print("Modules imported successfully")
 except ImportError as e:
@@ -25,283 +33,778 @@ except ImportError as e:
     sys.exit(1)
 
 
+# Upper bound on shots per request
+MAX_SHOTS = 1_000_000
+
+# Upper bounds on circuits per batch request and on the total size of
+# their state vectors (the sum of 2^n), which simulate_batch holds at once
+MAX_BATCH_CIRCUITS = 1000
+MAX_BATCH_AMPLITUDES = 2 ** 22
+
+# Dense responses list every basis state; sparse ones only the top_k largest
+# amplitudes, so they can afford wider circuits. A threshold alone does not
+# bound the response size, so circuits over MAX_QUBITS need top_k.
+MAX_QUBITS = 10
+MAX_SPARSE_QUBITS = 24
+MAX_TOP_K = 4096
+
+# Step snapshots drop amplitudes at or below this magnitude unless the
+# request sets its own threshold, and only resend amplitudes that moved
+# by more than STEP_DELTA_TOLERANCE
+DEFAULT_STEP_THRESHOLD = 1e-10
+STEP_DELTA_TOLERANCE = 1e-12
+
+# Binary responses carry 8-16 bytes per amplitude instead of ~100 of JSON
+MAX_BINARY_QUBITS = 20
+
+# The entanglement map reduces the state once per qubit pair, O(n^2 2^n)
+MAX_MAP_QUBITS = 16
+
+# Response formats selectable with the Accept header or a 'format' field
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+COLUMNAR_CONTENT_TYPE = 'application/vnd.quantum.columnar+json'
+RESPONSE_FORMATS = ('json', 'columnar', 'binary')
+
+# Binary header: magic, format version, number of qubits, bytes per amplitude
+BINARY_MAGIC = b'QSV1'
+BINARY_HEADER = struct.Struct('<4sBBB x')
+
+# Intermediate states of recently simulated circuits, so resubmitting a
+# circuit with one more gate resumes from the previous result. Each worker
+# process has its own copy; the server process aggregates their hit counts.
+state_cache = StateCache(max_bytes=int(os.environ.get('STATE_CACHE_MB', 256)) * 1024 * 1024)
+_preset_responses = {}
+
+
+def _amplitude_entries(labels, values):
+    """Build the per-basis-state real/imag/magnitude/probability objects."""
+    magnitudes = np.abs(values)
+    columns = zip(values.real.tolist(), values.imag.tolist(),
+                  magnitudes.tolist(), (magnitudes ** 2).tolist())
+    return {
+        state: {'real': real, 'imag': imag, 'magnitude': magnitude, 'probability': probability}
+        for state, (real, imag, magnitude, probability) in zip(labels, columns)
+    }
+
+
+def serialize_amplitudes(circuit, threshold=None, top_k=None):
+    """
+    Convert circuit amplitudes to the JSON response format.
+    
+    Args:
+        circuit: QuantumCircuit to export
+        threshold: Optional magnitude threshold for a sparse export
+        top_k: Optional number of largest amplitudes to keep
+        
+    Returns:
+        Dictionary mapping basis states to real/imag/magnitude/probability
+    """
+    amplitudes = circuit.get_amplitudes(threshold=threshold, top_k=top_k)
+    values = np.fromiter(amplitudes.values(), dtype=complex, count=len(amplitudes))
+    return _amplitude_entries(amplitudes.keys(), values)
+
+
+def serialize_columnar(circuit, threshold=None, top_k=None):
+    """
+    Convert circuit amplitudes to parallel real/imag arrays.
+    
+    Args:
+        circuit: QuantumCircuit to export
+        threshold: Optional magnitude threshold for a sparse export
+        top_k: Optional number of largest amplitudes to keep
+        
+    Returns:
+        Dictionary with 'real' and 'imag' lists in basis order, plus
+        'indices' of the basis states when the export is sparse
+    """
+    state = circuit.get_state()
+    
+    if threshold is None and top_k is None:
+        return {
+            'real': state.state_vector.real.tolist(),
+            'imag': state.state_vector.imag.tolist()
+        }
+    
+    indices, amplitudes = state.sparse_amplitudes(
+        threshold=0.0 if threshold is None else threshold, top_k=top_k
+    )
+    return {
+        'indices': indices.tolist(),
+        'real': amplitudes.real.tolist(),
+        'imag': amplitudes.imag.tolist()
+    }
+
+
+def encode_state_binary(state_vector, num_qubits):
+    """
+    Encode a state vector as a binary header plus its raw buffer.
+    
+    The amplitudes are little-endian complex numbers (interleaved real and
+    imaginary parts) in basis order. On little-endian hosts the returned
+    buffer is a view of the array, so nothing is copied.
+    
+    Args:
+        state_vector: Complex state vector
+        num_qubits: Number of qubits
+        
+    Returns:
+        Tuple of (header bytes, buffer with the amplitudes)
+    """
+    little_endian = state_vector.dtype.newbyteorder('<')
+    data = np.ascontiguousarray(state_vector, dtype=little_endian)
+    header = BINARY_HEADER.pack(BINARY_MAGIC, 1, num_qubits, data.dtype.itemsize)
+    return header, memoryview(data).cast('B')
+
+
+class APIError(Exception):
+    """Request error reported to the client with an HTTP status code."""
+    
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def _validate_target(op, num_qubits, label):
+    """Return the operation's target qubit, raising ValueError if it is invalid."""
+    target = op.get('target')
+    if target is None or target < 0 or target >= num_qubits:
+        raise ValueError(f'Invalid target qubit {target} for {label}. Circuit has {num_qubits} qubits.')
+    return target
+
+
+def _add_operation(circuit, op, num_qubits):
+    """Validate one API operation and record it on the circuit."""
+    gate = op.get('gate', '').lower()
+    
+    if gate in ('h', 'x', 'y', 'z'):
+        target = _validate_target(op, num_qubits, f'{gate.upper()} gate')
+        getattr(circuit, gate)(target)
+        
+    elif gate == 'cnot' or gate == 'cx':
+        control = op.get('control')
+        target = op.get('target')
+        
+        if control is None or target is None:
+            raise ValueError('CNOT gate requires both control and target qubits')
+        
+        if control < 0 or control >= num_qubits:
+            raise ValueError(f'Invalid control qubit {control} for CNOT. Circuit has {num_qubits} qubits.')
+        
+        if target < 0 or target >= num_qubits:
+            raise ValueError(f'Invalid target qubit {target} for CNOT. Circuit has {num_qubits} qubits.')
+        
+        if control == target:
+            raise ValueError(f'Control and target qubits must be different for CNOT gate')
+        
+        circuit.cnot(control, target)
+        
+    elif gate == 'measure':
+        target = _validate_target(op, num_qubits, 'measurement')
+        circuit.measure_qubit(target)
+        
+    else:
+        raise ValueError(f'Unknown gate type: {gate}')
+
+
+def build_circuit(data, response_format='json'):
+    """
+    Validate a simulation request and record its operations on a lazy circuit.
+    
+    Nothing is simulated yet, so a whole request (or batch of requests) can
+    be rejected before any work is done.
+    
+    Args:
+        data: Decoded JSON request body
+        response_format: One of RESPONSE_FORMATS
+        
+    Returns:
+        Tuple of (QuantumCircuit, options) where options holds the validated
+        shots, seed, threshold and top_k. The circuit is built in the
+        requested precision.
+        
+    Raises:
+        APIError: If the request is invalid
+    """
+    # Validar datos de entrada
+    num_qubits = data.get('num_qubits', 2)
+    operations = data.get('operations', [])
+    initial_state = data.get('initial_state', None)
+    shots = data.get('shots', None)
+    seed = data.get('seed', None)
+    threshold = data.get('threshold', None)
+    top_k = data.get('top_k', None)
+    want_map = data.get('entanglement_map', False)
+    precision = data.get('precision', 'double')
+    
+    # Validación: formato de respuesta
+    if response_format not in RESPONSE_FORMATS:
+        raise APIError(f'Format must be one of: {", ".join(RESPONSE_FORMATS)}')
+    
+    # Validación: exportación dispersa
+    if threshold is not None:
+        if not isinstance(threshold, (int, float)) or isinstance(threshold, bool) or threshold < 0:
+            raise APIError('Threshold must be a non-negative number')
+    
+    if top_k is not None:
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1:
+            raise APIError('top_k must be a positive integer')
+    
+    # Validación: precisión
+    if precision not in PRECISIONS:
+        raise APIError('Precision must be "single" or "double"')
+    
+    # Validación: número de qubits
+    if response_format == 'binary':
+        max_qubits = MAX_BINARY_QUBITS
+    elif top_k is None:
+        max_qubits = MAX_QUBITS
+    else:
+        max_qubits = MAX_SPARSE_QUBITS
+    if not isinstance(num_qubits, int) or num_qubits < 1 or num_qubits > max_qubits:
+        hint = f' (up to {MAX_SPARSE_QUBITS} with top_k)' if max_qubits == MAX_QUBITS else ''
+        raise APIError(f'Number of qubits must be between 1 and {max_qubits}{hint}')
+    
+    # Validación: respuestas dispersas de circuitos anchos
+    if response_format != 'binary' and num_qubits > MAX_QUBITS:
+        if top_k > MAX_TOP_K:
+            raise APIError(f'top_k must be at most {MAX_TOP_K} for more than {MAX_QUBITS} qubits')
+        if threshold is not None and threshold <= 0:
+            raise APIError(f'Threshold must be positive for more than {MAX_QUBITS} qubits')
+    
+    # Validación: initial_state
+    if initial_state is not None:
+        if not isinstance(initial_state, str):
+            raise APIError('Initial state must be a binary string')
+        
+        if len(initial_state) != num_qubits:
+            raise APIError(f'Initial state length ({len(initial_state)}) must match number of qubits ({num_qubits})')
+        
+        if not all(c in '01' for c in initial_state):
+            raise APIError('Initial state must only contain 0 and 1')
+    
+    # Validación: mapa de entrelazamiento
+    if not isinstance(want_map, bool):
+        raise APIError('entanglement_map must be true or false')
+    if want_map and num_qubits > MAX_MAP_QUBITS:
+        raise APIError(f'The entanglement map is available for up to {MAX_MAP_QUBITS} qubits')
+    
+    # Validación: shots
+    if shots is not None:
+        if not isinstance(shots, int) or isinstance(shots, bool) or shots < 1 or shots > MAX_SHOTS:
+            raise APIError(f'Shots must be an integer between 1 and {MAX_SHOTS}')
+        
+        if seed is not None and (not isinstance(seed, int) or seed < 0):
+            raise APIError('Seed must be a non-negative integer')
+    
+    # Crear circuito
+    try:
+        circuit = QuantumCircuit(num_qubits, initial_state=initial_state,
+                                 lazy=True, optimize=True, precision=precision)
+    except ValueError as e:
+        raise APIError(f'Error creating circuit: {str(e)}')
+    
+    # Registrar operaciones con validación
+    for idx, op in enumerate(operations):
+        gate = op.get('gate', '').lower()
+        
+        # Validar que la operación tenga gate
+        if not gate:
+            raise APIError(f'Operation {idx} missing gate type')
+        
+        try:
+            _add_operation(circuit, op, num_qubits)
+        except ValueError as e:
+            raise APIError(f'Operation {idx} ({gate}): {str(e)}')
+        except IndexError as e:
+            raise APIError(f'Operation {idx} ({gate}): Invalid qubit index. Circuit has {num_qubits} qubits.')
+        except Exception as e:
+            raise APIError(f'Operation {idx} ({gate}): Unexpected error - {str(e)}')
+    
+    options = {'shots': shots, 'seed': seed, 'threshold': threshold, 'top_k': top_k,
+               'entanglement_map': want_map}
+    return circuit, options
+
+
+def analyze_entanglement(circuit):
+    """Entanglement metrics for the response, or None when not available."""
+    if circuit.num_qubits < 2:
+        return None
+    
+    try:
+        ent_result = circuit.analyze_entanglement()
+        return {
+            'is_entangled': bool(ent_result['is_entangled']),
+            'entropy': float(ent_result['entropy']),
+            'concurrence': float(ent_result['concurrence']),
+            'classification': str(ent_result['classification']),
+            'subsystem': ent_result['subsystem']
+        }
+    except Exception as e:
+        print(f"Entanglement error: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def serialize_entanglement_map(circuit):
+    """
+    Bloch vectors, per-qubit entropies and the pairwise mutual information
+    matrix of the circuit's state, as nested lists.
+    """
+    result = entanglement_map(circuit.get_statevector())
+    return {key: values.tolist() for key, values in result.items()}
+
+
+def run_simulation(data, response_format='json'):
+    """
+    Validate and simulate one circuit request.
+    
+    This is a plain module-level function so it can run in a worker process.
+    
+    Args:
+        data: Decoded JSON request body
+        response_format: One of RESPONSE_FORMATS
+        
+    Returns:
+        Tuple of (content type, body). The body is a JSON-serializable dict,
+        or a list of byte buffers for the binary format.
+        
+    Raises:
+        APIError: If the request is invalid
+    """
+    content_type, body, _ = _simulate_request(data, response_format)
+    return content_type, body
+
+
+def _simulate_request(data, response_format):
+    """run_simulation, also returning the cache lookup as (resumed, cacheable)."""
+    circuit, options = build_circuit(data, response_format)
+    resumed, cacheable = run_with_cache(circuit, state_cache)
+    
+    # Respuesta binaria: solo el vector de estado
+    if response_format == 'binary':
+        header, buffer = encode_state_binary(circuit.get_statevector(), circuit.num_qubits)
+        return BINARY_CONTENT_TYPE, [header, buffer], (resumed, cacheable)
+    
+    response = _circuit_result(circuit, options, response_format)
+    response['cache'] = {'resumed_operations': resumed, 'cacheable_operations': cacheable}
+    content_type = COLUMNAR_CONTENT_TYPE if response_format == 'columnar' else 'application/json'
+    return content_type, response, (resumed, cacheable)
+
+
+def _circuit_result(circuit, options, response_format='json'):
+    """Build the JSON result of a simulated circuit."""
+    # Obtener amplitudes
+    threshold, top_k = options['threshold'], options['top_k']
+    if response_format == 'columnar':
+        amp_data = serialize_columnar(circuit, threshold=threshold, top_k=top_k)
+    else:
+        amp_data = serialize_amplitudes(circuit, threshold=threshold, top_k=top_k)
+    
+    # Análisis de entrelazamiento (2 qubits o más)
+    entanglement_data = analyze_entanglement(circuit)
+    
+    # Muestreo de shots
+    counts = None
+    if options['shots'] is not None:
+        counts = circuit.sample(options['shots'], seed=options['seed'])
+    
+    result = {
+        'success': True,
+        'amplitudes': amp_data,
+        'operations': circuit.get_operations(),
+        'entanglement': entanglement_data,
+        'optimization': circuit.optimization_report,
+        'counts': counts,
+        'precision': precision_report(circuit)
+    }
+    if options['entanglement_map']:
+        result['entanglement_map'] = serialize_entanglement_map(circuit)
+    return result
+
+
+def precision_report(circuit):
+    """Precision of a simulated circuit and how far its norm has drifted."""
+    return {
+        'mode': circuit.precision,
+        'normalization_error': circuit.get_state().normalization_error(),
+        'renormalizations': circuit.renormalizations
+    }
+
+
+def run_batch(data):
+    """
+    Validate and simulate many circuits in one request.
+    
+    Every circuit is validated before any is simulated, so one bad circuit
+    rejects the whole batch, as does a batch whose state vectors would hold
+    more than MAX_BATCH_AMPLITUDES amplitudes in total. Circuits of the
+    same width are then simulated together by simulate_batch().
+    
+    Args:
+        data: Decoded JSON request body with a 'circuits' list, each entry
+              shaped like a /api/simulate request
+        
+    Returns:
+        Dict with the per-circuit results under 'results', in request order
+        
+    Raises:
+        APIError: If the batch or any of its circuits is invalid
+    """
+    requests = data.get('circuits')
+    if not isinstance(requests, list) or not requests:
+        raise APIError('Circuits must be a non-empty list')
+    if len(requests) > MAX_BATCH_CIRCUITS:
+        raise APIError(f'A batch can hold at most {MAX_BATCH_CIRCUITS} circuits')
+    
+    built = []
+    for position, request in enumerate(requests):
+        if not isinstance(request, dict):
+            raise APIError(f'Circuit {position}: must be an object')
+        try:
+            built.append(build_circuit(request))
+        except APIError as e:
+            raise APIError(f'Circuit {position}: {e.message}', status=e.status)
+    
+    # Validación: memoria total del lote
+    amplitudes = sum(2 ** circuit.num_qubits for circuit, _ in built)
+    if amplitudes > MAX_BATCH_AMPLITUDES:
+        raise APIError(f'The circuits of a batch can hold at most {MAX_BATCH_AMPLITUDES} '
+                       f'amplitudes in total (2^n per circuit), got {amplitudes}')
+    
+    simulate_batch([circuit for circuit, _ in built])
+    
+    return {
+        'success': True,
+        'results': [_circuit_result(circuit, options) for circuit, options in built]
+    }
+
+
+def run_steps(data):
+    """
+    Simulate a circuit once and snapshot the state after every operation.
+    
+    Each snapshot is delta-encoded against the previous one: 'changed'
+    holds the significant amplitudes that appeared or changed value, and
+    'removed' the basis states that dropped below the threshold (or out of
+    the top_k largest, when top_k is set). The first snapshot (operation
+    None) is the full sparse initial state.
+    
+    Args:
+        data: Decoded JSON request body, as for /api/simulate, plus an
+              optional 'entanglement' flag to analyze every step
+        
+    Returns:
+        JSON-serializable response dict
+        
+    Raises:
+        APIError: If the request is invalid
+    """
+    circuit, options = build_circuit(data)
+    threshold = DEFAULT_STEP_THRESHOLD if options['threshold'] is None else options['threshold']
+    top_k = options['top_k']
+    include_entanglement = bool(data.get('entanglement', False))
+    num_qubits = circuit.num_qubits
+    
+    steps = []
+    previous = np.zeros(2 ** num_qubits, dtype=complex)
+    was_present = np.zeros(2 ** num_qubits, dtype=bool)
+    for operation, state in circuit.iter_steps():
+        current = state.state_vector
+        magnitudes = np.abs(current)
+        present = magnitudes > threshold
+        if top_k is not None:
+            # Solo las top_k amplitudes mayores cuentan como presentes
+            candidates = np.flatnonzero(present)
+            if candidates.size > top_k:
+                present[:] = False
+                present[candidates[np.argpartition(magnitudes[candidates], -top_k)[-top_k:]]] = True
+        moved = np.abs(current - previous) > STEP_DELTA_TOLERANCE
+        
+        changed = np.flatnonzero(present & (moved | ~was_present))
+        removed = np.flatnonzero(was_present & ~present)
+        
+        step = {
+            'operation': operation,
+            'changed': _amplitude_entries(format_basis_states(changed, num_qubits), current[changed]),
+            'removed': format_basis_states(removed, num_qubits)
+        }
+        if include_entanglement:
+            step['entanglement'] = analyze_entanglement(circuit)
+        steps.append(step)
+        
+        previous = current.copy()
+        was_present = present
+    
+    return {
+        'success': True,
+        'num_qubits': num_qubits,
+        'threshold': threshold,
+        'steps': steps
+    }
+
+
+def _run_simulation_in_worker(data, response_format):
+    """
+    Worker-process entry point: like run_simulation, with picklable buffers.
+    
+    Also returns the worker's cache lookup as (resumed, cacheable) so the
+    server process can count it.
+    """
+    content_type, body, lookup = _simulate_request(data, response_format)
+    if isinstance(body, list):
+        body = [bytes(buffer) for buffer in body]
+    return content_type, body, lookup
+
+
+def get_preset(preset_name):
+    """
+    Build the response for a preset circuit.
+    
+    Raises:
+        APIError: If the preset does not exist
+    """
+    if preset_name != 'bell':
+        raise APIError('Unknown preset', status=404)
+    
+    # Los presets son deterministas: se calculan una sola vez
+    if preset_name not in _preset_responses:
+        circuit = create_bell_state('00')
+        _preset_responses[preset_name] = {
+            'success': True,
+            'amplitudes': serialize_amplitudes(circuit),
+            'operations': circuit.get_operations(),
+            'entanglement': analyze_entanglement(circuit)
+        }
+    return _preset_responses[preset_name]
+
+
+class SimulationPool:
+    """
+    Bounded process pool for CPU-bound simulations.
+    
+    At most max_workers simulations run at once and at most max_queue more
+    wait for a worker. Requests beyond that are rejected with a 503 instead
+    of piling up, and callers stop waiting after timeout seconds (504).
+    A timed-out simulation keeps its slot until its worker finishes it.
+    If a worker dies, the requests it takes down fail with a 500 and the
+    executor is replaced, so later requests get a working pool.
+    """
+    
+    def __init__(self, max_workers=None, max_queue=None, timeout=None):
+        """
+        Args:
+            max_workers: Worker processes, defaults to the number of cores
+            max_queue: Simulations allowed to wait for a worker,
+                       defaults to 2 * max_workers
+            timeout: Seconds a request waits for its result, None for no limit
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = self.max_workers * 2 if max_queue is None else max_queue
+        self.timeout = timeout
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+    
+    def _replace_executor(self, broken):
+        """Swap in a fresh executor, unless another thread already replaced broken."""
+        with self._executor_lock:
+            if self._executor is broken:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                broken.shutdown(wait=False, cancel_futures=True)
+    
+    def _submit(self, func, *args):
+        """Submit to the current executor, replacing it first if it is broken."""
+        executor = self._executor
+        try:
+            return executor, executor.submit(func, *args)
+        except BrokenProcessPool:
+            # Un worker murió antes de esta petición: se crea un pool nuevo
+            self._replace_executor(executor)
+            executor = self._executor
+            return executor, executor.submit(func, *args)
+    
+    def run(self, func, *args):
+        """
+        Run func(*args) in a worker process and wait for the result.
+        
+        Raises:
+            APIError: 503 if the pool is saturated, 504 on timeout, 500 if
+                      the worker running the simulation died
+        """
+        if not self._slots.acquire(blocking=False):
+            raise APIError('Server is busy, please retry later', status=503)
+        
+        try:
+            executor, future = self._submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise APIError(f'Simulation timed out after {self.timeout} seconds', status=504)
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            raise APIError('Simulation worker crashed, please retry', status=500)
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
 class QuantumAPIHandler(BaseHTTPRequestHandler):
     
-    def _set_headers(self, status=200):
+    def _set_headers(self, status=200, content_type='application/json', content_length=None):
         self.send_response(status)
-        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-type', content_type)
+        if content_length is not None:
+            self.send_header('Content-Length', str(content_length))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Accept')
         self.end_headers()
     
+    def _send_json(self, payload, status=200, content_type='application/json'):
+        body = json.dumps(payload).encode()
+        self._set_headers(status, content_type=content_type, content_length=len(body))
+        self.wfile.write(body)
+    
+    def _send_error(self, error):
+        self._send_json({'success': False, 'error': error.message}, status=error.status)
+    
+    def _response_format(self, data):
+        """Pick the response format from the request body or the Accept header."""
+        requested = data.get('format')
+        if requested is not None:
+            return requested
+        
+        accept = self.headers.get('Accept', '')
+        if BINARY_CONTENT_TYPE in accept:
+            return 'binary'
+        if COLUMNAR_CONTENT_TYPE in accept:
+            return 'columnar'
+        return 'json'
+    
+    def _read_json(self):
+        content_length = int(self.headers['Content-Length'])
+        post_data = self.rfile.read(content_length)
+        return json.loads(post_data.decode())
+    
+    def _run(self, func, *args):
+        """Run a simulation function in the server's process pool, or inline without one."""
+        pool = getattr(self.server, 'simulation_pool', None)
+        if pool is None:
+            return func(*args)
+        return pool.run(func, *args)
+    
     def do_OPTIONS(self):
         self._set_headers()
     
     def do_GET(self):
         if self.path == '/api/health':
-            self._set_headers()
-            response = {'status': 'ok', 'message': 'Quantum Circuit API is running'}
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json({'status': 'ok', 'message': 'Quantum Circuit API is running'})
+        
+        elif self.path == '/api/cache/stats':
+            self._send_json(state_cache.stats())
         
         elif self.path.startswith('/api/presets/'):
             preset_name = self.path.split('/')[-1]
             try:
-                if preset_name == 'bell':
-                    circuit = create_bell_state('00')
-                    amplitudes = circuit.get_amplitudes()
-                    
-                    amp_data = {}
-                    for state, amp in amplitudes.items():
-                        amp_data[state] = {
-                            'real': float(np.real(amp)),
-                            'imag': float(np.imag(amp)),
-                            'magnitude': float(np.abs(amp)),
-                            'probability': float(np.abs(amp) ** 2)
-                        }
-                    
-                    entanglement_data = circuit.analyze_entanglement()
-                    entanglement_data = {
-                        'is_entangled': bool(entanglement_data['is_entangled']),
-                        'entropy': float(entanglement_data['entropy']),
-                        'concurrence': float(entanglement_data['concurrence']),
-                        'classification': str(entanglement_data['classification'])
-                    }
-                    
-                    self._set_headers()
-                    response = {
-                        'success': True,
-                        'amplitudes': amp_data,
-                        'operations': circuit.get_operations(),
-                        'entanglement': entanglement_data
-                    }
-                    self.wfile.write(json.dumps(response).encode())
-                else:
-                    self._set_headers(404)
-                    self.wfile.write(json.dumps({'success': False, 'error': 'Unknown preset'}).encode())
+                self._send_json(get_preset(preset_name))
+            except APIError as e:
+                self._send_error(e)
             except Exception as e:
                 print(f"Error in preset: {e}")
                 import traceback
                 traceback.print_exc()
-                self._set_headers(400)
-                self.wfile.write(json.dumps({'success': False, 'error': str(e)}).encode())
+                self._send_json({'success': False, 'error': str(e)}, status=400)
         else:
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Not found'}).encode())
+            self._send_json({'error': 'Not found'}, status=404)
     
     def do_POST(self):
-        if self.path == '/api/simulate':
+        if self.path in ('/api/simulate', '/api/simulate/steps', '/api/simulate/batch'):
             try:
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                data = json.loads(post_data.decode())
-                
+                data = self._read_json()
                 print(f"Received simulation request: {data}")
                 
-                # Validar datos de entrada
-                num_qubits = data.get('num_qubits', 2)
-                operations = data.get('operations', [])
-                initial_state = data.get('initial_state', None)
-                
-                # Validación: número de qubits
-                if not isinstance(num_qubits, int) or num_qubits < 1 or num_qubits > 10:
-                    self._set_headers(400)
-                    self.wfile.write(json.dumps({
-                        'success': False,
-                        'error': 'Number of qubits must be between 1 and 10'
-                    }).encode())
+                if self.path == '/api/simulate/steps':
+                    self._send_json(self._run(run_steps, data))
+                    print("Step simulation completed successfully")
                     return
                 
-                # Validación: initial_state
-                if initial_state is not None:
-                    if not isinstance(initial_state, str):
-                        self._set_headers(400)
-                        self.wfile.write(json.dumps({
-                            'success': False,
-                            'error': 'Initial state must be a binary string'
-                        }).encode())
-                        return
-                    
-                    if len(initial_state) != num_qubits:
-                        self._set_headers(400)
-                        self.wfile.write(json.dumps({
-                            'success': False,
-                            'error': f'Initial state length ({len(initial_state)}) must match number of qubits ({num_qubits})'
-                        }).encode())
-                        return
-                    
-                    if not all(c in '01' for c in initial_state):
-                        self._set_headers(400)
-                        self.wfile.write(json.dumps({
-                            'success': False,
-                            'error': 'Initial state must only contain 0 and 1'
-                        }).encode())
-                        return
-                
-                # Crear circuito
-                try:
-                    circuit = QuantumCircuit(num_qubits, initial_state=initial_state)
-                except ValueError as e:
-                    self._set_headers(400)
-                    self.wfile.write(json.dumps({
-                        'success': False,
-                        'error': f'Error creating circuit: {str(e)}'
-                    }).encode())
+                if self.path == '/api/simulate/batch':
+                    self._send_json(self._run(run_batch, data))
+                    print("Batch simulation completed successfully")
                     return
                 
-                # Aplicar operaciones con validación
-                for idx, op in enumerate(operations):
-                    gate = op.get('gate', '').lower()
-                    
-                    # Validar que la operación tenga gate
-                    if not gate:
-                        self._set_headers(400)
-                        self.wfile.write(json.dumps({
-                            'success': False,
-                            'error': f'Operation {idx} missing gate type'
-                        }).encode())
-                        return
-                    
-                    try:
-                        if gate == 'h':
-                            target = op.get('target')
-                            if target is None or target < 0 or target >= num_qubits:
-                                raise ValueError(f'Invalid target qubit {target} for H gate. Circuit has {num_qubits} qubits.')
-                            circuit.h(target)
-                            
-                        elif gate == 'x':
-                            target = op.get('target')
-                            if target is None or target < 0 or target >= num_qubits:
-                                raise ValueError(f'Invalid target qubit {target} for X gate. Circuit has {num_qubits} qubits.')
-                            circuit.x(target)
-                            
-                        elif gate == 'y':
-                            target = op.get('target')
-                            if target is None or target < 0 or target >= num_qubits:
-                                raise ValueError(f'Invalid target qubit {target} for Y gate. Circuit has {num_qubits} qubits.')
-                            circuit.y(target)
-                            
-                        elif gate == 'z':
-                            target = op.get('target')
-                            if target is None or target < 0 or target >= num_qubits:
-                                raise ValueError(f'Invalid target qubit {target} for Z gate. Circuit has {num_qubits} qubits.')
-                            circuit.z(target)
-                            
-                        elif gate == 'cnot' or gate == 'cx':
-                            control = op.get('control')
-                            target = op.get('target')
-                            
-                            if control is None or target is None:
-                                raise ValueError('CNOT gate requires both control and target qubits')
-                            
-                            if control < 0 or control >= num_qubits:
-                                raise ValueError(f'Invalid control qubit {control} for CNOT. Circuit has {num_qubits} qubits.')
-                            
-                            if target < 0 or target >= num_qubits:
-                                raise ValueError(f'Invalid target qubit {target} for CNOT. Circuit has {num_qubits} qubits.')
-                            
-                            if control == target:
-                                raise ValueError(f'Control and target qubits must be different for CNOT gate')
-                            
-                            circuit.cnot(control, target)
-                            
-                        elif gate == 'measure':
-                            target = op.get('target')
-                            if target is None or target < 0 or target >= num_qubits:
-                                raise ValueError(f'Invalid target qubit {target} for measurement. Circuit has {num_qubits} qubits.')
-                            outcome = circuit.measure_qubit(target)
-                            print(f"Measured qubit {target}: outcome = {outcome}")
-                            
-                        else:
-                            raise ValueError(f'Unknown gate type: {gate}')
-                            
-                    except ValueError as e:
-                        self._set_headers(400)
-                        self.wfile.write(json.dumps({
-                            'success': False,
-                            'error': f'Operation {idx} ({gate}): {str(e)}'
-                        }).encode())
-                        return
-                    except IndexError as e:
-                        self._set_headers(400)
-                        self.wfile.write(json.dumps({
-                            'success': False,
-                            'error': f'Operation {idx} ({gate}): Invalid qubit index. Circuit has {num_qubits} qubits.'
-                        }).encode())
-                        return
-                    except Exception as e:
-                        self._set_headers(400)
-                        self.wfile.write(json.dumps({
-                            'success': False,
-                            'error': f'Operation {idx} ({gate}): Unexpected error - {str(e)}'
-                        }).encode())
-                        return
-                
-                # Obtener amplitudes
-                amplitudes = circuit.get_amplitudes()
-                
-                amp_data = {}
-                for state, amp in amplitudes.items():
-                    amp_data[state] = {
-                        'real': float(np.real(amp)),
-                        'imag': float(np.imag(amp)),
-                        'magnitude': float(np.abs(amp)),
-                        'probability': float(np.abs(amp) ** 2)
-                    }
-                
-                # Análisis de entrelazamiento (solo para 2 qubits)
-                entanglement_data = None
-                if num_qubits == 2:
-                    try:
-                        ent_result = circuit.analyze_entanglement()
-                        entanglement_data = {
-                            'is_entangled': bool(ent_result['is_entangled']),
-                            'entropy': float(ent_result['entropy']),
-                            'concurrence': float(ent_result['concurrence']),
-                            'classification': str(ent_result['classification'])
-                        }
-                    except Exception as e:
-                        print(f"Entanglement error: {e}")
-                        import traceback
-                        traceback.print_exc()
+                pool = getattr(self.server, 'simulation_pool', None)
+                if pool is None:
+                    content_type, body = run_simulation(data, self._response_format(data))
+                else:
+                    content_type, body, lookup = pool.run(
+                        _run_simulation_in_worker, data, self._response_format(data))
+                    state_cache.record_lookup(*lookup)
                 
-                self._set_headers()
-                response = {
-                    'success': True,
-                    'amplitudes': amp_data,
-                    'operations': circuit.get_operations(),
-                    'entanglement': entanglement_data
-                }
-                self.wfile.write(json.dumps(response).encode())
+                if content_type == BINARY_CONTENT_TYPE:
+                    self._set_headers(content_type=content_type,
+                                      content_length=sum(len(buffer) for buffer in body))
+                    for buffer in body:
+                        self.wfile.write(buffer)
+                else:
+                    self._send_json(body, content_type=content_type)
                 print("Simulation completed successfully")
                 
+            except APIError as e:
+                self._send_error(e)
             except json.JSONDecodeError as e:
                 print(f"JSON decode error: {e}")
-                self._set_headers(400)
-                self.wfile.write(json.dumps({
+                self._send_json({
                     'success': False,
                     'error': 'Invalid JSON in request body'
-                }).encode())
+                }, status=400)
             except Exception as e:
                 print(f"Error in simulate: {e}")
                 import traceback
                 traceback.print_exc()
-                self._set_headers(500)
-                self.wfile.write(json.dumps({
+                self._send_json({
                     'success': False,
                     'error': f'Internal server error: {str(e)}'
-                }).encode())
+                }, status=500)
         else:
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Not found'}).encode())
+            self._send_json({'error': 'Not found'}, status=404)
     
     def log_message(self, format, *args):
         print(f"[{self.log_date_time_string()}] {format % args}")
 
 
-def run_server(port=5000):
+def run_server(port=5000, workers=None, max_queue=None, timeout=None):
+    """
+    Start the API server.
+    
+    Args:
+        port: Port to listen on
+        workers: Simulation worker processes. None uses one per core;
+                 0 serves one request at a time and simulates inline.
+        max_queue: Simulations allowed to wait for a worker before new
+                   requests get a 503
+        timeout: Seconds before a waiting request gets a 504
+    """
     server_address = ('', port)
-    httpd = HTTPServer(server_address, QuantumAPIHandler)
+    
+    if workers == 0:
+        httpd = HTTPServer(server_address, QuantumAPIHandler)
+        httpd.simulation_pool = None
+    else:
+        # Threads parse requests; simulations run in the process pool
+        httpd = ThreadingHTTPServer(server_address, QuantumAPIHandler)
+        httpd.simulation_pool = SimulationPool(workers, max_queue, timeout)
+        print(f'Simulation pool: {httpd.simulation_pool.max_workers} workers, '
+              f'queue limit {httpd.simulation_pool.max_queue}')
+    
     print(f'Quantum Circuit API Server running on http://127.0.0.1:{port}')
     print(f'Health check: http://127.0.0.1:{port}/api/health')
     print(f'Press Ctrl+C to stop the server\n')
@@ -312,9 +815,17 @@ def run_server(port=5000):
         pass
     finally:
         httpd.server_close()
+        if httpd.simulation_pool is not None:
+            httpd.simulation_pool.shutdown()
         print('\nServer stopped')
 
 
+def _env_number(name, cast):
+    """Read an optional numeric setting from the environment."""
+    value = os.environ.get(name)
+    return cast(value) if value else None
+
+
 if __name__ == '__main__':
     print("Starting Quantum Circuit API Server...")
     print(f"Current directory: {os.getcwd()}")
@@ -324,8 +835,13 @@ if __name__ == '__main__':
         # Railway provides PORT environment variable
         port = int(os.environ.get('PORT', 5000))
         print(f"Using port: {port}")
-        run_server(port=port)
+        run_server(
+            port=port,
+            workers=_env_number('SIMULATION_WORKERS', int),
+            max_queue=_env_number('SIMULATION_QUEUE', int),
+            timeout=_env_number('SIMULATION_TIMEOUT', float)
+        )
     except Exception as e:
         print(f"Server error: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
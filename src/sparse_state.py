@@ -0,0 +1,263 @@
+"""
+Sparse state-vector representation for states with a small support.
+"""
+import numpy as np
+from typing import List, Tuple, Union
+from src.gates import QuantumGate, classify_matrix, PERMUTATION, DIAGONAL
+from src.quantum_state import QuantumState
+
+
+# Amplitudes at or below this magnitude are treated as exact zeros
+_DROP_TOL = 1e-12
+
+# Basis indices are int64, with the sign bit left free
+MAX_SPARSE_QUBITS = 62
+
+
+class SparseState:
+    """
+    Represents a state by its non-zero amplitudes only.
+    
+    The state is a sorted int64 array of basis indices plus the matching
+    amplitude array, so memory and gate cost scale with the support size
+    instead of 2^n. A gate groups the support by the bits it does not touch
+    and updates each group as a small block: permutation gates (X, CNOT,
+    SWAP) only relabel indices, diagonal gates only rescale amplitudes, and
+    dense gates (H, rotations) multiply a (groups, 2^k) block by the
+    matrix, which can grow the support.
+    
+    Once the support covers more than density_threshold of the 2^n basis
+    states, the index array costs more than a dense vector would, so the
+    state converts itself to a QuantumState and delegates to it from then
+    on.
+    
+    Offers the same interface as QuantumState (apply_gate, measure,
+    sample, sparse_amplitudes).
+    
+    Attributes:
+        num_qubits: Number of qubits in the state
+        indices: Sorted basis indices of the non-zero amplitudes (sparse mode)
+        amplitudes: Amplitudes at those indices (sparse mode)
+        dense: The QuantumState in use after conversion, otherwise None
+    """
+    
+    def __init__(self, num_qubits: int, initial_state: str = None,
+                 density_threshold: float = 0.1):
+        """
+        Initialize a computational basis state.
+        
+        Args:
+            num_qubits: Number of qubits (at most MAX_SPARSE_QUBITS)
+            initial_state: Binary string like '01'. If None, |00...0⟩
+            density_threshold: Fraction of occupied basis states above
+                               which the state becomes dense
+        """
+        if num_qubits > MAX_SPARSE_QUBITS:
+            raise ValueError(f"The sparse backend supports at most {MAX_SPARSE_QUBITS} qubits")
+        
+        self.num_qubits = num_qubits
+        self.dim = 2 ** num_qubits
+        self.density_threshold = density_threshold
+        self.dense = None
+        
+        index = 0 if initial_state is None else int(initial_state, 2)
+        self.indices = np.array([index], dtype=np.int64)
+        self.amplitudes = np.ones(1, dtype=complex)
+    
+    @property
+    def is_dense(self) -> bool:
+        return self.dense is not None
+    
+    @property
+    def state_vector(self) -> np.ndarray:
+        """The dense 2^n state vector (built on demand in sparse mode)."""
+        if self.is_dense:
+            return self.dense.state_vector
+        vector = np.zeros(self.dim, dtype=complex)
+        vector[self.indices] = self.amplitudes
+        return vector
+    
+    def _check_qubits(self, qubits: List[int]):
+        for qubit in qubits:
+            if not 0 <= qubit < self.num_qubits:
+                raise IndexError(f"Qubit {qubit} out of range for {self.num_qubits} qubits")
+    
+    def _bit_shifts(self, qubits: List[int]) -> np.ndarray:
+        # Qubit 0 is the most significant bit of the basis index
+        return np.array([self.num_qubits - 1 - q for q in qubits], dtype=np.int64)
+    
+    def _densify_if_needed(self):
+        if self.indices.size > self.density_threshold * self.dim:
+            dense = QuantumState(self.num_qubits)
+            dense.state_vector = self.state_vector
+            self.dense = dense
+            self.indices = self.amplitudes = None
+    
+    def _set_support(self, indices: np.ndarray, amplitudes: np.ndarray):
+        """Store a new support, dropping zeros and restoring index order."""
+        keep = np.abs(amplitudes) > _DROP_TOL
+        indices, amplitudes = indices[keep], amplitudes[keep]
+        order = np.argsort(indices, kind='stable')
+        self.indices, self.amplitudes = indices[order], amplitudes[order]
+        self._densify_if_needed()
+    
+    def apply_gate(self, gate: Union[QuantumGate, np.ndarray], qubits: List[int]):
+        """
+        Apply a gate to the given qubits, touching only the support.
+        
+        Args:
+            gate: Gate (or unitary matrix) to apply
+            qubits: Target qubit indices, in the gate's own qubit order
+        """
+        self._check_qubits(qubits)
+        if self.is_dense:
+            self.dense.apply_gate(gate, qubits)
+            return
+        
+        if isinstance(gate, QuantumGate):
+            matrix, kind = gate.matrix, gate.kind
+        else:
+            matrix = np.asarray(gate)
+            kind = classify_matrix(matrix)
+        
+        num_targets = len(qubits)
+        shifts = self._bit_shifts(qubits)
+        # offsets[l] sets the target bits to the gate-local index l
+        local_bits = (np.arange(2 ** num_targets)[:, None]
+                      >> np.arange(num_targets - 1, -1, -1)) & 1
+        offsets = (local_bits << shifts).sum(axis=1)
+        
+        bits = (self.indices[:, None] >> shifts) & 1
+        local = (bits << np.arange(num_targets - 1, -1, -1)).sum(axis=1)
+        rest = self.indices & ~offsets[-1]
+        
+        if kind == DIAGONAL:
+            self.amplitudes = self.amplitudes * np.diagonal(matrix)[local]
+            return
+        
+        if kind == PERMUTATION:
+            destination = np.argmax(np.abs(matrix) > _DROP_TOL, axis=0)
+            phases = matrix[destination, np.arange(matrix.shape[1])]
+            self._set_support(rest | offsets[destination[local]],
+                              self.amplitudes * phases[local])
+            return
+        
+        groups, group_of = np.unique(rest, return_inverse=True)
+        block = np.zeros((groups.size, 2 ** num_targets), dtype=complex)
+        block[group_of, local] = self.amplitudes
+        block = block @ matrix.T
+        self._set_support((groups[:, None] | offsets[None, :]).ravel(), block.ravel())
+    
+    def measure(self, qubit_index: int = None,
+                rng: np.random.Generator = None) -> Tuple[str, float]:
+        """
+        Simulate measurement of the state.
+        
+        Args:
+            qubit_index: If None, measures all qubits (without collapsing).
+                         Otherwise measures that qubit and collapses the state.
+            rng: Random generator to use. Defaults to NumPy's global one.
+        
+        Returns:
+            Tuple of (outcome, probability)
+        """
+        if self.is_dense:
+            return self.dense.measure(qubit_index, rng)
+        if rng is None:
+            rng = np.random
+        
+        probabilities = np.abs(self.amplitudes) ** 2
+        if qubit_index is None:
+            position = rng.choice(self.indices.size, p=probabilities / probabilities.sum())
+            outcome = format(int(self.indices[position]), f'0{self.num_qubits}b')
+            return outcome, probabilities[position]
+        
+        self._check_qubits([qubit_index])
+        bits = (self.indices >> self._bit_shifts([qubit_index])[0]) & 1
+        prob_1 = float(probabilities[bits == 1].sum())
+        prob_0 = float(probabilities[bits == 0].sum())
+        
+        outcome_bit = 1 if rng.random() * (prob_0 + prob_1) < prob_1 else 0
+        outcome_prob = prob_1 if outcome_bit == 1 else prob_0
+        
+        # Collapsing only ever shrinks the support
+        keep = bits == outcome_bit
+        self.indices = self.indices[keep]
+        self.amplitudes = self.amplitudes[keep] / np.sqrt(outcome_prob)
+        return str(outcome_bit), outcome_prob
+    
+    def sample(self, shots: int, rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Draw many full-register measurement outcomes without collapsing the state.
+        
+        Args:
+            shots: Number of outcomes to draw
+            rng: Random generator to use. Defaults to a fresh generator.
+        
+        Returns:
+            Integer array of basis-state indices, one per shot
+        """
+        if self.is_dense:
+            return self.dense.sample(shots, rng)
+        if shots < 0:
+            raise ValueError("Number of shots must be non-negative")
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        cumulative = np.cumsum(np.abs(self.amplitudes) ** 2)
+        draws = rng.random(shots) * cumulative[-1]
+        positions = np.searchsorted(cumulative, draws, side='right')
+        return self.indices[np.minimum(positions, self.indices.size - 1)]
+    
+    def amplitude(self, bitstring: str) -> complex:
+        """
+        Amplitude of one basis state, found by binary search of the support.
+        
+        Args:
+            bitstring: Basis state like '0101', qubit 0 first
+        
+        Returns:
+            Complex amplitude
+        """
+        if len(bitstring) != self.num_qubits:
+            raise ValueError(f"Bitstring length must match num_qubits ({self.num_qubits})")
+        index = int(bitstring, 2)
+        if self.is_dense:
+            return complex(self.dense.state_vector[index])
+        
+        position = np.searchsorted(self.indices, index)
+        if position < self.indices.size and self.indices[position] == index:
+            return complex(self.amplitudes[position])
+        return 0j
+    
+    def sparse_amplitudes(self, threshold: float = 1e-10,
+                          top_k: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the significant amplitudes as parallel index and value arrays.
+        
+        Args:
+            threshold: Amplitudes with magnitude at or below this are dropped
+            top_k: If given, keep only the k largest-magnitude amplitudes
+        
+        Returns:
+            Tuple of (basis-state indices in ascending order, amplitudes)
+        """
+        if self.is_dense:
+            return self.dense.sparse_amplitudes(threshold, top_k)
+        
+        magnitudes = np.abs(self.amplitudes)
+        positions = np.flatnonzero(magnitudes > threshold)
+        if top_k is not None and len(positions) > top_k:
+            largest = np.argpartition(magnitudes[positions], -top_k)[-top_k:]
+            positions = np.sort(positions[largest])
+        return self.indices[positions], self.amplitudes[positions]
+    
+    def __str__(self) -> str:
+        """Non-zero amplitudes of the state."""
+        indices, amplitudes = self.sparse_amplitudes()
+        terms = [
+            f"{amp.real:.3f}|{index:0{self.num_qubits}b}⟩" if np.isreal(amp)
+            else f"{amp.real:.3f}{amp.imag:+.3f}i|{index:0{self.num_qubits}b}⟩"
+            for index, amp in zip(indices.tolist(), amplitudes)
+        ]
+        return " + ".join(terms)
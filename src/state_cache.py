@@ -0,0 +1,193 @@
+"""
+Cache of intermediate state vectors keyed by circuit prefix.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from typing import List, Optional, Tuple
+from src.quantum_state import QuantumState
+
+
+class StateCache:
+    """
+    Memory-bounded LRU cache of state vectors reached by circuit prefixes.
+    
+    Keys are a hash chain over (num_qubits, initial_state) and then each
+    operation in order, so the keys of every prefix of a program are
+    computed in one pass and a new program can resume from the longest
+    prefix simulated before.
+    
+    Attributes:
+        max_bytes: Upper bound on the memory held by cached vectors
+        hits: Lookups that found the whole cacheable program
+        partial_hits: Lookups that found a proper, non-empty prefix
+        misses: Lookups that found nothing
+    """
+    
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resumed_operations = 0
+        self.total_operations = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def prefix_keys(num_qubits: int, initial_state: Optional[str],
+                    operations: List[dict], precision: str = 'double') -> List[str]:
+        """
+        Compute the cache key of every prefix of a program.
+        
+        Args:
+            num_qubits: Number of qubits
+            initial_state: Initial basis state, None meaning all |0⟩
+            operations: Recorded operations (gate name and qubits are used)
+            precision: Precision of the states, so single- and
+                       double-precision results are never mixed
+        
+        Returns:
+            List of len(operations) + 1 keys; entry i identifies the state
+            after the first i operations
+        """
+        if initial_state is None:
+            initial_state = '0' * num_qubits
+        
+        key = hashlib.blake2b(f'{num_qubits}|{initial_state}|{precision}'.encode(), digest_size=16)
+        keys = [key.hexdigest()]
+        for operation in operations:
+            key = key.copy()
+            key.update(json.dumps([operation['gate'], operation['qubits'],
+                                   operation.get('params', [])]).encode())
+            keys.append(key.hexdigest())
+        return keys
+    
+    def lookup(self, keys: List[str]) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        Find the longest cached prefix.
+        
+        Args:
+            keys: Prefix keys from prefix_keys()
+        
+        Returns:
+            Tuple of (prefix length, copy of its state vector), or (0, None)
+            when no prefix with at least one operation is cached
+        """
+        with self._lock:
+            for length in range(len(keys) - 1, 0, -1):
+                state_vector = self._entries.get(keys[length])
+                if state_vector is not None:
+                    self._entries.move_to_end(keys[length])
+                    self._record(length, len(keys) - 1)
+                    return length, state_vector.copy()
+            
+            self._record(0, len(keys) - 1)
+            return 0, None
+    
+    def record_lookup(self, resumed: int, total: int):
+        """Count a lookup made elsewhere, e.g. by a worker process with its own cache."""
+        with self._lock:
+            self._record(resumed, total)
+    
+    def _record(self, resumed: int, total: int):
+        if resumed == 0:
+            self.misses += 1
+        elif resumed == total:
+            self.hits += 1
+        else:
+            self.partial_hits += 1
+        self.resumed_operations += resumed
+        self.total_operations += total
+    
+    def store(self, key: str, state_vector: np.ndarray):
+        """Cache a copy of a state vector, evicting least recently used entries."""
+        if state_vector.nbytes > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            
+            self._entries[key] = state_vector.copy()
+            self._bytes += state_vector.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+    
+    def stats(self) -> dict:
+        """Get hit-rate metrics and memory usage."""
+        with self._lock:
+            lookups = self.hits + self.partial_hits + self.misses
+            return {
+                'lookups': lookups,
+                'hits': self.hits,
+                'partial_hits': self.partial_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.partial_hits) / lookups if lookups else 0.0,
+                'operations_skipped': self.resumed_operations / self.total_operations if self.total_operations else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def run_with_cache(circuit, cache: StateCache, checkpoint_interval: int = 8) -> Tuple[int, int]:
+    """
+    Bring a lazy circuit's state up to date, reusing and filling the cache.
+    
+    The program is resumed from the longest cached prefix. Everything up to
+    the first measurement is deterministic, so its state is checkpointed
+    into the cache every checkpoint_interval operations and at its end.
+    Operations from the first measurement on are simulated but not cached.
+    
+    Checkpointing fuses one segment at a time and a cache hit fuses
+    nothing, so for optimizing circuits the optimization_report is set
+    from one fusion pass over the whole program instead.
+    
+    Args:
+        circuit: QuantumCircuit with recorded operations
+        cache: Cache to read from and store into
+        checkpoint_interval: Operations between stored intermediate states
+    
+    Returns:
+        Tuple of (operations resumed from the cache, cacheable operations)
+    """
+    operations = circuit.operations
+    cacheable = next(
+        (i for i, op in enumerate(operations) if op['type'] == 'measurement'),
+        len(operations)
+    )
+    keys = cache.prefix_keys(circuit.num_qubits, circuit.initial_state, operations[:cacheable],
+                             circuit.precision)
+    
+    resumed, state_vector = cache.lookup(keys)
+    if state_vector is None:
+        state_vector = QuantumState(circuit.num_qubits, circuit.initial_state,
+                                    precision=circuit.precision).state_vector
+    circuit.resume(state_vector, resumed)
+    
+    checkpoints = list(range(resumed + checkpoint_interval, cacheable, checkpoint_interval))
+    if cacheable > resumed:
+        checkpoints.append(cacheable)
+    for stop in checkpoints:
+        circuit.advance(stop)
+        cache.store(keys[stop], circuit.state.state_vector)
+    
+    circuit.get_state()
+    if circuit.optimize:
+        _, circuit.optimization_report = circuit.compile()
+    return resumed, cacheable
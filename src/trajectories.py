@@ -0,0 +1,209 @@
+"""
+Monte Carlo quantum-trajectory simulation of noisy circuits.
+"""
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from typing import List, Sequence
+from src.gates import get_gate, _apply_to_tensor
+from src.noise import KrausChannel, NoiseModel
+from src.quantum_state import QuantumState
+
+
+def _check_observable(observable: str, num_qubits: int):
+    if len(observable) != num_qubits or any(c not in 'IXYZ' for c in observable.upper()):
+        raise ValueError(f"Observable {observable!r} must be a Pauli string of length {num_qubits}")
+
+
+def pauli_expectation(state_vector: np.ndarray, observable: str) -> float:
+    """
+    Expectation value ⟨ψ|P|ψ⟩ of a Pauli string.
+    
+    Args:
+        state_vector: Pure state of n qubits
+        observable: String of n characters from 'IXYZ', qubit 0 first
+    
+    Returns:
+        Real expectation value in [-1, 1]
+    """
+    num_qubits = state_vector.size.bit_length() - 1
+    _check_observable(observable, num_qubits)
+    
+    transformed = state_vector.astype(complex)
+    tensor = transformed.reshape((2,) * num_qubits)
+    for qubit, pauli in enumerate(observable.upper()):
+        if pauli != 'I':
+            _apply_to_tensor(tensor, get_gate(pauli), [qubit])
+    return float(np.vdot(state_vector, transformed).real)
+
+
+def _apply_channel_branch(state: QuantumState, channel: KrausChannel, qubit: int,
+                          rng: np.random.Generator):
+    """
+    Apply one randomly chosen Kraus operator, with the Born-rule probability.
+    
+    The branch probabilities ||K_k ψ||² = Tr(K_k† K_k ρ_q) only need the
+    2x2 reduced state of the qubit, so a single pass over the state
+    prices every branch before the chosen one is applied in place.
+    """
+    psi = state.state_vector.reshape(2 ** qubit, 2, -1)
+    reduced = np.einsum('iaj,ibj->ab', psi, psi.conj())
+    
+    probabilities = np.array([
+        np.sum((operator.conj().T @ operator) * reduced.T).real
+        for operator in channel.operators
+    ])
+    probabilities = np.clip(probabilities, 0, None)
+    cumulative = np.cumsum(probabilities)
+    branch = min(int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side='right')),
+                 len(probabilities) - 1)
+    
+    _apply_to_tensor(state.state_vector.reshape((2,) * state.num_qubits),
+                     channel.kraus_gates[branch], [qubit])
+    state.state_vector /= np.sqrt(probabilities[branch])
+
+
+def _run_trajectories(num_qubits: int, initial_state: str, operations: List[dict],
+                      noise_model: NoiseModel, seeds: List[np.random.SeedSequence],
+                      shots_per_trajectory: int, observables: List[str]) -> dict:
+    """
+    Worker entry point: simulate one trajectory per seed and sum the results.
+    
+    Returns:
+        Dict with the number of trajectories, outcome counts by basis
+        index, and per-observable sums and sums of squares
+    """
+    counts = Counter()
+    sums = np.zeros(len(observables))
+    squares = np.zeros(len(observables))
+    
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        state = QuantumState(num_qubits, initial_state)
+        
+        for operation in operations:
+            if operation['type'] == 'measurement':
+                state.measure(qubit_index=operation['qubits'][0], rng=rng)
+                continue
+            
+            gate = get_gate(operation['gate'], *operation.get('params', ()))
+            state.apply_gate(gate, operation['qubits'])
+            for channel, qubit in noise_model.channels_for(operation):
+                _apply_channel_branch(state, channel, qubit, rng)
+        
+        counts.update(state.sample(shots_per_trajectory, rng).tolist())
+        values = np.array([pauli_expectation(state.state_vector, obs) for obs in observables])
+        sums += values
+        squares += values ** 2
+    
+    return {'trajectories': len(seeds), 'counts': counts, 'sums': sums, 'squares': squares}
+
+
+def run_trajectories(circuit, noise_model: NoiseModel, trajectories: int = 1000,
+                     shots_per_trajectory: int = 1, observables: Sequence[str] = (),
+                     target_precision: float = None, min_trajectories: int = 100,
+                     chunk_size: int = 32, workers: int = None, seed: int = None) -> dict:
+    """
+    Estimate a noisy circuit's outcomes by averaging pure-state trajectories.
+    
+    Each trajectory evolves a state vector and, after every gate, picks one
+    Kraus operator of each channel at random with its Born probability, so
+    memory stays at O(2^n) instead of the O(4^n) of a density matrix.
+    
+    Trajectories run in chunks on a process pool. Every trajectory gets
+    its own stream from np.random.SeedSequence(seed).spawn(), and chunks
+    are folded into the totals in submission order, so results depend on
+    the seed only, not on the number of workers. With target_precision
+    set, no more chunks are started once every observable's standard error
+    is at or below it (after min_trajectories).
+    
+    Args:
+        circuit: QuantumCircuit whose recorded operations are simulated
+        noise_model: Channels to apply after gates
+        trajectories: Maximum number of trajectories
+        shots_per_trajectory: Outcomes sampled from each final state
+        observables: Pauli strings (e.g. 'ZZI') to estimate
+        target_precision: Standard error at which to stop early
+        min_trajectories: Trajectories to run before stopping early
+        chunk_size: Trajectories per worker task
+        workers: Worker processes; 0 runs in this process. Defaults to
+                 the number of cores.
+        seed: Seed for reproducible results
+    
+    Returns:
+        Dict with 'trajectories' (number run), 'counts' (bitstring ->
+        count over all shots), 'expectations' and 'standard_errors'
+        (observable -> value) and 'converged' (target precision reached)
+    """
+    observables = [obs.upper() for obs in observables]
+    for observable in observables:
+        _check_observable(observable, circuit.num_qubits)
+    if trajectories < 1 or chunk_size < 1:
+        raise ValueError("trajectories and chunk_size must be positive")
+    if shots_per_trajectory < 0:
+        raise ValueError("Number of shots must be non-negative")
+    
+    seeds = np.random.SeedSequence(seed).spawn(trajectories)
+    chunks = [seeds[start:start + chunk_size] for start in range(0, trajectories, chunk_size)]
+    args = (circuit.num_qubits, circuit.initial_state, list(circuit.operations),
+            noise_model)
+    
+    totals = {'trajectories': 0, 'counts': Counter(),
+              'sums': np.zeros(len(observables)), 'squares': np.zeros(len(observables))}
+    
+    def fold(result):
+        totals['trajectories'] += result['trajectories']
+        totals['counts'].update(result['counts'])
+        totals['sums'] += result['sums']
+        totals['squares'] += result['squares']
+    
+    def standard_errors():
+        n = totals['trajectories']
+        if n < 2:
+            return np.full(len(observables), np.inf)
+        variance = (totals['squares'] - totals['sums'] ** 2 / n) / (n - 1)
+        return np.sqrt(np.clip(variance, 0, None) / n)
+    
+    def converged():
+        return (target_precision is not None
+                and totals['trajectories'] >= min_trajectories
+                and bool(np.all(standard_errors() <= target_precision)))
+    
+    if workers == 0:
+        for chunk in chunks:
+            if converged():
+                break
+            fold(_run_trajectories(*args, chunk, shots_per_trajectory, observables))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded window of chunks in flight and fold them in order
+            pending = []
+            next_chunk = 0
+            while next_chunk < len(chunks) or pending:
+                while next_chunk < len(chunks) and len(pending) < 2 * workers and not converged():
+                    pending.append(executor.submit(_run_trajectories, *args, chunks[next_chunk],
+                                                   shots_per_trajectory, observables))
+                    next_chunk += 1
+                if not pending:
+                    break
+                fold(pending.pop(0).result())
+                if converged():
+                    for future in pending:
+                        future.cancel()
+                    break
+    
+    n = totals['trajectories']
+    counts = {
+        format(int(index), f'0{circuit.num_qubits}b'): count
+        for index, count in sorted(totals['counts'].items())
+    }
+    return {
+        'trajectories': n,
+        'counts': counts,
+        'expectations': dict(zip(observables, (totals['sums'] / n).tolist())),
+        'standard_errors': dict(zip(observables, standard_errors().tolist())),
+        'converged': converged()
+    }
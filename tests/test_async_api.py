@@ -0,0 +1,248 @@
+"""
+Unit tests for the asyncio API server.
+"""
+import asyncio
+import json
+import os
+import time
+
+import pytest
+import numpy as np
+import src.async_api as async_api
+from src.async_api import (
+    APIError, AsyncQuantumServer, NDJSON_CONTENT_TYPE, MAX_BODY_BYTES, MAX_HEADER_LINES
+)
+
+
+def _sleep(seconds):
+    """Sleep in a worker and return the duration."""
+    time.sleep(seconds)
+    return seconds
+
+
+def _crash():
+    """Kill the worker process without cleanup."""
+    os._exit(1)
+
+
+@pytest.fixture
+def app():
+    """A server with one worker and a generous timeout."""
+    server = AsyncQuantumServer(workers=1, timeout=30)
+    yield server
+    server.shutdown()
+
+
+async def _exchange(app, raw):
+    """Send raw bytes to a fresh connection and read until the server closes it."""
+    server = await asyncio.start_server(app.handle_connection, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(raw)
+    await writer.drain()
+    data = await asyncio.wait_for(reader.read(), 30)
+    writer.close()
+    server.close()
+    await server.wait_closed()
+    return data
+
+
+def _request(method, path, body=b'', version='HTTP/1.1', **headers):
+    """Encode one HTTP request."""
+    headers = {'Content-Length': len(body), **headers}
+    lines = [f'{method} {path} {version}'] + [f'{name.replace("_", "-")}: {value}'
+                                              for name, value in headers.items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode() + body
+
+
+def _split_responses(data):
+    """Split a connection's bytes into (status, headers, body) responses."""
+    responses = []
+    while data:
+        head, _, data = data.partition(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        headers = {name.lower(): value.strip()
+                   for name, _, value in (line.partition(':') for line in header_lines)}
+        
+        if headers.get('transfer-encoding') == 'chunked':
+            body = b''
+            while True:
+                size, _, data = data.partition(b'\r\n')
+                size = int(size, 16)
+                body, data = body + data[:size], data[size + 2:]
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            body, data = data[:length], data[length:]
+        else:
+            body, data = data, b''
+        responses.append((int(status_line.split()[1]), headers, body))
+    return responses
+
+
+def _simulate_body(**fields):
+    """JSON body of a 3-qubit /api/simulate request."""
+    data = {'num_qubits': 3, 'operations': [{'gate': 'h', 'target': 0},
+                                            {'gate': 'cnot', 'control': 0, 'target': 1},
+                                            {'gate': 'x', 'target': 2}], **fields}
+    return json.dumps(data).encode()
+
+
+def test_keep_alive_serves_several_requests(app):
+    """Test one connection carries requests until one asks to close it."""
+    raw = _request('GET', '/api/health') + _request('GET', '/api/nowhere', Connection='close')
+    responses = _split_responses(asyncio.run(_exchange(app, raw)))
+    
+    assert [status for status, _, _ in responses] == [200, 404]
+    assert json.loads(responses[0][2])['status'] == 'ok'
+    assert responses[1][1]['connection'] == 'close'
+
+
+def test_preset_and_preflight_routes(app):
+    """Test the preset routes and CORS preflight on one keep-alive connection."""
+    raw = (_request('GET', '/api/presets/bell') + _request('GET', '/api/presets/nope')
+           + _request('OPTIONS', '/api/simulate', Connection='close'))
+    responses = _split_responses(asyncio.run(_exchange(app, raw)))
+    
+    assert [status for status, _, _ in responses] == [200, 404, 200]
+    bell = json.loads(responses[0][2])
+    assert bell['success']
+    assert np.isclose(bell['amplitudes']['11']['probability'], 0.5)
+    assert responses[2][1]['access-control-allow-origin'] == '*'
+
+
+@pytest.mark.parametrize('raw, status', [
+    (b'GARBAGE\r\n\r\n', 400),
+    (b'GET /api/health HTTP/1.1\r\n' + b'X-Filler: 1\r\n' * (MAX_HEADER_LINES + 1) + b'\r\n', 431),
+    (f'POST /api/simulate HTTP/1.1\r\nContent-Length: {MAX_BODY_BYTES + 1}\r\n\r\n'.encode(), 413),
+])
+def test_malformed_requests_are_rejected(app, raw, status):
+    """Test the request parser answers bad requests with an error and closes."""
+    responses = _split_responses(asyncio.run(_exchange(app, raw)))
+    
+    assert len(responses) == 1
+    assert responses[0][0] == status
+    assert not json.loads(responses[0][2])['success']
+
+
+def test_json_response_is_streamed_in_chunks(app, monkeypatch):
+    """Test a chunked JSON response reassembles to the full amplitude document."""
+    monkeypatch.setattr(async_api, 'CHUNK_AMPLITUDES', 3)
+    raw = _request('POST', '/api/simulate', _simulate_body(), Connection='close')
+    [(status, headers, body)] = _split_responses(asyncio.run(_exchange(app, raw)))
+    
+    assert status == 200
+    assert headers['transfer-encoding'] == 'chunked'
+    result = json.loads(body)
+    assert result['success']
+    assert list(result['amplitudes']) == [format(i, '03b') for i in range(8)]
+    assert np.isclose(result['amplitudes']['001']['probability'], 0.5)
+    assert np.isclose(result['amplitudes']['111']['probability'], 0.5)
+
+
+def test_http_1_0_stream_ends_with_connection(app):
+    """Test HTTP/1.0 clients get an unchunked body ended by closing the connection."""
+    raw = _request('POST', '/api/simulate', _simulate_body(), version='HTTP/1.0')
+    [(status, headers, body)] = _split_responses(asyncio.run(_exchange(app, raw)))
+    
+    assert status == 200
+    assert 'transfer-encoding' not in headers
+    assert len(json.loads(body)['amplitudes']) == 8
+
+
+def test_ndjson_lines(app, monkeypatch):
+    """Test NDJSON sends the metadata first and then one line per amplitude chunk."""
+    monkeypatch.setattr(async_api, 'CHUNK_AMPLITUDES', 3)
+    raw = _request('POST', '/api/simulate', _simulate_body(),
+                   Accept=NDJSON_CONTENT_TYPE, Connection='close')
+    [(status, headers, body)] = _split_responses(asyncio.run(_exchange(app, raw)))
+    
+    assert status == 200
+    assert headers['content-type'] == NDJSON_CONTENT_TYPE
+    header, *chunks = [json.loads(line) for line in body.decode().splitlines()]
+    assert header['num_qubits'] == 3
+    assert 'amplitudes' not in header
+    assert [len(chunk['amplitudes']) for chunk in chunks] == [3, 3, 2]
+    
+    amplitudes = {}
+    for chunk in chunks:
+        amplitudes.update(chunk['amplitudes'])
+    assert list(amplitudes) == [format(i, '03b') for i in range(8)]
+
+
+def test_worker_returns_only_selected_amplitudes(app):
+    """Test threshold/top_k requests send back the kept amplitudes, not the whole state."""
+    result = async_api._simulate(json.loads(_simulate_body(top_k=1)), 'json')
+    assert result['indices'].tolist() in ([1], [7])
+    assert result['values'].size == 1
+    
+    raw = _request('POST', '/api/simulate', _simulate_body(threshold=0.1), Connection='close')
+    [(status, _, body)] = _split_responses(asyncio.run(_exchange(app, raw)))
+    assert status == 200
+    assert list(json.loads(body)['amplitudes']) == ['001', '111']
+
+
+def test_timeout_keeps_slot_until_worker_finishes():
+    """Test a timed-out simulation gets a 504 and holds its slot (503) until done."""
+    app = AsyncQuantumServer(workers=1, max_pending=1, timeout=0.5)
+    
+    async def scenario():
+        with pytest.raises(APIError) as timed_out:
+            await app._run_in_pool(_sleep, 1.5)
+        assert timed_out.value.status == 504
+        
+        with pytest.raises(APIError) as busy:
+            await app._run_in_pool(_sleep, 0)
+        assert busy.value.status == 503
+        
+        # The slot comes back once the worker is done with the first call
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                assert await app._run_in_pool(_sleep, 0) == 0
+                break
+            except APIError as e:
+                assert e.status == 503 and time.monotonic() < deadline
+                await asyncio.sleep(0.1)
+    
+    try:
+        asyncio.run(scenario())
+    finally:
+        app.shutdown()
+
+
+def test_busy_server_answers_503():
+    """Test a request arriving while every slot is taken gets a 503 response."""
+    app = AsyncQuantumServer(workers=1, max_pending=1, timeout=0.5)
+    
+    async def scenario():
+        with pytest.raises(APIError):
+            await app._run_in_pool(_sleep, 2)
+        return await _exchange(app, _request('POST', '/api/simulate', _simulate_body(),
+                                             Connection='close'))
+    
+    try:
+        [(status, _, body)] = _split_responses(asyncio.run(scenario()))
+    finally:
+        app.shutdown()
+    assert status == 503
+    assert not json.loads(body)['success']
+
+
+def test_pool_recovers_from_worker_crash():
+    """Test a dead worker fails its request and the server keeps serving."""
+    app = AsyncQuantumServer(workers=1, max_pending=2, timeout=30)
+    
+    async def scenario():
+        with pytest.raises(APIError) as crashed:
+            await app._run_in_pool(_crash)
+        assert crashed.value.status == 500
+        
+        assert await app._run_in_pool(_sleep, 0) == 0
+        assert await app._run_in_pool(_sleep, 0) == 0
+    
+    try:
+        asyncio.run(scenario())
+    finally:
+        app.shutdown()
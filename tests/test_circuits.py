@@ -3,7 +3,7 @@ Unit tests for QuantumCircuit class.
 """
 import pytest
 import numpy as np
-from src.circuit import QuantumCircuit, create_bell_state, create_ghz_state
+from src.circuit import QuantumCircuit, Parameter, create_bell_state, create_ghz_state, simulate_batch
 
 
 def test_circuit_initialization():
@@ -35,6 +35,15 @@ def test_two_qubit_gates():
     assert circuit.operations[0]['qubits'] == [0, 1]
 
 
+def test_swap_gate():
+    """Test SWAP exchanges two qubits."""
+    circuit = QuantumCircuit(3, initial_state='100')
+    circuit.swap(0, 2)
+    
+    assert np.allclose(circuit.get_state().state_vector[1], 1.0)
+    assert circuit.operations[0]['gate'] == 'SWAP'
+
+
 def test_method_chaining():
     """Test method chaining."""
     circuit = QuantumCircuit(2).h(0).x(1).cnot(0, 1)
@@ -59,6 +68,16 @@ def test_all_bell_states():
         assert bell.is_entangled()
 
 
+def test_ghz_state():
+    """Test GHZ state on more than two qubits."""
+    ghz = create_ghz_state(5)
+    state_vector = ghz.get_state().state_vector
+    
+    assert np.allclose(state_vector[0], 1/np.sqrt(2))
+    assert np.allclose(state_vector[-1], 1/np.sqrt(2))
+    assert np.allclose(np.abs(state_vector[1:-1]), 0.0)
+
+
 def test_reset():
     """Test circuit reset."""
     circuit = QuantumCircuit(2)
@@ -85,4 +104,206 @@ def test_measure():
     outcome, prob = circuit.measure()
     
     assert outcome in ['00', '01', '10', '11']
-    assert 0 <= prob <= 1
\ No newline at end of file
+    assert 0 <= prob <= 1
+
+def test_lazy_circuit_defers_simulation():
+    """Test lazy mode records gates and simulates on demand."""
+    circuit = QuantumCircuit(2, lazy=True).h(0).cnot(0, 1)
+    
+    assert len(circuit.operations) == 2
+    assert np.allclose(circuit.state.state_vector[0], 1.0)
+    
+    state_vector = circuit.get_statevector()
+    assert np.allclose(state_vector, [1/np.sqrt(2), 0, 0, 1/np.sqrt(2)])
+    
+    # Gates added later are applied on top of the simulated state
+    circuit.x(1)
+    assert np.allclose(circuit.get_statevector(), [0, 1/np.sqrt(2), 1/np.sqrt(2), 0])
+
+
+def test_lazy_circuit_rerun_with_initial_states():
+    """Test running the same recorded program on different inputs."""
+    circuit = QuantumCircuit(2, lazy=True).cnot(0, 1)
+    
+    assert np.allclose(circuit.run('10').state_vector[3], 1.0)
+    assert np.allclose(circuit.run('11').state_vector[2], 1.0)
+    assert np.allclose(circuit.run().state_vector[0], 1.0)
+
+
+def test_invalid_qubit_rejected_when_recorded():
+    """Test invalid qubits are rejected before anything is recorded."""
+    circuit = QuantumCircuit(2, lazy=True)
+    
+    with pytest.raises(IndexError):
+        circuit.h(2)
+    with pytest.raises(ValueError):
+        circuit.cnot(1, 1)
+    assert len(circuit.operations) == 0
+
+
+def test_sample_counts():
+    """Test vectorized shot sampling returns a histogram."""
+    bell = create_bell_state('00')
+    counts = bell.sample(2000, seed=7)
+    
+    assert set(counts) <= {'00', '11'}
+    assert sum(counts.values()) == 2000
+    assert abs(counts['00'] - 1000) < 150
+    
+    # Same seed, same shots
+    assert bell.sample(2000, seed=7) == counts
+
+
+def test_sample_raw_outcomes():
+    """Test sampling can return raw basis-state indices."""
+    circuit = QuantumCircuit(3, initial_state='101')
+    outcomes = circuit.sample(50, counts=False)
+    
+    assert outcomes.shape == (50,)
+    assert np.all(outcomes == 5)
+
+
+def test_measure_qubit_uses_gate_ordering():
+    """Test measure_qubit refers to the same qubit as the gates."""
+    circuit = QuantumCircuit(3).x(0)
+    
+    assert circuit.measure_qubit(0) == '1'
+    assert circuit.measure_qubit(2) == '0'
+
+
+def test_get_amplitudes_sparse():
+    """Test sparse amplitude export from a wide circuit."""
+    ghz = create_ghz_state(12)
+    
+    amps = ghz.get_amplitudes(threshold=1e-10)
+    assert list(amps) == ['0' * 12, '1' * 12]
+    
+    assert len(ghz.get_amplitudes(top_k=1)) == 1
+    assert len(ghz.get_amplitudes()) == 2 ** 12
+
+
+def test_iter_steps():
+    """Test stepping yields every intermediate state in one pass."""
+    circuit = QuantumCircuit(2, lazy=True).h(0).cnot(0, 1)
+    
+    snapshots = []
+    for operation, state in circuit.iter_steps():
+        # Queries between steps see the current step
+        assert np.allclose(circuit.get_statevector(), state.state_vector)
+        snapshots.append((operation, state.state_vector.copy()))
+    
+    assert [op and op['gate'] for op, _ in snapshots] == [None, 'H', 'CNOT']
+    assert np.allclose(snapshots[1][1], [1/np.sqrt(2), 0, 1/np.sqrt(2), 0])
+    assert np.allclose(snapshots[2][1], [1/np.sqrt(2), 0, 0, 1/np.sqrt(2)])
+    
+    # Stopping early leaves the remaining operations pending
+    steps = circuit.iter_steps()
+    next(steps)
+    next(steps)
+    steps.close()
+    assert np.allclose(circuit.get_statevector(), snapshots[2][1])
+
+
+def test_simulate_batch_matches_individual_runs():
+    """Test batched circuits of mixed widths give the same states as run()."""
+    circuits = [
+        QuantumCircuit(2, lazy=True).h(0).cnot(0, 1),
+        QuantumCircuit(2, initial_state='01', lazy=True).h(0).x(1),
+        QuantumCircuit(3, lazy=True).h(0).cnot(0, 1).cnot(1, 2),
+        QuantumCircuit(2, lazy=True).h(0)
+    ]
+    expected = [circuit.run().state_vector.copy() for circuit in circuits]
+    
+    states = simulate_batch(circuits)
+    
+    for circuit, state, vector in zip(circuits, states, expected):
+        assert np.allclose(state.state_vector, vector)
+        assert np.allclose(circuit.get_statevector(), vector)
+
+
+def test_simulate_batch_measurements():
+    """Test measurements in a batch collapse only their own circuit."""
+    measured = QuantumCircuit(2, lazy=True).h(0).cnot(0, 1)
+    measured.measure_qubit(0)
+    plain = QuantumCircuit(2, lazy=True).h(0).cnot(0, 1)
+    
+    simulate_batch([measured, plain])
+    
+    outcome = measured.operations[-1]['outcome']
+    assert outcome in ('0', '1')
+    assert measured.get_amplitudes()[outcome * 2] == pytest.approx(1)
+    assert np.allclose(np.abs(plain.get_statevector()) ** 2, [0.5, 0, 0, 0.5])
+
+
+def test_simulate_batch_precisions_and_independent_states():
+    """Test each batched circuit keeps its precision and owns its state vector."""
+    circuits = [
+        QuantumCircuit(2, lazy=True, precision='single').h(0).cnot(0, 1),
+        QuantumCircuit(2, lazy=True).h(0).cnot(0, 1),
+        QuantumCircuit(2, lazy=True).h(0).cnot(0, 1)
+    ]
+    states = simulate_batch(circuits)
+    
+    assert states[0].state_vector.dtype == np.complex64
+    assert states[1].state_vector.dtype == np.complex128
+    assert np.allclose(states[0].state_vector, states[1].state_vector, atol=1e-6)
+    
+    states[1].state_vector[:] = 0
+    assert np.allclose(np.abs(states[2].state_vector) ** 2, [0.5, 0, 0, 0.5])
+    assert not np.shares_memory(states[1].state_vector, states[2].state_vector)
+
+
+def test_simulate_batch_validates_before_running():
+    """Test an invalid circuit rejects the batch before anything runs."""
+    good = QuantumCircuit(2, lazy=True).x(0)
+    good.measure_qubit(0)
+    bad = QuantumCircuit(2, lazy=True)
+    bad.initial_state = '0'
+    
+    with pytest.raises(ValueError):
+        simulate_batch([good, bad])
+    assert good.operations[-1]['outcome'] is None
+    
+    # An unbound parameter in a later width group stops the batch up front too
+    unbound = QuantumCircuit(3, lazy=True).rx(2, Parameter('theta'))
+    with pytest.raises(ValueError):
+        simulate_batch([good, unbound])
+    assert good.operations[-1]['outcome'] is None
+
+
+def test_parameterized_circuit_bind():
+    """Test symbolic rotations run once bound."""
+    theta = Parameter('theta')
+    circuit = QuantumCircuit(2, lazy=True).ry(0, theta).cnot(0, 1).rz(1, 0.5)
+    assert circuit.parameters == [theta]
+    
+    with pytest.raises(ValueError):
+        circuit.get_state()
+    
+    bound = circuit.bind({'theta': np.pi})
+    probabilities = np.abs(bound.get_statevector()) ** 2
+    assert np.allclose(probabilities, [0, 0, 0, 1])
+    assert circuit.operations[0]['params'] == [theta]
+    
+    with pytest.raises(ValueError):
+        QuantumCircuit(1).rx(0, theta)
+
+
+def test_parameter_sweep_matches_bound_runs():
+    """Test a batched sweep equals binding and running each point."""
+    theta, phi = Parameter('theta'), Parameter('phi')
+    circuit = QuantumCircuit(3, lazy=True)
+    circuit.h(0).rx(1, theta).cnot(0, 2).ry(2, phi).rz(0, theta).cnot(1, 0).rx(2, 0.7)
+    
+    thetas = np.linspace(0, np.pi, 7)
+    phis = np.linspace(-1, 1, 7)
+    states = circuit.sweep({theta: thetas, 'phi': phis})
+    
+    assert states.shape == (7, 8)
+    for state, t, p in zip(states, thetas, phis):
+        assert np.allclose(state, circuit.bind({theta: t, phi: p}).get_statevector())
+    
+    with pytest.raises(ValueError):
+        circuit.sweep({theta: thetas, phi: phis[:3]})
+    with pytest.raises(ValueError):
+        circuit.sweep({theta: thetas})
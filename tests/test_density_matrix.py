@@ -0,0 +1,124 @@
+"""
+Unit tests for the density-matrix backend and noise channels.
+"""
+import pytest
+import numpy as np
+from src.circuit import Parameter, QuantumCircuit
+from src.density_matrix import DensityMatrix
+from src.noise import KrausChannel, NoiseModel, depolarizing, amplitude_damping, bit_flip
+
+
+def _build(circuit):
+    """Apply a fixed mix of Clifford gates and rotations to a 3-qubit circuit."""
+    circuit.h(0).cnot(0, 2).y(1).ry(1, 0.4).rz(2, 1.1).swap(0, 1).rx(0, 0.9).cnot(2, 1)
+    return circuit
+
+
+def _apply_kraus(rho, channel, qubit, num_qubits):
+    """Reference: Σ K ρ K† with full-size Kraus operators."""
+    result = np.zeros_like(rho)
+    for operator in channel.operators:
+        full = np.kron(np.kron(np.eye(2 ** qubit), operator), np.eye(2 ** (num_qubits - qubit - 1)))
+        result += full @ rho @ full.conj().T
+    return result
+
+
+def test_noiseless_density_matrix_matches_statevector():
+    """Test a noiseless density matrix is the outer product of the state vector."""
+    pure = _build(QuantumCircuit(3)).get_statevector()
+    mixed = _build(QuantumCircuit(3, backend='density_matrix')).get_density_matrix()
+    
+    assert np.allclose(mixed, np.outer(pure, pure.conj()))
+
+
+@pytest.mark.parametrize('channel', [depolarizing(0.2), amplitude_damping(0.35), bit_flip(0.1)])
+def test_channels_match_kraus_sum(channel):
+    """Test each channel matches the full-size Kraus sum reference."""
+    state = DensityMatrix.from_state_vector(_build(QuantumCircuit(3)).get_statevector())
+    expected = _apply_kraus(state.density_matrix, channel, 1, 3)
+    
+    state.apply_channel(channel, 1)
+    
+    assert np.allclose(state.density_matrix, expected)
+    assert np.trace(state.density_matrix) == pytest.approx(1)
+
+
+def test_depolarizing_mixes_state():
+    """Test full depolarizing noise leaves the maximally mixed state."""
+    noise = NoiseModel().add_channel(depolarizing(1.0))
+    circuit = QuantumCircuit(1, backend='density_matrix', noise_model=noise).h(0)
+    
+    assert np.allclose(circuit.get_density_matrix(), np.eye(2) / 2)
+    assert circuit.get_state().purity() == pytest.approx(0.5)
+
+
+def test_noise_model_filters_gates_and_qubits():
+    """Test channels only follow the gates and qubits they are attached to."""
+    noise = NoiseModel().add_channel(bit_flip(1.0), gates=['cnot'], qubits=[1])
+    circuit = QuantumCircuit(2, backend='density_matrix', noise_model=noise)
+    circuit.x(0).cnot(0, 1)
+    
+    # X on qubit 0 is noiseless; CNOT flips qubit 1 and the noise flips it back
+    assert np.allclose(np.diag(circuit.get_density_matrix()).real, [0, 0, 1, 0])
+
+
+def test_density_matrix_measurement_collapses():
+    """Test measuring one qubit of a Bell state collapses both."""
+    circuit = QuantumCircuit(2, backend='density_matrix', lazy=True).h(0).cnot(0, 1)
+    circuit.measure_qubit(1)
+    rho = circuit.get_density_matrix()
+    
+    outcome = int(circuit.operations[-1]['outcome'])
+    expected = np.zeros(4)
+    expected[3 * outcome] = 1
+    assert np.allclose(rho, np.diag(expected))
+
+
+def test_density_matrix_measurement_is_seedable():
+    """Test measurements with the same seeded generator give the same outcomes."""
+    def outcomes(seed):
+        """Measure each qubit of a uniform 4-qubit mixture with a seeded generator."""
+        state = DensityMatrix.from_state_vector(np.full(16, 0.25, dtype=complex))
+        rng = np.random.default_rng(seed)
+        full = [state.measure(rng=rng)[0] for _ in range(5)]
+        return full + [state.measure(qubit, rng)[0] for qubit in range(4)]
+    
+    assert outcomes(11) == outcomes(11)
+    assert len({tuple(outcomes(seed)) for seed in range(5)}) > 1
+
+
+def test_density_matrix_sampling():
+    """Test sampled counts follow the damped populations."""
+    noise = NoiseModel().add_channel(amplitude_damping(0.25))
+    circuit = QuantumCircuit(1, backend='density_matrix', noise_model=noise).x(0)
+    
+    counts = circuit.sample(20000, seed=3)
+    assert counts['0'] / 20000 == pytest.approx(0.25, abs=0.02)
+
+
+def test_bind_keeps_backend_and_noise():
+    """Test a bound noisy circuit still runs on the density-matrix backend with its noise."""
+    theta = Parameter('theta')
+    noise = NoiseModel().add_channel(depolarizing(0.3))
+    circuit = QuantumCircuit(2, backend='density_matrix', noise_model=noise, lazy=True)
+    circuit.h(0).rx(1, theta).cnot(0, 1)
+    
+    bound = circuit.bind({theta: 0.7})
+    
+    assert bound.backend == 'density_matrix'
+    assert bound.noise_model is noise
+    assert bound.get_state().purity() < 0.99
+
+
+def test_invalid_backend_and_channel_settings():
+    """Test invalid backends, noise settings and channels raise ValueError."""
+    with pytest.raises(ValueError):
+        QuantumCircuit(2, backend='qudit')
+    with pytest.raises(ValueError):
+        QuantumCircuit(2, noise_model=NoiseModel())
+    with pytest.raises(ValueError):
+        QuantumCircuit(2, backend='density_matrix').get_statevector()
+    with pytest.raises(ValueError):
+        KrausChannel('broken', [np.eye(2), np.eye(2)])
+    with pytest.raises(ValueError):
+        depolarizing(1.5)
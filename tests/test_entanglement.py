@@ -0,0 +1,166 @@
+"""
+Unit tests for entanglement analysis.
+"""
+import pytest
+import numpy as np
+from src.circuit import QuantumCircuit, create_bell_state, create_ghz_state
+from src.entanglement import (
+    calculate_density_matrix, partial_trace, schmidt_coefficients, von_neumann_entropy,
+    is_entangled, calculate_concurrence, measure_entanglement_entropy,
+    bloch_vector, entanglement_map
+)
+
+
+def _random_state(num_qubits, seed):
+    """Random normalized state vector of num_qubits qubits."""
+    rng = np.random.default_rng(seed)
+    state = rng.normal(size=2 ** num_qubits) + 1j * rng.normal(size=2 ** num_qubits)
+    return state / np.linalg.norm(state)
+
+
+def _reduced_density(state, subsystem, num_qubits):
+    """Reference: trace the full density matrix over the other qubits."""
+    rest = [q for q in range(num_qubits) if q not in subsystem]
+    rho = calculate_density_matrix(state).reshape((2,) * (2 * num_qubits))
+    rho = rho.transpose(subsystem + rest + [num_qubits + q for q in subsystem + rest])
+    dim_a, dim_b = 2 ** len(subsystem), 2 ** len(rest)
+    return np.einsum('ajbj->ab', rho.reshape(dim_a, dim_b, dim_a, dim_b))
+
+
+def test_schmidt_coefficients_match_reduced_density():
+    """Test Schmidt coefficients square to the reduced density eigenvalues."""
+    state = _random_state(5, seed=1)
+    for subsystem in ([0], [3], [1, 4], [4, 0, 2]):
+        eigenvalues = np.linalg.eigvalsh(_reduced_density(state, subsystem, 5))[::-1]
+        coefficients = schmidt_coefficients(state, subsystem)
+        
+        assert np.allclose(coefficients[:len(eigenvalues)] ** 2, eigenvalues[:len(coefficients)])
+        assert np.sum(coefficients ** 2) == pytest.approx(1)
+
+
+def test_entropy_of_cuts_is_symmetric():
+    """Test both sides of a cut of a pure state have the same entropy."""
+    state = _random_state(6, seed=2)
+    assert von_neumann_entropy(state, [0, 2]) == pytest.approx(von_neumann_entropy(state, [1, 3, 4, 5]))
+
+
+def test_ghz_state_entanglement():
+    """Test every cut of a GHZ state carries one bit of entanglement."""
+    state = create_ghz_state(6).get_statevector()
+    
+    assert is_entangled(state)
+    for subsystem in ([0], [2, 5], [0, 1, 2]):
+        assert von_neumann_entropy(state, subsystem) == pytest.approx(1)
+    
+    analysis = measure_entanglement_entropy(state)
+    assert analysis['subsystem'] == [0]
+    assert analysis['classification'] == 'maximally entangled'
+    assert calculate_concurrence(state, [0, 1, 2]) == pytest.approx(np.sqrt(8 / 7 * 0.5))
+
+
+def test_partially_entangled_state():
+    """Test cuts of a product of |0⟩ and a Bell pair."""
+    # |0⟩ ⊗ Bell pair on qubits 1 and 2
+    circuit = QuantumCircuit(3).h(1).cnot(1, 2)
+    state = circuit.get_statevector()
+    
+    assert is_entangled(state)
+    assert von_neumann_entropy(state, [0]) == pytest.approx(0)
+    assert von_neumann_entropy(state, [1]) == pytest.approx(1)
+    assert circuit.analyze_entanglement(subsystem=[2])['concurrence'] == pytest.approx(1)
+
+
+def test_product_state_is_separable():
+    """Test a product state is classified as separable."""
+    circuit = QuantumCircuit(4).h(0).x(1).h(3)
+    analysis = circuit.analyze_entanglement()
+    
+    assert not circuit.is_entangled()
+    assert analysis['classification'] == 'separable'
+    assert analysis['entropy'] == pytest.approx(0)
+    assert analysis['concurrence'] == 0
+    assert calculate_concurrence(QuantumCircuit(2).h(0).ry(1, 0.7).get_statevector()) == 0
+
+
+def test_two_qubit_concurrence_formula():
+    """Test two-qubit concurrence equals 2|ad - bc|."""
+    state = _random_state(2, seed=3)
+    a, b, c, d = state
+    assert calculate_concurrence(state) == pytest.approx(2 * abs(a * d - b * c))
+    assert create_bell_state('11').analyze_entanglement()['concurrence'] == pytest.approx(1)
+    
+    # The closed form still validates the cut
+    with pytest.raises(IndexError):
+        calculate_concurrence(state, [2])
+    with pytest.raises(ValueError):
+        calculate_concurrence(state, [0, 0])
+    with pytest.raises(ValueError):
+        calculate_concurrence(state, [])
+
+
+def test_partial_trace_of_state_vector():
+    """Test partial traces of a state vector against the full density matrix."""
+    state = _random_state(5, seed=4)
+    for keep in ([2], [0, 3], [4, 1], [1, 2, 3]):
+        assert np.allclose(partial_trace(state, keep), _reduced_density(state, keep, 5))
+    
+    assert np.allclose(partial_trace(state, 3), partial_trace(state, [3]))
+
+
+def test_partial_trace_of_density_matrix():
+    """Test partial traces of a mixed density matrix."""
+    # Mixture of two random pure states
+    a, b = _random_state(4, seed=5), _random_state(4, seed=6)
+    rho = 0.3 * calculate_density_matrix(a) + 0.7 * calculate_density_matrix(b)
+    
+    for keep in ([0], [3, 1], [0, 1, 2]):
+        expected = 0.3 * _reduced_density(a, keep, 4) + 0.7 * _reduced_density(b, keep, 4)
+        assert np.allclose(partial_trace(rho, keep), expected)
+    
+    assert np.trace(partial_trace(rho, [2])) == pytest.approx(1)
+    with pytest.raises(IndexError):
+        partial_trace(rho, [4])
+
+
+def test_partial_trace_of_wide_state():
+    """Test a partial trace of a 20-qubit state without its density matrix."""
+    state = create_ghz_state(20).get_statevector()
+    assert np.allclose(partial_trace(state, [0, 19]), np.diag([0.5, 0, 0, 0.5]))
+
+
+def test_bloch_vector():
+    """Test Bloch vectors of single qubits in a product state."""
+    state = QuantumCircuit(3).h(0).x(1).ry(2, 0.8).get_statevector()
+    
+    assert np.allclose(bloch_vector(state, 0), [1, 0, 0])
+    assert np.allclose(bloch_vector(state, 1), [0, 0, -1])
+    assert np.allclose(bloch_vector(state, 2), [np.sin(0.8), 0, np.cos(0.8)])
+    assert np.allclose(bloch_vector(calculate_density_matrix(state), 2), bloch_vector(state, 2))
+
+
+def test_entanglement_map_matches_pairwise_reference():
+    """Test the entanglement map against per-pair entropies."""
+    state = _random_state(5, seed=7)
+    result = entanglement_map(state)
+    
+    for i in range(5):
+        assert np.allclose(result['bloch_vectors'][i], bloch_vector(state, i))
+        assert result['entropies'][i] == pytest.approx(von_neumann_entropy(state, [i]))
+        for j in range(5):
+            if i == j:
+                assert result['mutual_information'][i, j] == 0
+                continue
+            expected = (von_neumann_entropy(state, [i]) + von_neumann_entropy(state, [j])
+                        - von_neumann_entropy(state, [i, j]))
+            assert result['mutual_information'][i, j] == pytest.approx(expected)
+
+
+def test_entanglement_map_of_bell_pair():
+    """Test the entanglement map finds the Bell pair."""
+    # Bell pair on qubits 0 and 2, qubit 1 in |1⟩
+    state = QuantumCircuit(3).h(0).cnot(0, 2).x(1).get_statevector()
+    result = entanglement_map(state)
+    
+    assert result['mutual_information'][0, 2] == pytest.approx(2)
+    assert result['mutual_information'][0, 1] == pytest.approx(0, abs=1e-9)
+    assert np.allclose(result['bloch_vectors'], [[0, 0, 0], [0, 0, -1], [0, 0, 0]])
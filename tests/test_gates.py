@@ -4,8 +4,11 @@ Unit tests for quantum gates.
 import pytest
 import numpy as np
 from src.gates import (
-    hadamard, pauli_x, pauli_y, pauli_z, cnot,
-    apply_single_qubit_gate, apply_two_qubit_gate
+    hadamard, pauli_x, pauli_y, pauli_z, cnot, swap, controlled,
+    apply_single_qubit_gate, apply_two_qubit_gate, apply_gate,
+    classify_matrix, split_controls, PERMUTATION, DIAGONAL, DENSE,
+    rotation_x, rotation_y, rotation_z, rotation_matrices, apply_batched_single_qubit,
+    get_gate, GateCache
 )
 from src.quantum_state import QuantumState
 
@@ -82,4 +85,202 @@ def test_bell_state_creation():
     
     # Should be (|00⟩ + |11⟩)/√2
     expected = np.array([1/np.sqrt(2), 0, 0, 1/np.sqrt(2)])
-    assert np.allclose(state.state_vector, expected)
\ No newline at end of file
+    assert np.allclose(state.state_vector, expected)
+
+def test_single_qubit_gate_matches_kron():
+    """Test tensor kernel against the explicit Kronecker product."""
+    rng = np.random.default_rng(0)
+    num_qubits = 4
+    psi = rng.normal(size=16) + 1j * rng.normal(size=16)
+    psi /= np.linalg.norm(psi)
+    h = hadamard()
+    
+    for target in range(num_qubits):
+        factors = [h.matrix if q == target else np.eye(2) for q in range(num_qubits)]
+        full_gate = factors[0]
+        for factor in factors[1:]:
+            full_gate = np.kron(full_gate, factor)
+        
+        result = apply_single_qubit_gate(psi, h, target, num_qubits)
+        assert np.allclose(result, full_gate @ psi)
+
+
+def test_single_qubit_gate_out_buffer():
+    """Test writing the result into a preallocated buffer."""
+    state = QuantumState(3)
+    out = np.empty_like(state.state_vector)
+    result = apply_single_qubit_gate(state.state_vector, pauli_x(), 2, 3, out=out)
+    
+    assert result is out
+    assert np.allclose(out[1], 1.0)
+    assert np.allclose(state.state_vector[0], 1.0)
+
+
+def test_single_qubit_gate_out_aliases_input():
+    """Test a dense gate written back into its own state vector."""
+    rng = np.random.default_rng(3)
+    psi = rng.normal(size=8) + 1j * rng.normal(size=8)
+    
+    for target in range(3):
+        expected = apply_single_qubit_gate(psi, hadamard(), target, 3)
+        state_vector = psi.copy()
+        result = apply_single_qubit_gate(state_vector, hadamard(), target, 3, out=state_vector)
+        
+        assert result is state_vector
+        assert np.allclose(state_vector, expected)
+
+
+def _reference_operator(matrix, qubits, num_qubits):
+    """Build the full operator of a gate by explicit basis-index mapping."""
+    dim = 2 ** num_qubits
+    full = np.zeros((dim, dim), dtype=complex)
+    for col in range(dim):
+        bits = [(col >> (num_qubits - 1 - q)) & 1 for q in range(num_qubits)]
+        local_in = int(''.join(str(bits[q]) for q in qubits), 2)
+        for local_out in range(matrix.shape[0]):
+            out_bits = list(bits)
+            for pos, q in enumerate(qubits):
+                out_bits[q] = (local_out >> (len(qubits) - 1 - pos)) & 1
+            row = int(''.join(map(str, out_bits)), 2)
+            full[row, col] += matrix[local_out, local_in]
+    return full
+
+
+def test_apply_gate_arbitrary_qubits():
+    """Test k-qubit gates on non-adjacent and reversed qubit orders."""
+    rng = np.random.default_rng(1)
+    num_qubits = 4
+    psi = rng.normal(size=16) + 1j * rng.normal(size=16)
+    
+    for qubits in ([0, 1], [1, 0], [3, 0], [2, 0, 3]):
+        k = len(qubits)
+        matrix = rng.normal(size=(2 ** k, 2 ** k)) + 1j * rng.normal(size=(2 ** k, 2 ** k))
+        expected = _reference_operator(matrix, qubits, num_qubits) @ psi
+        assert np.allclose(apply_gate(psi, matrix, qubits), expected)
+
+
+def test_cnot_on_wide_circuit():
+    """Test CNOT with control and target far apart in a 3-qubit state."""
+    state = QuantumState(3, initial_state='100')
+    state.state_vector = apply_two_qubit_gate(
+        state.state_vector, cnot(), 0, 2, 3
+    )
+    # |100⟩ → |101⟩
+    assert np.allclose(state.state_vector[5], 1.0)
+
+
+def test_gate_classification():
+    """Test gates are classified by the kernel that applies them."""
+    assert pauli_x().kind == PERMUTATION
+    assert pauli_y().kind == PERMUTATION
+    assert swap().kind == PERMUTATION
+    assert pauli_z().kind == DIAGONAL
+    assert hadamard().kind == DENSE
+    
+    # CNOT is a controlled X
+    assert cnot().num_controls == 1
+    assert cnot().kind == PERMUTATION
+    assert classify_matrix(np.diag([1, 1, 1, -1])) == DIAGONAL
+    
+    num_controls, sub_matrix = split_controls(controlled(hadamard(), 2).matrix)
+    assert num_controls == 2
+    assert np.allclose(sub_matrix, hadamard().matrix)
+
+
+def test_fast_paths_match_reference():
+    """Test permutation, diagonal and controlled kernels against full operators."""
+    rng = np.random.default_rng(2)
+    num_qubits = 4
+    psi = rng.normal(size=16) + 1j * rng.normal(size=16)
+    
+    cases = [
+        (pauli_x(), [2]), (pauli_y(), [0]), (pauli_z(), [3]),
+        (cnot(), [3, 1]), (swap(), [0, 2]),
+        (controlled(pauli_z()), [1, 0]),
+        (controlled(pauli_x(), 2), [0, 3, 1]),
+        (controlled(hadamard()), [2, 1]),
+    ]
+    for gate, qubits in cases:
+        expected = _reference_operator(gate.matrix, qubits, num_qubits) @ psi
+        assert np.allclose(apply_gate(psi, gate, qubits), expected), gate.name
+
+
+def test_apply_gate_in_place():
+    """Test passing the state vector as out updates it in place."""
+    state = QuantumState(2, initial_state='10')
+    state_vector = state.state_vector
+    result = apply_gate(state_vector, cnot(), [0, 1], out=state_vector)
+    
+    assert result is state_vector
+    assert np.allclose(state_vector[3], 1.0)
+
+
+def test_fixed_gates_are_shared_and_read_only():
+    """Test fixed gates are singletons with immutable matrices."""
+    assert hadamard() is hadamard()
+    assert get_gate('cnot') is cnot()
+    
+    with pytest.raises(ValueError):
+        hadamard().matrix[0, 0] = 0
+
+
+def test_conjugate_gate_is_cached():
+    """Test a gate's conjugate is built once, keeps its kind and undoes itself."""
+    assert hadamard().conjugate() is hadamard()
+    
+    gate = controlled(rotation_z(0.4))
+    conjugate = gate.conjugate()
+    assert gate.conjugate() is conjugate
+    assert conjugate.conjugate() is gate
+    assert np.allclose(conjugate.matrix, gate.matrix.conj())
+    assert (conjugate.kind, conjugate.num_controls) == (DIAGONAL, 1)
+    assert not conjugate.matrix.flags.writeable
+    assert gate.astype(np.complex64).conjugate().matrix.dtype == np.complex64
+
+
+def test_parameterized_gate_cache():
+    """Test LRU caching of parameterized gates."""
+    cache = GateCache(maxsize=2)
+    build = lambda theta: rotation_x(theta)
+    
+    first = cache.get('RX', (0.5,), build)
+    assert cache.get('RX', (0.5,), build) is first
+    cache.get('RX', (1.0,), build)
+    cache.get('RX', (1.5,), build)  # evicts 0.5
+    
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 3
+    assert stats['size'] == 2
+    
+    cache.get('RX', (0.5,), build)
+    assert cache.stats()['misses'] == 4
+    
+    assert rotation_x(0.25) is rotation_x(0.25)
+    assert np.allclose(rotation_x(np.pi).matrix, -1j * pauli_x().matrix)
+
+
+def test_rotation_matrices_match_single_gates():
+    """Test stacked rotation matrices match the cached single gates."""
+    thetas = np.array([0.0, 0.3, np.pi / 2, 2.5])
+    for name, build in (('RX', rotation_x), ('RY', rotation_y), ('RZ', rotation_z)):
+        matrices = rotation_matrices(name, thetas)
+        assert matrices.shape == (4, 2, 2)
+        for matrix, theta in zip(matrices, thetas):
+            assert np.allclose(matrix, build(theta).matrix)
+            assert get_gate(name, theta) is build(theta)
+    
+    with pytest.raises(ValueError):
+        rotation_matrices('H', thetas)
+
+
+def test_apply_batched_single_qubit():
+    """Test per-state matrices match applying each rotation separately."""
+    rng = np.random.default_rng(3)
+    states = rng.normal(size=(5, 8)) + 1j * rng.normal(size=(5, 8))
+    thetas = rng.uniform(0, 2 * np.pi, size=5)
+    
+    expected = [apply_gate(state, rotation_y(theta), [1]) for state, theta in zip(states, thetas)]
+    apply_batched_single_qubit(states.reshape(5, 2, 2, 2), rotation_matrices('RY', thetas), 2)
+    
+    assert np.allclose(states, expected)
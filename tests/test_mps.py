@@ -0,0 +1,92 @@
+"""
+Tests for the matrix product state backend
+"""
+import numpy as np
+import pytest
+from src.circuit import QuantumCircuit
+from src.mps import MPSState
+from src.gates import get_gate
+
+
+def layered_circuit(num_qubits, layers, seed, **kwargs):
+    """Build layers of random RY rotations followed by a brick of CNOTs."""
+    rng = np.random.default_rng(seed)
+    circuit = QuantumCircuit(num_qubits, lazy=True, **kwargs)
+    for layer in range(layers):
+        for qubit in range(num_qubits):
+            circuit.ry(qubit, float(rng.random() * 3))
+        for qubit in range(layer % 2, num_qubits - 1, 2):
+            circuit.cnot(qubit, qubit + 1)
+    return circuit
+
+
+def test_matches_statevector():
+    """Test random MPS circuits match the state-vector backend."""
+    rng = np.random.default_rng(2)
+    for trial in range(20):
+        exact = QuantumCircuit(5, '01100', lazy=True)
+        chain = QuantumCircuit(5, '01100', lazy=True, backend='mps')
+        for _ in range(25):
+            name = str(rng.choice(['H', 'Y', 'RX', 'CNOT', 'SWAP']))
+            qubits = [int(q) for q in rng.choice(5, 1 if name in ('H', 'Y', 'RX') else 2,
+                                                 replace=False)]
+            operation = {'gate': name, 'qubits': qubits, 'type': 'single'}
+            if name == 'RX':
+                operation['params'] = [float(rng.random() * 6)]
+            for circuit in (exact, chain):
+                circuit._add_operation(dict(operation))
+        
+        expected = exact.get_statevector()
+        assert np.allclose(chain.get_state().to_state_vector(), expected)
+        assert chain.get_amplitude('10101') == pytest.approx(expected[0b10101])
+
+
+def test_ghz_has_bond_dimension_two():
+    """Test a 100-qubit GHZ chain needs bond dimension two and no truncation."""
+    circuit = QuantumCircuit(100, lazy=True, backend='mps')
+    circuit.h(0)
+    for qubit in range(99):
+        circuit.cnot(qubit, qubit + 1)
+    
+    state = circuit.get_state()
+    assert state.bond_dimensions == [2] * 99
+    assert state.truncation_error == 0
+    assert abs(circuit.get_amplitude('1' * 100)) ** 2 == pytest.approx(0.5)
+    assert set(circuit.sample(100, seed=0)) == {'0' * 100, '1' * 100}
+
+
+def test_sampling_distribution():
+    """Test MPS samples follow the exact distribution."""
+    circuit = layered_circuit(4, 3, seed=4, backend='mps')
+    exact = layered_circuit(4, 3, seed=4)
+    probabilities = np.abs(exact.get_statevector()) ** 2
+    
+    counts = circuit.sample(5000, seed=1)
+    for bits, count in counts.items():
+        assert count / 5000 == pytest.approx(probabilities[int(bits, 2)], abs=0.03)
+
+
+def test_truncation_error_bounds_infidelity():
+    """Test the accumulated truncation error bounds the infidelity."""
+    exact = layered_circuit(10, 6, seed=1).get_statevector()
+    circuit = layered_circuit(10, 6, seed=1, backend='mps', backend_options={'max_bond': 4})
+    
+    state = circuit.get_state()
+    assert max(state.bond_dimensions) == 4
+    assert state.truncation_error > 0
+    infidelity = 1 - abs(np.vdot(exact, state.to_state_vector())) ** 2
+    assert infidelity <= 2 * state.truncation_error
+
+
+def test_measurement_collapses():
+    """Test measuring one end of an entangled chain fixes the other."""
+    state = MPSState(3)
+    state.apply_gate(get_gate('H'), [0])
+    state.apply_gate(get_gate('CNOT'), [0, 2])
+    outcome, probability = state.measure(2)
+    
+    assert probability == pytest.approx(0.5)
+    assert state.measure(0) == (outcome, pytest.approx(1.0))
+    
+    with pytest.raises(ValueError):
+        state.apply_gate(get_gate('H').matrix, [0, 1, 2])
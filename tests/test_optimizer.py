@@ -0,0 +1,121 @@
+"""
+Unit tests for circuit optimization passes.
+"""
+import pytest
+import numpy as np
+from src.circuit import QuantumCircuit
+from src.gates import get_gate
+from src.optimizer import fuse_operations
+
+
+def _random_circuit(num_qubits, num_gates, seed, lazy=True, optimize=False):
+    """Build a random circuit of H/X/Y/Z/CNOT/SWAP gates."""
+    rng = np.random.default_rng(seed)
+    circuit = QuantumCircuit(num_qubits, lazy=lazy, optimize=optimize)
+    for _ in range(num_gates):
+        gate = rng.choice(['h', 'x', 'y', 'z', 'cnot', 'swap'])
+        if gate in ('cnot', 'swap'):
+            a, b = rng.choice(num_qubits, size=2, replace=False)
+            getattr(circuit, gate)(int(a), int(b))
+        else:
+            getattr(circuit, gate)(int(rng.integers(num_qubits)))
+    return circuit
+
+
+def test_fuse_single_qubit_run():
+    """Test H·Z·H on one qubit becomes a single sweep."""
+    circuit = QuantumCircuit(2, lazy=True).h(0).z(0).h(0).x(1)
+    compiled, report = circuit.compile()
+    
+    assert len(compiled) == 2
+    assert compiled[0]['type'] == 'fused'
+    assert compiled[0]['gate'] == 'H·Z·H'
+    assert report['sweeps_saved'] == 2
+
+
+def test_identity_pairs_cancel():
+    """Test X·X, H·H and CNOT·CNOT are removed."""
+    circuit = QuantumCircuit(3, lazy=True)
+    circuit.x(0).x(0).h(1).h(1).cnot(0, 2).cnot(0, 2)
+    compiled, report = circuit.compile()
+    
+    assert compiled == []
+    assert report['cancelled_blocks'] == 3
+    assert report['compiled_sweeps'] == 0
+
+
+def test_reversed_two_qubit_gates_fuse():
+    """Test gates on the same qubit pair in opposite order still fuse."""
+    circuit = QuantumCircuit(2, lazy=True).swap(0, 1).swap(1, 0)
+    compiled, _ = circuit.compile()
+    assert compiled == []
+
+
+def test_intervening_gate_blocks_fusion():
+    """Test a gate touching a shared qubit prevents fusion across it."""
+    circuit = QuantumCircuit(2, lazy=True).x(0).cnot(0, 1).x(0)
+    compiled, report = circuit.compile()
+    
+    assert len(compiled) == 3
+    assert report['sweeps_saved'] == 0
+
+
+def test_measurement_is_a_barrier():
+    """Test measurements are not fused over and still record outcomes."""
+    circuit = QuantumCircuit(1, lazy=True, optimize=True).x(0)
+    circuit.measure_qubit(0)
+    circuit.x(0)
+    
+    state_vector = circuit.get_statevector()
+    assert circuit.operations[1]['outcome'] == '1'
+    assert np.allclose(state_vector[0], 1.0)
+
+
+def test_optimized_circuit_matches_unoptimized():
+    """Test fusion preserves the final state of random circuits."""
+    for seed in range(5):
+        plain = _random_circuit(4, 40, seed)
+        optimized = _random_circuit(4, 40, seed, optimize=True)
+        
+        assert np.allclose(optimized.get_statevector(), plain.get_statevector())
+        assert optimized.optimization_report['original_sweeps'] == 40
+
+
+def test_fuse_operations_passes_measurements_through():
+    """Test measurement dicts come out of the pass as the same objects."""
+    measurement = {'gate': 'MEASURE', 'qubits': [0], 'type': 'measurement', 'outcome': None}
+    operations = [
+        {'gate': 'H', 'qubits': [0], 'type': 'single'},
+        measurement,
+        {'gate': 'H', 'qubits': [0], 'type': 'single'},
+    ]
+    compiled, report = fuse_operations(operations)
+    
+    assert compiled[1] is measurement
+    assert report['original_sweeps'] == 2
+    assert report['sweeps_saved'] == 0
+
+
+def test_fused_matrix_is_gate_product():
+    """Test a fused block carries the product of its gates in time order."""
+    rotation = {'gate': 'RX', 'qubits': [1], 'type': 'single', 'params': [0.3]}
+    compiled, _ = fuse_operations([rotation, {'gate': 'Z', 'qubits': [1], 'type': 'single'}])
+    
+    assert len(compiled) == 1
+    assert np.allclose(compiled[0]['unitary'].matrix,
+                       get_gate('Z').matrix @ get_gate('RX', 0.3).matrix)
+    
+    compiled, _ = fuse_operations([
+        {'gate': 'CNOT', 'qubits': [0, 1], 'type': 'two_qubit'},
+        {'gate': 'CNOT', 'qubits': [1, 0], 'type': 'two_qubit'},
+    ])
+    cnot = get_gate('CNOT').matrix
+    # CNOT(1, 0) written in the (0, 1) qubit order of the block
+    reversed_cnot = cnot.reshape(2, 2, 2, 2).transpose(1, 0, 3, 2).reshape(4, 4)
+    assert np.allclose(compiled[0]['unitary'].matrix, reversed_cnot @ cnot)
+
+
+def test_fuse_operations_rejects_unknown_gates():
+    """Test an unknown gate name is reported instead of skipped."""
+    with pytest.raises(ValueError):
+        fuse_operations([{'gate': 'FOO', 'qubits': [0], 'type': 'single'}])
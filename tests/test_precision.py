@@ -0,0 +1,139 @@
+"""
+Tests for single-precision (complex64) simulation
+"""
+import numpy as np
+import pytest
+import src.circuit as circuit_module
+from src.circuit import Parameter, QuantumCircuit, simulate_batch
+from src.gates import gate_cache, get_gate
+from src.quantum_state import QuantumState
+from src.state_cache import StateCache
+
+
+def random_circuit(precision, num_qubits=8, layers=40, seed=0):
+    """Build layers of random RY/RZ rotations, an H and a brick of CNOTs."""
+    rng = np.random.default_rng(seed)
+    circuit = QuantumCircuit(num_qubits, lazy=True, precision=precision)
+    for layer in range(layers):
+        for qubit in range(num_qubits):
+            circuit.ry(qubit, float(rng.random() * 3))
+            circuit.rz(qubit, float(rng.random() * 3))
+        circuit.h(layer % num_qubits)
+        for qubit in range(layer % 2, num_qubits - 1, 2):
+            circuit.cnot(qubit, qubit + 1)
+    return circuit
+
+
+def test_single_precision_state():
+    """Test single-precision states store complex64 amplitudes."""
+    state = QuantumState(3, '101', precision='single')
+    assert state.state_vector.dtype == np.complex64
+    assert state.state_vector[5] == 1
+    with pytest.raises(ValueError):
+        QuantumState(2, precision='half')
+
+
+def test_gate_cache_keeps_one_matrix_per_precision():
+    """Test each precision of a gate is cast once and shared read-only."""
+    single = get_gate('RX', 0.7, dtype=np.complex64)
+    assert single.matrix.dtype == np.complex64
+    assert get_gate('RX', 0.7, dtype=np.complex64) is single
+    assert get_gate('RX', 0.7).matrix.dtype == np.complex128
+    
+    hadamard = get_gate('H', dtype=np.complex64)
+    assert hadamard.kind == get_gate('H').kind
+    assert not hadamard.matrix.flags.writeable
+
+
+def test_error_bounded_against_double():
+    """Test single-precision results stay within 1e-5 of double precision."""
+    for seed in range(3):
+        exact = random_circuit('double', seed=seed).get_statevector()
+        single = random_circuit('single', seed=seed)
+        approx = single.get_statevector()
+        
+        assert approx.dtype == np.complex64
+        # 760 gates of rounding stay far below anything a histogram resolves
+        assert np.max(np.abs(approx - exact)) < 1e-5
+        assert abs(np.vdot(exact, approx)) ** 2 == pytest.approx(1, abs=1e-5)
+        assert single.get_state().normalization_error() < 1e-5
+
+
+def test_drift_monitoring_renormalizes(monkeypatch):
+    """Test run() renormalizes once the drift exceeds the tolerance."""
+    monkeypatch.setattr(circuit_module, 'NORM_DRIFT_TOLERANCE', 0.0)
+    circuit = random_circuit('single', layers=10)
+    circuit.get_state()
+    
+    assert circuit.renormalizations > 0
+    assert circuit.norm_drift > 0
+    assert circuit.get_state().normalization_error() < 1e-6
+
+
+def test_cast_gates_count_one_lookup():
+    """Test a single-precision gate costs one cache lookup, a miss and then hits."""
+    gate_cache.clear()
+    get_gate('RY', 0.3, dtype=np.complex64)
+    assert (gate_cache.hits, gate_cache.misses) == (0, 1)
+    
+    get_gate('RY', 0.3, dtype=np.complex64)
+    get_gate('H', dtype=np.complex64)
+    get_gate('H', dtype=np.complex64)
+    assert (gate_cache.hits, gate_cache.misses) == (2, 2)
+
+
+def test_drift_monitoring_in_steps_and_batches(monkeypatch):
+    """Test iter_steps() and simulate_batch() check the norm like run()."""
+    monkeypatch.setattr(circuit_module, 'NORM_DRIFT_TOLERANCE', 0.0)
+    stepped = random_circuit('single', layers=10)
+    for _ in stepped.iter_steps():
+        pass
+    assert stepped.renormalizations > 0
+    
+    batched = [random_circuit('single', layers=10, seed=seed) for seed in range(2)]
+    states = simulate_batch(batched)
+    for circuit, state in zip(batched, states):
+        assert circuit.renormalizations > 0
+        assert circuit.norm_drift > 0
+        assert state.normalization_error() < 1e-6
+
+
+def test_sweep_uses_circuit_precision(monkeypatch):
+    """Test a single-precision sweep applies complex64 gates and matches double precision."""
+    dtypes = []
+    def recording_get_gate(name, *params, dtype=np.complex128):
+        """Record the dtype of every gate the sweep asks for."""
+        dtypes.append(np.dtype(dtype))
+        return get_gate(name, *params, dtype=dtype)
+    monkeypatch.setattr(circuit_module, 'get_gate', recording_get_gate)
+    
+    theta = Parameter('theta')
+    thetas = [0.1, 1.3, 2.9]
+    single = QuantumCircuit(3, lazy=True, precision='single').h(0).ry(1, theta).cnot(0, 2)
+    double = QuantumCircuit(3, lazy=True).h(0).ry(1, theta).cnot(0, 2)
+    
+    states = single.sweep({theta: thetas})
+    assert states.dtype == np.complex64
+    assert set(dtypes) == {np.dtype(np.complex64)}
+    assert np.allclose(states, double.sweep({theta: thetas}), atol=1e-6)
+
+
+def test_sampling_and_measurement():
+    """Test sampling and measuring a single-precision Bell state."""
+    circuit = QuantumCircuit(2, precision='single')
+    circuit.h(0).cnot(0, 1)
+    counts = circuit.sample(1000, seed=3)
+    assert set(counts) == {'00', '11'}
+    
+    outcome, probability = circuit.measure()
+    assert outcome in ('00', '11')
+    assert probability == pytest.approx(0.5, abs=1e-6)
+
+
+def test_cache_separates_precisions():
+    """Test state cache keys differ between precisions."""
+    keys = StateCache.prefix_keys(2, None, [], 'single')
+    assert keys != StateCache.prefix_keys(2, None, [], 'double')
+    
+    with pytest.raises(ValueError):
+        QuantumCircuit(2, backend='density_matrix', precision='single')
@@ -3,7 +3,7 @@ Unit tests for QuantumState class.
 """
 import pytest
 import numpy as np
-from src.quantum_state import QuantumState, is_normalized
+from src.quantum_state import QuantumState, is_normalized, format_basis_states
 
 
 def test_initialization_default():
@@ -58,4 +58,47 @@ def test_string_representation():
     """Test __str__ method."""
     state = QuantumState(2)
     state_str = str(state)
-    assert '|00⟩' in state_str
\ No newline at end of file
+    assert '|00⟩' in state_str
+
+def test_measure_single_qubit_collapses():
+    """Test single-qubit measurement collapses only the measured qubit."""
+    state = QuantumState(3, initial_state='100')
+    # Put qubit 2 in superposition: (|100⟩ + |101⟩)/√2
+    state.state_vector[4] = state.state_vector[5] = 1 / np.sqrt(2)
+    
+    outcome, prob = state.measure(qubit_index=0)
+    assert outcome == '1'
+    assert np.isclose(prob, 1.0)
+    
+    outcome, prob = state.measure(qubit_index=2)
+    assert np.isclose(prob, 0.5)
+    expected_index = 4 if outcome == '0' else 5
+    assert np.isclose(state.state_vector[expected_index], 1.0)
+    assert is_normalized(state)
+
+
+def test_sample():
+    """Test sampling does not collapse the state."""
+    state = QuantumState(2, initial_state='10')
+    outcomes = state.sample(100, np.random.default_rng(0))
+    
+    assert np.all(outcomes == 2)
+    assert np.isclose(state.state_vector[2], 1.0)
+
+
+def test_sparse_amplitudes():
+    """Test thresholded and top-k amplitude export."""
+    state = QuantumState(3)
+    state.state_vector = np.array([0.6, 0, 0, 0.1, 0, 0, 1e-12, 0.79], dtype=complex)
+    
+    indices, amplitudes = state.sparse_amplitudes()
+    assert indices.tolist() == [0, 3, 7]
+    assert np.allclose(amplitudes, [0.6, 0.1, 0.79])
+    
+    indices, _ = state.sparse_amplitudes(top_k=2)
+    assert indices.tolist() == [0, 7]
+
+
+def test_format_basis_states():
+    """Test vectorized bitstring formatting."""
+    assert format_basis_states(np.array([0, 5, 7]), 3) == ['000', '101', '111']
@@ -0,0 +1,272 @@
+"""
+Unit tests for the HTTP API request handling.
+"""
+import http.client
+import json
+import os
+import threading
+import time
+from http.server import HTTPServer, ThreadingHTTPServer
+
+import pytest
+import numpy as np
+from src.simple_api import (
+    APIError, QuantumAPIHandler, SimulationPool, build_circuit, run_batch, run_simulation, run_steps,
+    encode_state_binary, state_cache, MAX_BATCH_AMPLITUDES,
+    MAX_QUBITS, MAX_TOP_K, BINARY_HEADER, BINARY_MAGIC, BINARY_CONTENT_TYPE, COLUMNAR_CONTENT_TYPE
+)
+
+
+def _wide_request(**fields):
+    """A request for a uniform superposition over MAX_QUBITS + 2 qubits."""
+    num_qubits = MAX_QUBITS + 2
+    operations = [{'gate': 'h', 'target': q} for q in range(num_qubits)]
+    return {'num_qubits': num_qubits, 'operations': operations, **fields}
+
+
+def test_wide_circuits_need_top_k():
+    """Test a threshold alone does not unlock circuits over MAX_QUBITS."""
+    with pytest.raises(APIError):
+        build_circuit(_wide_request(threshold=1e-3))
+    with pytest.raises(APIError):
+        build_circuit(_wide_request(top_k=8, threshold=0))
+    with pytest.raises(APIError):
+        build_circuit(_wide_request(top_k=MAX_TOP_K + 1))
+    
+    _, body = run_simulation(_wide_request(top_k=8, threshold=1e-3))
+    assert len(body['amplitudes']) == 8
+
+
+def test_wide_steps_are_capped_by_top_k():
+    """Test step snapshots of a wide circuit hold at most top_k amplitudes."""
+    result = run_steps(_wide_request(top_k=4))
+    
+    present = {}
+    for step in result['steps']:
+        for state in step['removed']:
+            del present[state]
+        present.update(step['changed'])
+        assert len(present) <= 4
+    
+    probabilities = [entry['probability'] for entry in present.values()]
+    assert np.allclose(probabilities, 2.0 ** -(MAX_QUBITS + 2))
+
+
+def _decode_binary(payload):
+    """Split a binary response into its header fields and amplitudes."""
+    magic, version, num_qubits, itemsize = BINARY_HEADER.unpack_from(payload)
+    dtype = {8: '<c8', 16: '<c16'}[itemsize]
+    return magic, version, num_qubits, np.frombuffer(payload[BINARY_HEADER.size:], dtype=dtype)
+
+
+@pytest.mark.parametrize('precision, itemsize', [('single', 8), ('double', 16)])
+def test_binary_round_trip(precision, itemsize):
+    """Test the binary payload decodes to the JSON amplitudes."""
+    data = {'num_qubits': 3, 'precision': precision,
+            'operations': [{'gate': 'h', 'target': 0}, {'gate': 'cnot', 'control': 0, 'target': 2},
+                           {'gate': 'y', 'target': 1}]}
+    content_type, buffers = run_simulation(data, 'binary')
+    _, body = run_simulation(data, 'json')
+    payload = b''.join(bytes(buffer) for buffer in buffers)
+    
+    magic, version, num_qubits, amplitudes = _decode_binary(payload)
+    assert content_type == BINARY_CONTENT_TYPE
+    assert (magic, version, num_qubits) == (BINARY_MAGIC, 1, 3)
+    assert BINARY_HEADER.unpack_from(payload)[3] == itemsize
+    assert len(payload) == BINARY_HEADER.size + itemsize * 2 ** 3
+    
+    expected = [complex(entry['real'], entry['imag']) for entry in body['amplitudes'].values()]
+    assert np.allclose(amplitudes, expected, atol=1e-6)
+
+
+def test_binary_buffer_is_not_copied():
+    """Test the binary buffer is a view of a little-endian state vector."""
+    state_vector = (np.arange(8) / np.sqrt(140)).astype(np.complex64)
+    header, buffer = encode_state_binary(state_vector, 3)
+    
+    assert len(header) == BINARY_HEADER.size
+    assert np.shares_memory(np.frombuffer(buffer, dtype='<c8'), state_vector)
+    
+    big_endian = state_vector.astype('>c8')
+    _, buffer = encode_state_binary(big_endian, 3)
+    assert np.array_equal(np.frombuffer(buffer, dtype='<c8'), state_vector)
+
+
+def test_sparse_columnar_export():
+    """Test the columnar format lists the kept basis states next to their amplitudes."""
+    data = {'num_qubits': 3, 'threshold': 1e-9,
+            'operations': [{'gate': 'h', 'target': 0}, {'gate': 'cnot', 'control': 0, 'target': 2}]}
+    content_type, body = run_simulation(data, 'columnar')
+    
+    assert content_type == COLUMNAR_CONTENT_TYPE
+    assert body['amplitudes']['indices'] == [0, 5]
+    assert np.allclose(body['amplitudes']['real'], [2 ** -0.5] * 2)
+    assert np.allclose(body['amplitudes']['imag'], 0)
+
+
+@pytest.fixture
+def server():
+    """An inline (no worker pool) API server on a free port."""
+    httpd = HTTPServer(('127.0.0.1', 0), QuantumAPIHandler)
+    httpd.simulation_pool = None
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _post(server, path, data, headers=None):
+    """POST a JSON body and return (status, content type, raw body)."""
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    connection.request('POST', path, json.dumps(data), {'Content-Type': 'application/json',
+                                                          **(headers or {})})
+    response = connection.getresponse()
+    result = response.status, response.getheader('Content-type'), response.read()
+    connection.close()
+    return result
+
+
+def test_response_format_negotiation(server):
+    """Test the Accept header picks the format and a 'format' field overrides it."""
+    data = {'num_qubits': 2, 'operations': [{'gate': 'h', 'target': 0}]}
+    
+    status, content_type, payload = _post(server, '/api/simulate', data,
+                                          {'Accept': BINARY_CONTENT_TYPE})
+    assert (status, content_type) == (200, BINARY_CONTENT_TYPE)
+    assert np.allclose(_decode_binary(payload)[3], [2 ** -0.5, 0, 2 ** -0.5, 0])
+    
+    status, content_type, payload = _post(server, '/api/simulate', data,
+                                          {'Accept': COLUMNAR_CONTENT_TYPE})
+    assert (status, content_type) == (200, COLUMNAR_CONTENT_TYPE)
+    assert np.allclose(json.loads(payload)['amplitudes']['real'], [2 ** -0.5, 0, 2 ** -0.5, 0])
+    
+    status, content_type, payload = _post(server, '/api/simulate', {**data, 'format': 'json'},
+                                          {'Accept': BINARY_CONTENT_TYPE})
+    assert (status, content_type) == (200, 'application/json')
+    assert set(json.loads(payload)['amplitudes']) == {'00', '01', '10', '11'}
+    
+    status, _, payload = _post(server, '/api/simulate', {**data, 'format': 'xml'})
+    assert status == 400
+    assert not json.loads(payload)['success']
+
+
+def _sleep(seconds):
+    """Sleep in a worker and return the duration."""
+    time.sleep(seconds)
+    return seconds
+
+
+def _crash():
+    """Kill the worker process without cleanup."""
+    os._exit(1)
+
+
+def test_pool_timeout_keeps_slot_until_worker_finishes():
+    """Test a timed-out simulation gets a 504 and holds its slot (503) until done."""
+    pool = SimulationPool(max_workers=1, max_queue=0, timeout=0.5)
+    try:
+        with pytest.raises(APIError) as timed_out:
+            pool.run(_sleep, 1.5)
+        assert timed_out.value.status == 504
+        
+        with pytest.raises(APIError) as busy:
+            pool.run(_sleep, 0)
+        assert busy.value.status == 503
+        
+        time.sleep(1.5)
+        assert pool.run(_sleep, 0) == 0
+    finally:
+        pool.shutdown()
+
+
+def test_pool_recovers_from_worker_crash():
+    """Test a dead worker fails its request and the pool keeps serving."""
+    pool = SimulationPool(max_workers=1, max_queue=1, timeout=30)
+    try:
+        with pytest.raises(APIError) as crashed:
+            pool.run(_crash)
+        assert crashed.value.status == 500
+        
+        assert pool.run(_sleep, 0) == 0
+        assert pool.run(_sleep, 0) == 0
+    finally:
+        pool.shutdown()
+
+
+def test_busy_pool_answers_503(server):
+    """Test a saturated pool turns requests away with a 503 JSON error."""
+    server.simulation_pool = SimulationPool(max_workers=1, max_queue=0, timeout=0.5)
+    try:
+        with pytest.raises(APIError):
+            server.simulation_pool.run(_sleep, 2)
+        
+        status, _, payload = _post(server, '/api/simulate', {'num_qubits': 1})
+        assert status == 503
+        assert not json.loads(payload)['success']
+    finally:
+        server.simulation_pool.shutdown()
+
+
+class _SlowPool:
+    """Stand-in pool whose simulations take two seconds and then run inline."""
+    
+    def run(self, func, *args):
+        """Wait two seconds, then return func(*args)."""
+        time.sleep(2)
+        return func(*args)
+
+
+def test_health_answers_during_a_slow_simulation():
+    """Test the threaded server keeps answering while a simulation is in progress."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), QuantumAPIHandler)
+    httpd.simulation_pool = _SlowPool()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    slow = threading.Thread(target=_post, args=(httpd, '/api/simulate', {'num_qubits': 1}))
+    try:
+        slow.start()
+        time.sleep(0.2)
+        
+        started = time.monotonic()
+        connection = http.client.HTTPConnection('127.0.0.1', httpd.server_address[1], timeout=10)
+        connection.request('GET', '/api/health')
+        assert connection.getresponse().status == 200
+        connection.close()
+        assert time.monotonic() - started < 1
+        assert slow.is_alive()
+    finally:
+        slow.join()
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_optimization_report_with_cache():
+    """Test the optimization report covers the whole program on a cache miss and hit."""
+    state_cache.clear()
+    data = {'num_qubits': 2, 'initial_state': '01',
+            'operations': [{'gate': 'h', 'target': 0}] * 20 + [{'gate': 'x', 'target': 1}]}
+    
+    _, miss = run_simulation(data)
+    _, hit = run_simulation(data)
+    
+    assert miss['cache']['resumed_operations'] == 0
+    assert hit['cache']['resumed_operations'] == 21
+    expected = {'original_sweeps': 21, 'compiled_sweeps': 1, 'sweeps_saved': 20,
+                'cancelled_blocks': 1}
+    assert miss['optimization'] == expected
+    assert hit['optimization'] == expected
+
+
+def test_batch_amplitude_budget():
+    """Test a batch is limited by the total size of its state vectors."""
+    num_qubits = MAX_BATCH_AMPLITUDES.bit_length() - 1
+    wide = {'num_qubits': num_qubits, 'top_k': 1, 'operations': [{'gate': 'h', 'target': 0}]}
+    
+    with pytest.raises(APIError) as too_large:
+        run_batch({'circuits': [wide, wide]})
+    assert 'amplitudes' in too_large.value.message
+    
+    small = {'num_qubits': 2, 'operations': [{'gate': 'h', 'target': 0}]}
+    result = run_batch({'circuits': [small, {**small, 'precision': 'single'}]})
+    assert len(result['results']) == 2
+    assert result['results'][1]['precision']['mode'] == 'single'
@@ -0,0 +1,71 @@
+"""
+Tests for the sparse state-vector backend
+"""
+import numpy as np
+import pytest
+from src.circuit import QuantumCircuit
+from src.sparse_state import SparseState
+from src.gates import get_gate
+
+
+def test_matches_statevector():
+    """Test random sparse circuits match the state-vector backend."""
+    rng = np.random.default_rng(3)
+    for trial in range(30):
+        exact = QuantumCircuit(4, '1010', lazy=True)
+        sparse = QuantumCircuit(4, '1010', lazy=True, backend='sparse',
+                                backend_options={'density_threshold': 0.6})
+        for _ in range(15):
+            name = str(rng.choice(['H', 'X', 'Y', 'Z', 'RY', 'RZ', 'CNOT', 'SWAP']))
+            qubits = [int(q) for q in rng.choice(4, 2 if name in ('CNOT', 'SWAP') else 1,
+                                                 replace=False)]
+            operation = {'gate': name, 'qubits': qubits, 'type': 'single'}
+            if name in ('RY', 'RZ'):
+                operation['params'] = [float(rng.random() * 6)]
+            for circuit in (exact, sparse):
+                circuit._add_operation(dict(operation))
+        
+        assert np.allclose(sparse.get_state().state_vector, exact.get_statevector())
+
+
+def test_permutation_circuit_stays_sparse():
+    """Test a 50-qubit circuit of CNOTs and two H gates keeps four amplitudes."""
+    circuit = QuantumCircuit(50, '1' + '0' * 49, lazy=True, backend='sparse')
+    for qubit in range(49):
+        circuit.cnot(qubit, qubit + 1)
+    circuit.h(0).h(25)
+    
+    state = circuit.get_state()
+    assert not state.is_dense
+    assert state.indices.size == 4
+    assert abs(circuit.get_amplitude('0' + '1' * 49)) == pytest.approx(0.5)
+    assert circuit.get_amplitude('0' * 50) == 0
+    assert len(circuit.get_amplitudes()) == 4
+    assert sum(circuit.sample(100, seed=0).values()) == 100
+
+
+def test_converts_to_dense_past_threshold():
+    """Test the state switches to a dense vector past the density threshold."""
+    state = SparseState(4, density_threshold=0.25)
+    state.apply_gate(get_gate('H'), [0])
+    state.apply_gate(get_gate('H'), [1])
+    assert not state.is_dense
+    
+    state.apply_gate(get_gate('H'), [2])
+    assert state.is_dense
+    assert np.allclose(state.state_vector[::2], 1 / np.sqrt(8))
+    
+    state.apply_gate(get_gate('X'), [3])
+    assert np.allclose(state.state_vector[1::2], 1 / np.sqrt(8))
+
+
+def test_measurement_shrinks_support():
+    """Test a measurement drops the amplitudes of the other outcome."""
+    state = SparseState(3, density_threshold=0.5)
+    state.apply_gate(get_gate('H'), [0])
+    state.apply_gate(get_gate('CNOT'), [0, 2])
+    
+    outcome, probability = state.measure(0, np.random.default_rng(1))
+    assert probability == pytest.approx(0.5)
+    assert state.indices.size == 1
+    assert state.measure(2) == (outcome, pytest.approx(1.0))
@@ -0,0 +1,137 @@
+"""
+Tests for the stabilizer (Clifford tableau) backend
+"""
+import numpy as np
+import pytest
+from src.circuit import Parameter, QuantumCircuit, simulate_batch
+from src.stabilizer import StabilizerState, is_clifford
+from src.gates import get_gate
+
+
+def random_clifford_program(rng, num_qubits, length):
+    """Draw a random program of (gate name, qubits) Clifford operations."""
+    program = []
+    for _ in range(length):
+        name = rng.choice(['H', 'X', 'Y', 'Z', 'CNOT', 'SWAP'])
+        qubits = rng.choice(num_qubits, 2 if name in ('CNOT', 'SWAP') else 1, replace=False)
+        program.append((str(name), [int(q) for q in qubits]))
+    return program
+
+
+def test_bell_stabilizers():
+    """Test the stabilizer generators of a Bell state and of Y applied to it."""
+    state = StabilizerState(2)
+    state.apply_gate(get_gate('H'), [0])
+    state.apply_gate(get_gate('CNOT'), [0, 1])
+    assert state.stabilizers() == ['+XX', '+ZZ']
+    
+    state.apply_gate(get_gate('Y'), [1])
+    assert state.stabilizers() == ['-XX', '-ZZ']
+
+
+def test_matches_statevector_distribution():
+    """Test tableau samples follow the state-vector distribution of random Clifford circuits."""
+    rng = np.random.default_rng(5)
+    for trial in range(30):
+        program = random_clifford_program(rng, 4, 20)
+        exact = QuantumCircuit(4, '0110', lazy=True)
+        tableau = QuantumCircuit(4, '0110', lazy=True, backend='stabilizer')
+        for name, qubits in program:
+            for circuit in (exact, tableau):
+                circuit._add_operation({'gate': name, 'qubits': qubits, 'type': 'single'})
+        
+        probabilities = np.abs(exact.get_statevector()) ** 2
+        counts = tableau.sample(2000, seed=trial)
+        support = {index for index in range(16) if probabilities[index] > 1e-9}
+        assert {int(bits, 2) for bits in counts} == support
+        for bits, count in counts.items():
+            assert count / 2000 == pytest.approx(probabilities[int(bits, 2)], abs=0.05)
+
+
+def test_measurement_collapses():
+    """Test measuring one qubit of a GHZ state fixes the others."""
+    circuit = QuantumCircuit(3, backend='stabilizer')
+    circuit.h(0).cnot(0, 1).cnot(1, 2)
+    outcome = circuit.measure_qubit(1)
+    
+    # The other qubits are now fixed to the same value
+    state = circuit.get_state()
+    assert state.measure(0) == (outcome, 1.0)
+    assert state.measure(2) == (outcome, 1.0)
+    assert circuit.sample(50, seed=0) == {outcome * 3: 50}
+
+
+def test_large_ghz_sampling():
+    """Test a 500-qubit GHZ state samples only all-zeros or all-ones."""
+    circuit = QuantumCircuit(500, lazy=True, backend='stabilizer')
+    circuit.h(0)
+    for qubit in range(499):
+        circuit.cnot(qubit, qubit + 1)
+    
+    counts = circuit.sample(200, seed=1)
+    assert set(counts) <= {'0' * 500, '1' * 500}
+    assert sum(counts.values()) == 200
+
+
+def test_rejects_non_clifford_gates():
+    """Test the stabilizer backend rejects a rotation."""
+    circuit = QuantumCircuit(1, backend='stabilizer')
+    with pytest.raises(ValueError):
+        circuit.rx(0, 0.3)
+
+
+def test_auto_backend():
+    """Test auto circuits use the tableau until a non-Clifford gate is recorded."""
+    circuit = QuantumCircuit(3, lazy=True, backend='auto')
+    circuit.h(0).cnot(0, 1)
+    assert is_clifford(circuit.operations)
+    circuit.get_state()
+    assert circuit.backend == 'stabilizer'
+    
+    # A rotation sends the program back to the state vector
+    circuit.ry(2, 0.5)
+    state_vector = circuit.get_statevector()
+    assert circuit.backend == 'statevector'
+    assert abs(state_vector[0]) == pytest.approx(np.cos(0.25) / np.sqrt(2))
+    
+    eager = QuantumCircuit(2, backend='auto')
+    eager.h(0)
+    assert eager.backend == 'statevector'
+
+
+def test_auto_backend_sweep_and_batch():
+    """Test sweeps and batches of auto circuits that outgrew the tableau use the state vector."""
+    theta = Parameter('theta')
+    swept = QuantumCircuit(2, lazy=True, backend='auto')
+    swept.h(0).rx(1, theta)
+    states = swept.sweep({theta: [0.0, np.pi]})
+    assert np.allclose(np.abs(states[1]) ** 2, [0, 0.5, 0, 0.5])
+    
+    batched = QuantumCircuit(2, lazy=True, backend='auto')
+    batched.h(0).rx(1, np.pi)
+    [state] = simulate_batch([batched])
+    assert batched.backend == 'statevector'
+    assert np.allclose(np.abs(state.state_vector) ** 2, [0, 0.5, 0, 0.5])
+
+
+def test_auto_backend_serves_statevector_features():
+    """Test state-vector-only calls on an all-Clifford auto circuit replay it instead of raising."""
+    def bell():
+        """Build a lazy auto Bell circuit that runs on the tableau."""
+        circuit = QuantumCircuit(2, lazy=True, backend='auto').h(0).cnot(0, 1)
+        circuit.get_state()
+        assert circuit.backend == 'stabilizer'
+        return circuit
+    
+    assert np.allclose(bell().get_statevector(), [2 ** -0.5, 0, 0, 2 ** -0.5])
+    amplitudes = bell().get_amplitudes(threshold=1e-9)
+    assert list(amplitudes) == ['00', '11']
+    assert bell().is_entangled()
+    assert bell().analyze_entanglement()['entropy'] == pytest.approx(1.0)
+    
+    # Once replayed, the circuit keeps the state vector for later Clifford gates
+    circuit = bell()
+    circuit.get_statevector()
+    circuit.x(0)
+    assert circuit.get_amplitude('01') == pytest.approx(2 ** -0.5)
+    assert circuit.backend == 'statevector'
@@ -0,0 +1,87 @@
+"""
+Unit tests for the prefix-keyed state cache.
+"""
+import pytest
+import numpy as np
+from src.circuit import QuantumCircuit
+from src.state_cache import StateCache, run_with_cache
+
+
+def _ghz_circuit(num_qubits, extra_x=None):
+    """Lazy optimizing GHZ circuit, optionally followed by an X gate."""
+    circuit = QuantumCircuit(num_qubits, lazy=True, optimize=True)
+    circuit.h(0)
+    for qubit in range(1, num_qubits):
+        circuit.cnot(qubit - 1, qubit)
+    if extra_x is not None:
+        circuit.x(extra_x)
+    return circuit
+
+
+def test_prefix_keys_are_canonical():
+    """Test prefix keys are shared by common prefixes and depend on the initial state."""
+    a = _ghz_circuit(3)
+    b = _ghz_circuit(3, extra_x=2)
+    keys_a = StateCache.prefix_keys(3, None, a.operations)
+    keys_b = StateCache.prefix_keys(3, '000', b.operations)
+    
+    assert len(keys_b) == len(b.operations) + 1
+    assert keys_b[:len(keys_a)] == keys_a
+    assert StateCache.prefix_keys(3, '100', a.operations)[0] != keys_a[0]
+
+
+def test_resume_from_longest_prefix():
+    """Test a longer program resumes from the longest cached prefix."""
+    cache = StateCache()
+    assert run_with_cache(_ghz_circuit(4), cache) == (0, 4)
+    
+    circuit = _ghz_circuit(4, extra_x=3)
+    assert run_with_cache(circuit, cache) == (4, 5)
+    
+    expected = _ghz_circuit(4, extra_x=3).get_statevector()
+    assert np.allclose(circuit.get_statevector(), expected)
+    assert run_with_cache(_ghz_circuit(4, extra_x=3), cache) == (5, 5)
+    
+    stats = cache.stats()
+    assert (stats['misses'], stats['partial_hits'], stats['hits']) == (1, 1, 1)
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+
+
+def test_cached_state_is_not_shared():
+    """Test later gates do not modify a cached state vector."""
+    cache = StateCache()
+    circuit = _ghz_circuit(2)
+    run_with_cache(circuit, cache)
+    circuit.x(1)
+    circuit.get_state()
+    
+    keys = StateCache.prefix_keys(2, None, _ghz_circuit(2).operations)
+    _, cached = cache.lookup(keys)
+    assert np.allclose(cached, _ghz_circuit(2).get_statevector())
+
+
+def test_measurement_stops_caching():
+    """Test operations from the first measurement on are not cached."""
+    cache = StateCache()
+    circuit = _ghz_circuit(2)
+    circuit.measure_qubit(0)
+    circuit.x(1)
+    
+    assert run_with_cache(circuit, cache) == (0, 2)
+    assert len(circuit.state.state_vector) == 4
+    assert cache.stats()['entries'] == 1
+
+
+def test_lru_eviction_respects_memory_bound():
+    """Test least recently used entries are evicted past max_bytes."""
+    vector = np.zeros(16, dtype=complex)
+    cache = StateCache(max_bytes=2 * vector.nbytes)
+    for key in ('a', 'b', 'c'):
+        cache.store(key, vector)
+    
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert stats['bytes'] <= cache.max_bytes
+    assert stats['evictions'] == 1
+    assert cache.lookup(['', 'a'])[1] is None
+    assert cache.lookup(['', 'c'])[1] is not None
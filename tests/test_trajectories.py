@@ -0,0 +1,82 @@
+"""
+Tests for Monte Carlo trajectory simulation
+"""
+import numpy as np
+import pytest
+from src.circuit import QuantumCircuit
+from src.noise import NoiseModel, amplitude_damping, bit_flip, depolarizing
+from src.trajectories import pauli_expectation, run_trajectories
+
+
+def noisy_bell():
+    """Build a lazy Bell circuit and a depolarizing plus damping noise model."""
+    circuit = QuantumCircuit(2, lazy=True)
+    circuit.h(0).cnot(0, 1)
+    noise = NoiseModel().add_channel(depolarizing(0.2)).add_channel(amplitude_damping(0.1))
+    return circuit, noise
+
+
+def test_pauli_expectation():
+    """Test Pauli string expectations of a Bell state."""
+    bell = np.array([1, 0, 0, 1]) / np.sqrt(2)
+    assert pauli_expectation(bell, 'ZZ') == pytest.approx(1)
+    assert pauli_expectation(bell, 'XX') == pytest.approx(1)
+    assert pauli_expectation(bell, 'YY') == pytest.approx(-1)
+    assert pauli_expectation(bell, 'ZI') == pytest.approx(0)
+    with pytest.raises(ValueError):
+        pauli_expectation(bell, 'ZQ')
+
+
+def test_matches_density_matrix():
+    """Test trajectory averages agree with the exact density matrix."""
+    circuit, noise = noisy_bell()
+    exact = QuantumCircuit(2, backend='density_matrix', noise_model=noise)
+    exact.h(0).cnot(0, 1)
+    rho = exact.get_density_matrix()
+    zz = np.diag([1, -1, -1, 1])
+    
+    result = run_trajectories(circuit, noise, trajectories=2000, observables=['ZZ'],
+                              workers=0, seed=7)
+    
+    assert result['trajectories'] == 2000
+    assert sum(result['counts'].values()) == 2000
+    error = result['standard_errors']['ZZ']
+    assert abs(result['expectations']['ZZ'] - np.trace(zz @ rho).real) < 4 * error
+    assert result['counts'].get('00', 0) / 2000 == pytest.approx(rho[0, 0].real, abs=0.05)
+
+
+def test_reproducible_across_workers():
+    """Test a seeded run gives the same result inline and in a pool."""
+    circuit, noise = noisy_bell()
+    inline = run_trajectories(circuit, noise, trajectories=200, observables=['ZZ', 'XI'],
+                              chunk_size=16, workers=0, seed=3)
+    pooled = run_trajectories(circuit, noise, trajectories=200, observables=['ZZ', 'XI'],
+                              chunk_size=16, workers=2, seed=3)
+    assert inline == pooled
+
+
+def test_stops_at_target_precision():
+    """Test sampling stops once the standard error reaches the target."""
+    circuit = QuantumCircuit(1, lazy=True)
+    circuit.x(0)
+    noise = NoiseModel().add_channel(bit_flip(0.1))
+    
+    result = run_trajectories(circuit, noise, trajectories=10000, observables=['Z'],
+                              target_precision=0.03, min_trajectories=50, chunk_size=25,
+                              workers=0, seed=1)
+    
+    assert result['converged']
+    assert result['trajectories'] < 10000
+    assert result['standard_errors']['Z'] <= 0.03
+    assert result['expectations']['Z'] == pytest.approx(-0.8, abs=0.1)
+
+
+def test_measurements_collapse_each_trajectory():
+    """Test measurements collapse every trajectory to a basis state."""
+    circuit = QuantumCircuit(1, lazy=True)
+    circuit.h(0).measure_qubit(0)
+    result = run_trajectories(circuit, NoiseModel(), trajectories=100, shots_per_trajectory=5,
+                              observables=['Z'], workers=0, seed=0)
+    # Every trajectory ends in a basis state, so Z is ±1 each time
+    assert sum(result['counts'].values()) == 500
+    assert result['standard_errors']['Z'] > 0.05